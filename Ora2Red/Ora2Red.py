@@ -1,12 +1,88 @@
 import sys
+import time
 import logging
 import os
+import argparse
 from config import Config
 from sql_transformer import SQLTransformer
 from report_generator import ReportGenerator
 from file_processor import FileProcessor
+from conversion_cache import ConversionCache
+from rule_profiler import render_profile_table
+from ddl_advisor import render_advice_table
+from rule_compiler import compile_rules_file, write_rule_set
 
-def choose_directory_or_file(processor):
+REPORT_FORMATS = ('csv', 'html', 'db', 'json')
+
+
+def _report_formats(value):
+    # "csv,html" → ('csv', 'html'), "none" → () (리포트 생성 안 함)
+    formats = tuple(dict.fromkeys(f.strip().lower() for f in value.split(',') if f.strip()))
+    if formats == ('none',):
+        return ()
+    unknown = [f for f in formats if f not in REPORT_FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"지원하지 않는 리포트 형식: {value} (csv, html, db, json 또는 none)")
+    return formats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Oracle SQL → Redshift SQL 변환기",
+        epilog="입력 경로를 지정하지 않으면 기존처럼 대화형으로 디렉토리/파일을 입력받습니다."
+    )
+    parser.add_argument("paths", nargs="*",
+                        help="변환할 SQL 파일, 디렉토리 또는 glob 패턴 (예: 'sqls/**/*.sql'). 지정 시 대화형 입력 없이 실행")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="출력 루트 디렉토리 (converted_sqls / logs / reports 생성 위치, 기본값: 현재 디렉토리)")
+    parser.add_argument("--formats", type=_report_formats, default=None,
+                        help="생성할 리포트 형식, 쉼표로 구분 (csv,html,db 기본값 / json 추가 가능 / none)")
+    parser.add_argument("--load-results", action="store_true",
+                        help="기존 결과(reports/results.db, 없으면 validation_results.json)를 불러와 이어서 기록")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="변환 통계만 계산하고 변환된 SQL / 변경 로그 파일은 쓰지 않음")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="파일별 diff / 변경 로그 상세 없이 요약 리포트만 생성 (대량 파일 분류용)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="디렉토리 변환 시 사용할 워커 프로세스 수 (기본값: 1, 직렬 처리)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="읽기/변환/쓰기 단계를 겹쳐 실행 (I/O 대기가 큰 네트워크 파일시스템용)")
+    parser.add_argument("--readers", type=int, default=None,
+                        help="파이프라인 읽기 스레드 수 (기본값: 4)")
+    parser.add_argument("--mode", choices=["line", "statement", "buffer"], default=None,
+                        help="변환 단위: line (라인별) / statement (문장별, applicable_to 적용) / "
+                             "buffer (line 과 같은 결과, 파일 단위 스캔)")
+    parser.add_argument("--token-aware", action="store_true",
+                        help="문자열 리터럴 / 인용 식별자 / 주석 안의 텍스트는 변환하지 않음")
+    parser.add_argument("--mmap-min-mb", type=int, default=None, metavar="MB",
+                        help="이 크기(MB) 이상인 파일은 메모리 매핑으로 읽어 일정한 메모리로 변환 (기본값: 256, 0 이면 사용 안 함)")
+    parser.add_argument("--bulk-insert", choices=["rows", "multirow", "copy"], default=None,
+                        help="대량 INSERT ... VALUES 구간은 값 위치의 식에만 규칙 적용: rows (행 유지) / "
+                             "multirow (multi-row INSERT 로 합침) / copy (CSV + Redshift COPY 문)")
+    parser.add_argument("--bulk-min-rows", type=int, default=None, metavar="N",
+                        help="대량 INSERT 경로를 사용할 연속 INSERT 행 수 (기본값: 100)")
+    parser.add_argument("--copy-s3-prefix", default=None,
+                        help="--bulk-insert copy 의 CSV 업로드 위치 (예: s3://bucket/load)")
+    parser.add_argument("--copy-iam-role", default=None,
+                        help="--bulk-insert copy 의 COPY 문에 사용할 IAM 역할 ARN")
+    parser.add_argument("--ddl-advisor", choices=["report", "emit"], default=None,
+                        help="CREATE TABLE 별 DISTKEY / SORTKEY / ENCODE 권장: report (리포트 섹션) / "
+                             "emit (권장 절을 붙인 CREATE TABLE 스크립트도 생성)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="변환 캐시를 사용하지 않고 모든 파일을 다시 변환")
+    parser.add_argument("--changed-rules", action="store_true",
+                        help="transformations.json 변경 후 영향을 받는 파일만 다시 변환 (나머지는 캐시 재사용)")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="변환 캐시를 모두 삭제(무효화)한 뒤 종료")
+    parser.add_argument("--compile-rules", action="store_true",
+                        help="transformations.json 을 검증·컴파일하여 COMPILED_RULES_FILE 로 저장한 뒤 종료")
+    parser.add_argument("--rule-timeout", type=int, default=None, metavar="MS",
+                        help="규칙 하나가 라인 하나에 쓸 수 있는 최대 시간(ms), 초과 시 건너뛰고 수동 검토 표시")
+    parser.add_argument("--profile-rules", action="store_true",
+                        help="규칙별 실행 시간/횟수를 수집해 프로파일 리포트 생성 (문장 중복 제거 비활성, 캐시 재사용 파일은 제외)")
+    return parser.parse_args(argv)
+
+def choose_directory_or_file(processor, changed_rules=False):
     while True:
         try:
             choice = input("디렉토리를 선택하려면 1, 파일을 선택하려면 2를 입력하세요: ").strip()
@@ -15,7 +91,10 @@ def choose_directory_or_file(processor):
                 if not os.path.isdir(dir_path):
                     print("유효한 디렉토리 경로가 아닙니다. 다시 시도하세요.")
                     continue
-                processor.process_directory(dir_path)
+                if changed_rules:
+                    processor.process_changed_rules(dir_path)
+                else:
+                    processor.process_directory(dir_path)
                 break
             elif choice == '2':
                 file_path = input("파일 경로를 입력하세요: ").strip()
@@ -33,42 +112,170 @@ def choose_directory_or_file(processor):
             logging.error(f"입력 처리 중 에러 발생: {ex}")
             print("입력 처리 중 문제가 발생했습니다. 다시 시도해주세요.")
 
-def main():
+def print_run_summary(reporter, processor, elapsed):
+    """변환 결과 통계를 출력합니다."""
+    total = changed = manual = 0
+    categories = {}
+    for row in reporter.iter_results():
+        total += 1
+        changed += row.get('changed') == 'O'
+        manual += row.get('manual_required') == 'O'
+        categories[row.get('category', '')] = categories.get(row.get('category', ''), 0) + 1
+    by_category = ", ".join(f"{category} {count}" for category, count in sorted(categories.items()))
+    print(f"📈 변환 요약: 파일 {total}개 (변경 {changed}, 수동 검토 {manual}, 변경 없음 {total - changed})"
+          f"{' [' + by_category + ']' if by_category else ''}")
+    print(f"   캐시 재사용 {processor.cache_hit_count}/{processor.processed_count}개, 소요 시간 {elapsed:.2f}초")
+    if processor.dedup_file_count or processor.statement_lookup_count:
+        files = processor.processed_count
+        statements = processor.statement_lookup_count
+        summary = (f"   중복 제거: 파일 {processor.dedup_file_count}/{files}개 재사용 "
+                   f"({processor.dedup_file_count / files * 100 if files else 0:.1f}%)")
+        # 모든 파일이 캐시/파일 중복에서 재사용되어 문장 memo 조회가 없으면 문장 항목은 생략
+        if statements:
+            summary += (f", 문장 {processor.statement_hit_count}/{statements}개 재사용 "
+                        f"({processor.statement_hit_count / statements * 100:.1f}%)")
+        print(summary)
+
+
+def write_reports(config, reporter, transformer, formats, ddl_advisor=None):
+    os.makedirs(config.REPORT_DIR, exist_ok=True)
+    # 결과물 저장
+    if 'db' in formats:
+        reporter.export_results_to_db(os.path.join(config.REPORT_DIR, config.RESULTS_DB_NAME))
+    if 'json' in formats:
+        reporter.export_results_to_json(os.path.join(config.REPORT_DIR, "validation_results.json"))
+
+    # 규칙 프로파일 (비용이 큰 규칙 순)
+    if transformer.profiler is not None:
+        transformer.profiler.write_reports(config.REPORT_DIR)
+        reporter.add_report_section("규칙별 성능 프로파일", render_profile_table(transformer.profiler.ranked()))
+
+    # DDL 분산/정렬 키 권장 (변환된 CREATE TABLE 기준)
+    if ddl_advisor is not None:
+        rows = ddl_advisor.recommend()
+        if not rows:
+            logging.info("분산/정렬 키를 권장할 CREATE TABLE 이 없습니다.")
+        else:
+            ddl_advisor.write_reports(rows, config.REPORT_DIR)
+            if ddl_advisor.mode == 'emit' and not config.DRY_RUN:
+                ddl_advisor.write_ddl(config.DDL_ADVISOR_FILE)
+            reporter.add_report_section("Redshift 분산/정렬 키 권장", render_advice_table(rows))
+
+    # 리포트 생성
+    if 'csv' in formats:
+        reporter.generate_csv()
+    if 'html' in formats:
+        reporter.generate_html()
+
+
+def main(argv=None):
+    args = parse_args(argv)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s',
     )
 
+    batch = bool(args.paths)
+    reporter = None
     try:
-        config = Config()
+        config = Config(base_dir=args.output_dir) if args.output_dir else Config()
+        if args.workers:
+            config.WORKERS = max(1, args.workers)
+        if args.mode:
+            config.PROCESSING_MODE = args.mode
+        if args.token_aware:
+            config.TOKEN_AWARE = True
+        if args.mmap_min_mb is not None:
+            config.MMAP_MIN_BYTES = args.mmap_min_mb * 1024 * 1024 or None
+        if args.bulk_insert:
+            config.BULK_INSERT_MODE = args.bulk_insert
+        if args.bulk_min_rows:
+            config.BULK_INSERT_MIN_ROWS = max(1, args.bulk_min_rows)
+        if args.copy_s3_prefix:
+            config.BULK_COPY_S3_PREFIX = args.copy_s3_prefix
+        if args.copy_iam_role:
+            config.BULK_COPY_IAM_ROLE = args.copy_iam_role
+        if args.ddl_advisor:
+            config.DDL_ADVISOR = args.ddl_advisor
+        if args.pipeline:
+            config.USE_PIPELINE = True
+        if args.readers:
+            config.PIPELINE_READERS = max(1, args.readers)
+        if args.no_cache:
+            config.USE_CACHE = False
+        if args.profile_rules:
+            config.PROFILE_RULES = True
+        if args.rule_timeout:
+            config.RULE_TIMEOUT_MS = args.rule_timeout
+        if args.dry_run:
+            config.DRY_RUN = True
+        if args.summary_only:
+            config.SUMMARY_ONLY = True
+        if args.formats is not None:
+            config.REPORT_FORMATS = args.formats
+        if args.compile_rules:
+            rule_set = compile_rules_file(config.TRANSFORMATIONS_FILE)
+            write_rule_set(rule_set, config.COMPILED_RULES_FILE)
+            print(f"🧩 변환 규칙 {len(rule_set['rules'])}개를 컴파일했습니다: {config.COMPILED_RULES_FILE} "
+                  f"(규칙 집합 해시 {rule_set['rules_hash'][:12]})")
+            return 0
         transformer = SQLTransformer(config)
+        if args.clear_cache:
+            ConversionCache(config.CACHE_DIR, transformer).clear()
+            print(f"🗑️ 변환 캐시를 삭제했습니다: {config.CACHE_DIR}")
+            return 0
         reporter = ReportGenerator(config)
         processor = FileProcessor(config, transformer, reporter)
 
+        result_db = os.path.join(config.REPORT_DIR, config.RESULTS_DB_NAME)
         result_file = os.path.join(config.REPORT_DIR, "validation_results.json")
 
+        def load_existing_results():
+            # 결과 DB 우선, 없으면 이전 버전의 JSON 결과 파일
+            if os.path.exists(result_db):
+                reporter.import_results_from_db(result_db)
+            else:
+                reporter.import_results_from_json(result_file)
+
         # 기존 결과 파일 불러오기
-        if os.path.exists(result_file):
+        if args.load_results:
+            load_existing_results()
+        elif not batch and (os.path.exists(result_db) or os.path.exists(result_file)):
             use_existing = input("기존 결과 파일이 있습니다. 불러오시겠습니까? (y/n): ").strip().lower()
             if use_existing == 'y':
-                reporter.import_results_from_json(result_file)
-                print("📋 [디버그] 불러온 csv_results 구조:")
-                for i, row in enumerate(reporter.csv_results):
-                    print(f"  [{i}] {type(row)} → {row}")
-        choose_directory_or_file(processor)
-
-        # 결과물 저장
-        os.makedirs(config.REPORT_DIR, exist_ok=True)
-        reporter.export_results_to_json(result_file)
+                load_existing_results()
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    for i, row in enumerate(reporter.iter_results()):
+                        logging.debug(f"불러온 결과 [{i}] {row}")
 
-        # 리포트 생성
-        reporter.generate_csv()
-        reporter.generate_html()
+        started = time.perf_counter()
+        if batch:
+            files = processor.collect_input_files(args.paths)
+            if not files:
+                logging.error(f"변환할 SQL 파일을 찾을 수 없습니다: {' '.join(args.paths)}")
+                return 1
+            if args.changed_rules:
+                processor.process_changed_rule_files(files)
+            else:
+                processor.process_files(files)
+        else:
+            choose_directory_or_file(processor, changed_rules=args.changed_rules)
+        elapsed = time.perf_counter() - started
 
-        print(f"📊 리포트가 생성되었습니다: {config.REPORT_DIR}")
+        write_reports(config, reporter, transformer, config.REPORT_FORMATS, processor.ddl_advisor)
+        print_run_summary(reporter, processor, elapsed)
+        if config.DRY_RUN:
+            print("🔎 dry-run: 변환된 SQL / 변경 로그 파일은 저장하지 않았습니다.")
+        if config.REPORT_FORMATS:
+            print(f"📊 리포트가 생성되었습니다: {config.REPORT_DIR}")
+        return 0
     except Exception as e:
         logging.error(f"프로그램 실행 중 예외 발생: {e}")
         print("프로그램 실행 중 오류가 발생했습니다. 로그를 확인해주세요.")
+        return 1
+    finally:
+        if reporter is not None:
+            reporter.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,370 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import datetime
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from pathlib import Path
+from config import Config
+from sql_transformer import SQLTransformer
+from sql_classifier import classify_statements
+from file_processor import FileProcessor, read_file_lines
+from report_generator import ReportGenerator
+
+# 단계별 벤치마크 이름 (실행 순서)
+STAGES = ('read', 'classify', 'transform', 'report')
+
+# 합성 코퍼스 생성용 이름/컬럼 풀
+_SCHEMAS = ['hr', 'sales', 'fin', 'ops']
+_TABLES = ['employees', 'orders', 'customers', 'invoices', 'shipments', 'accounts', 'payments']
+_COLUMN_TYPES = [
+    ('name', 'VARCHAR2(100)'), ('code', 'VARCHAR2(20)'), ('amount', 'NUMBER(12,2)'),
+    ('qty', 'NUMBER(5,0)'), ('flag', 'NUMBER(1,0)'), ('big_id', 'NUMBER(15,0)'),
+    ('huge_id', 'NUMBER(20,0)'), ('created_at', 'DATE'), ('updated_at', 'DATE DEFAULT SYSDATE'),
+    ('note', 'CLOB'), ('payload', 'RAW(2000)'), ('memo', 'LONG'), ('status', 'CHAR(1)')
+]
+_DATE_FORMATS = [("'2024-01-15'", "'YYYY-MM-DD'"), ("'15-Jan-2024'", "'DD-Mon-YYYY'"),
+                 ("'20240115'", "'YYYYMMDD'")]
+
+
+def _table(rng, index):
+    return f"{rng.choice(_SCHEMAS)}.{rng.choice(_TABLES)}_{index % 97}"
+
+
+def _ddl_statement(rng, index):
+    columns = rng.sample(_COLUMN_TYPES, rng.randint(4, 9))
+    lines = [f"CREATE TABLE {_table(rng, index)} ("]
+    lines.append("    id NUMBER(10,0) NOT NULL,")
+    for column, column_type in columns:
+        lines.append(f"    {column} {column_type},")
+    lines.append(f"    CONSTRAINT pk_{index} PRIMARY KEY (id)")
+    lines.append(")")
+    lines.append(f"TABLESPACE users_{rng.randint(1, 9)}")
+    if rng.random() < 0.7:
+        lines.append(f"PCTFREE {rng.choice([5, 10, 20])} INITRANS 2 MAXTRANS 255")
+    if rng.random() < 0.7:
+        lines.append(f"STORAGE (INITIAL {rng.choice(['64K', '1M'])} NEXT 1M MINEXTENTS 1 MAXEXTENTS UNLIMITED);")
+    else:
+        lines[-1] += ";"
+    if rng.random() < 0.3:
+        lines.append(f"COMMENT ON TABLE {_table(rng, index)} IS 'synthetic table {index}';")
+    return lines
+
+
+def _dml_statement(rng, index):
+    table = _table(rng, index)
+    value, fmt = rng.choice(_DATE_FORMATS)
+    kind = rng.randrange(5)
+    if kind == 0:
+        return [
+            "SELECT /*+ FULL(e) */ e.id,",
+            "       NVL(e.amount, 0) AS amount,",
+            "       DECODE(e.status, 'A', 'Active', 'I', 'Inactive', 'Unknown') AS status_name,",
+            f"       TO_DATE({value}, {fmt}) AS base_date",
+            f"  FROM {table} e, {_table(rng, index + 1)} d",
+            " WHERE e.id = d.id(+)",
+            f"   AND e.created_at > SYSDATE - {rng.randint(1, 90)};",
+        ]
+    if kind == 1:
+        return [
+            f"INSERT INTO {table} (id, name, created_at)",
+            f"VALUES (seq_{index % 13}.NEXTVAL, 'row {index}', TO_DATE({value}, {fmt}));",
+        ]
+    if kind == 2:
+        return [
+            f"UPDATE {table}",
+            f"   SET amount = NVL(amount, 0) * {rng.randint(1, 20) / 10},",
+            "       updated_at = SYSTIMESTAMP",
+            " WHERE TRUNC(created_at) = TRUNC(SYSDATE)",
+            f"   AND status = '{rng.choice('AIX')}';",
+        ]
+    if kind == 3:
+        return [
+            "SELECT SUBSTR(name, 1, 3), INSTR(name, 'a'), CEIL(amount),",
+            "       ADD_MONTHS(created_at, 3), MONTHS_BETWEEN(SYSDATE, created_at),",
+            "       TRUNC(created_at, 'MM')",
+            f"  FROM {table}",
+            f" WHERE ROWNUM <= {rng.randint(10, 1000)};",
+        ]
+    return [
+        f"SELECT empno, mgr, LEVEL FROM {table}",
+        " START WITH mgr IS NULL",
+        " CONNECT BY PRIOR empno = mgr;",
+    ]
+
+
+def _plsql_procedure(rng, index):
+    table = _table(rng, index)
+    return [
+        f"  PROCEDURE p_{index} IS",
+        f"    v_amount {table}.amount%TYPE;",
+        f"    v_row {table}%ROWTYPE;",
+        f"    CURSOR c_{index} IS SELECT amount FROM {table} WHERE status = 'A';",
+        "  BEGIN",
+        f"    OPEN c_{index};",
+        "    LOOP",
+        f"      FETCH c_{index} INTO v_amount;",
+        f"      EXIT WHEN c_{index}%NOTFOUND;",
+        "      IF v_amount > 0 THEN",
+        "        DBMS_OUTPUT.PUT_LINE('amount: ' || NVL(v_amount, 0));",
+        "      END IF;",
+        "    END LOOP;",
+        f"    CLOSE c_{index};",
+        "  EXCEPTION WHEN OTHERS THEN",
+        "    NULL;",
+        f"  END p_{index};",
+    ]
+
+
+def generate_corpus(out_dir, files=30, statements=100, seed=0, kinds=('DDL', 'DML', 'PLSQL')):
+    """
+    벤치마크용 Oracle SQL 합성 코퍼스를 생성합니다. 같은 인자에는 항상 같은 파일이 만들어집니다.
+
+    - DDL: TABLESPACE / STORAGE / PCTFREE 절과 Oracle 타입이 있는 CREATE TABLE
+    - DML: NVL / DECODE / TO_DATE / (+) 조인 / NEXTVAL / CONNECT BY 가 섞인 SELECT, INSERT, UPDATE
+    - PLSQL: 커서, %TYPE, DBMS_OUTPUT, EXCEPTION 을 쓰는 프로시저로 구성된 패키지 바디
+
+    :param out_dir: 생성할 디렉토리
+    :param files: 파일 수 (kinds 를 순서대로 번갈아 생성)
+    :param statements: 파일당 문장 수 (PLSQL 은 패키지당 프로시저 수)
+    :param seed: 난수 시드
+    :param kinds: 생성할 파일 종류
+    :return: 생성된 파일 경로 목록
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for file_index in range(files):
+        kind = kinds[file_index % len(kinds)]
+        rng = random.Random(f"{seed}:{file_index}")
+        lines = [f"-- synthetic {kind} file {file_index} (seed={seed})"]
+        if kind == 'PLSQL':
+            lines.append(f"CREATE OR REPLACE PACKAGE BODY pkg_{file_index} AS")
+            for index in range(statements):
+                lines.extend(_plsql_procedure(rng, index))
+                lines.append("")
+            lines.append(f"END pkg_{file_index};")
+            lines.append("/")
+        else:
+            make_statement = _ddl_statement if kind == 'DDL' else _dml_statement
+            for index in range(statements):
+                if rng.random() < 0.1:
+                    lines.append(f"-- statement {index}")
+                lines.extend(make_statement(rng, index))
+                lines.append("")
+        path = out_dir / f"bench_{kind.lower()}_{file_index:05d}.sql"
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def _measure(stage, func, files, lines, repeat=3, track_memory=True):
+    """func 를 repeat 회 실행한 최소 시간과 (별도 1회 실행의) tracemalloc 최대 메모리를 측정합니다."""
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if track_memory:
+        # tracemalloc 은 실행 속도를 크게 떨어뜨리므로 시간 측정과 분리
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        "stage": stage,
+        "files": files,
+        "lines": lines,
+        "seconds": round(best, 6),
+        "lines_per_sec": round(lines / best, 1) if best else None,
+        "files_per_sec": round(files / best, 2) if best else None,
+        "peak_memory_bytes": peak
+    }
+
+
+def run_benchmarks(corpus_paths, config, stages=STAGES, repeat=3, track_memory=True):
+    """
+    코퍼스에 대해 단계별(read / classify / transform / report) 벤치마크를 실행합니다.
+
+    :param corpus_paths: SQL 파일 경로 목록
+    :param config: Config 객체 (캐시는 사용하지 않음)
+    :return: {"meta": {...}, "stages": [...]} (JSON 직렬화 가능)
+    """
+    config.USE_CACHE = False
+    transformer = SQLTransformer(config)
+    processor = FileProcessor(config, transformer, None)
+
+    texts = {path: "".join(read_file_lines(path, config)) for path in corpus_paths}
+    file_count = len(corpus_paths)
+    line_count = sum(text.count('\n') for text in texts.values())
+
+    def run_read():
+        for path in corpus_paths:
+            for _ in read_file_lines(path, config):
+                pass
+
+    def run_classify():
+        for text in texts.values():
+            classify_statements(text)
+
+    def run_transform():
+        # 반복 측정마다 같은 조건이 되도록 문장 memo 를 비움 (코퍼스 안의 중복만 반영)
+        if processor.statement_memo is not None:
+            processor.statement_memo.clear()
+        for text in texts.values():
+            processor.transform_lines(text.splitlines(keepends=True))
+
+    def run_report():
+        report_dir = Path(tempfile.mkdtemp(prefix='ora2red_bench_report_'))
+        try:
+            config.REPORT_DIR = report_dir
+            reporter = ReportGenerator(config)
+            for path, (original_sql, conversion) in report_inputs.items():
+                reporter.add_execution_result(
+                    file_name=path.name, original_sql=original_sql,
+                    transformed_sql=conversion["transformed_sql"], execution_time=0.0,
+                    error=conversion["manual_reason"], applied_rules=conversion["applied_rules"])
+                reporter.add_html_log(path.name, original_sql, conversion["transformed_sql"],
+                                      conversion["change_log"])
+            with contextlib.redirect_stdout(io.StringIO()):
+                reporter.generate_csv()
+                reporter.generate_html()
+            reporter.close()
+        finally:
+            config.REPORT_DIR = original_report_dir
+            shutil.rmtree(report_dir, ignore_errors=True)
+
+    original_report_dir = config.REPORT_DIR
+    report_inputs = {}
+    if 'report' in stages:
+        # 리포트 단계 입력은 측정 밖에서 미리 변환
+        report_inputs = {
+            path: processor.transform_lines(texts[path].splitlines(keepends=True)) for path in corpus_paths
+        }
+
+    runners = {'read': run_read, 'classify': run_classify, 'transform': run_transform, 'report': run_report}
+    results = [
+        _measure(stage, runners[stage], file_count, line_count, repeat, track_memory)
+        for stage in STAGES if stage in stages
+    ]
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rules": len(transformer.compiled_rules),
+            "rules_hash": transformer.rules_hash,
+            "processing_mode": getattr(config, 'PROCESSING_MODE', 'line'),
+            "files": file_count,
+            "lines": line_count,
+            "bytes": sum(os.path.getsize(path) for path in corpus_paths),
+            "repeat": repeat
+        },
+        "stages": results
+    }
+
+
+def verify_statement_memo(corpus_paths, config):
+    """
+    문장 memo(DEDUP_STATEMENTS) 사용/미사용 변환 결과가 같은지 파일별로 비교합니다.
+    (변환 SQL, 변경 기록, 규칙 적용 키)
+
+    :param corpus_paths: SQL 파일 경로 목록
+    :param config: Config 객체 (캐시는 사용하지 않음, 검사 후 DEDUP_STATEMENTS 는 원래 값으로 복원)
+    :return: {"files": 파일 수, "mismatches": [결과가 다른 파일 이름, ...]}
+    """
+    config.USE_CACHE = False
+    original_dedup = getattr(config, 'DEDUP_STATEMENTS', False)
+    outputs = {}
+    try:
+        for dedup in (True, False):
+            config.DEDUP_STATEMENTS = dedup
+            processor = FileProcessor(config, SQLTransformer(config), None)
+            for path in corpus_paths:
+                _, conversion = processor.transform_lines(read_file_lines(path, config))
+                outputs.setdefault(path, []).append((
+                    conversion["transformed_sql"],
+                    [record.to_row() for record in conversion["change_log"]],
+                    conversion["applied_rules"]
+                ))
+    finally:
+        config.DEDUP_STATEMENTS = original_dedup
+    mismatches = [path.name for path, (with_memo, without_memo) in outputs.items() if with_memo != without_memo]
+    return {"files": len(corpus_paths), "mismatches": mismatches}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ora2Red 단계별 벤치마크 (결과는 JSON)")
+    parser.add_argument("--corpus", help="측정할 SQL 디렉토리 (지정하지 않으면 합성 코퍼스 생성)")
+    parser.add_argument("--files", type=int, default=30, help="합성 코퍼스 파일 수 (기본값: 30)")
+    parser.add_argument("--statements", type=int, default=100, help="파일당 문장/프로시저 수 (기본값: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 코퍼스 난수 시드 (기본값: 0)")
+    parser.add_argument("--corpus-out", help="합성 코퍼스를 보관할 디렉토리 (지정하지 않으면 임시 디렉토리 후 삭제)")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"실행할 단계 (기본값: {','.join(STAGES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수, 최소 시간 사용 (기본값: 3)")
+    parser.add_argument("--mode", choices=["line", "statement", "buffer"], default=None, help="변환 단위")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 최대 메모리 측정 생략")
+    parser.add_argument("--verify-dedup", action="store_true",
+                        help="문장 memo 사용/미사용 변환 결과가 같은지 확인 (다르면 종료 코드 1)")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (지정하지 않으면 표준 출력)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(STAGES)})")
+        sys.exit(1)
+
+    config = Config()
+    # 파일별 변환 로그가 측정을 방해하지 않도록 경고 이상만 출력
+    logging.getLogger().setLevel(logging.WARNING)
+    if args.mode:
+        config.PROCESSING_MODE = args.mode
+
+    temp_dir = None
+    if args.corpus:
+        corpus_paths = sorted(Path(args.corpus).rglob('*.sql'))
+    else:
+        corpus_dir = args.corpus_out or tempfile.mkdtemp(prefix='ora2red_bench_corpus_')
+        temp_dir = None if args.corpus_out else corpus_dir
+        corpus_paths = generate_corpus(corpus_dir, args.files, args.statements, args.seed)
+    try:
+        result = run_benchmarks(corpus_paths, config, stages, args.repeat, not args.no_memory)
+        if args.verify_dedup:
+            result["dedup_check"] = verify_statement_memo(corpus_paths, config)
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    result["meta"]["corpus"] = args.corpus or {
+        "files": args.files, "statements": args.statements, "seed": args.seed}
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        print(f"벤치마크 결과를 저장했습니다: {args.output}")
+    else:
+        print(output)
+    if args.verify_dedup and result["dedup_check"]["mismatches"]:
+        print(f"문장 memo 사용 시 변환 결과가 다른 파일: {', '.join(result['dedup_check']['mismatches'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+import re
+import hashlib
+import logging
+from array import array
+from typing import Dict, List, Optional, Tuple
+from change_record import ChangeRecord, APPLIED, MANUAL, TIMEOUT
+from sql_classifier import (INSERT_LEAD_PATTERN, INSERT_LITERAL_PATTERN, find_insert_runs, insert_header_key, match_insert_header,
+                            parse_insert_values)
+
+# BULK_INSERT_MODE 값: rows (행 형태 유지) / multirow (multi-row INSERT 로 합침) / copy (CSV + COPY 문)
+BULK_INSERT_MODES = ('rows', 'multirow', 'copy')
+# 열마다 보관하는 식 → 변환 결과 memo 최대 개수 (넘으면 새 식은 저장하지 않음)
+MEMO_MAX_ENTRIES = 10000
+# COPY 스크립트에서 설정값이 없을 때 쓰는 자리 표시자
+S3_PREFIX_PLACEHOLDER = "s3://<버킷>/<경로>"
+IAM_ROLE_PLACEHOLDER = "<IAM 역할 ARN>"
+
+# CSV 로 옮길 수 있는 변환 결과 식: 문자열 리터럴을 감싼 CAST (TO_DATE 변환 결과 등, COPY 가 컬럼 타입으로 변환)
+_CAST_LITERAL_RE = re.compile(r"CAST\(\s*('[^']*(?:''[^']*)*')\s+AS\s+[A-Za-z_][\w ]*(?:\([\d,\s]*\))?\s*\)\Z", re.I)
+_LITERAL_VALUE_RE = re.compile(INSERT_LITERAL_PATTERN + r"\Z", re.I)
+# 열 템플릿 정규식에서 식으로 인식하는 값: 식별자(SYSDATE, 시퀀스.NEXTVAL 등)와 리터럴/식별자 인자의 함수 호출 한 단계
+# (중첩 호출, 연산식 등은 sql_classifier.parse_insert_values 로 나눔)
+_SIMPLE_EXPR_PATTERN = (r"[A-Za-z_][\w$#]*(?:[ \t]*\.[ \t]*[A-Za-z_][\w$#]*)*"
+                        r"(?:[ \t]*\((?:'[^'\n]*(?:''[^'\n]*)*'|[^'()\n/-])*\))?")
+
+
+class InsertTemplate:
+    """
+    같은 헤더(대상 테이블 + 컬럼 목록)의 INSERT ... VALUES 행에 공통으로 쓰는 사전 계산 결과(열 템플릿)입니다.
+
+    - row: 헤더와 열 수가 같은 행을 한 번에 열별로 나누는 정규식. 열마다 리터럴(문자열 / 숫자 / NULL) 또는
+      단순한 식 그룹이 매치되며, 리터럴에는 규칙을 적용하지 않으므로 식 그룹만 변환합니다.
+    - memos: 열마다 식 값(TO_DATE(...), SYSDATE, 시퀀스 등) → 변환 결과. 같은 식이 반복되는 열은 한 번만 변환합니다.
+    - usable: 헤더 자체에 규칙이 적용되면(DATE 같은 컬럼명 등) False 이며 해당 행은 일반 경로로 변환합니다.
+    """
+
+    def __init__(self, key: str, width: int, usable: bool):
+        self.key = key
+        self.width = width
+        self.usable = usable
+        # 그룹 1: 헤더, 열 i: 2 + 2i (리터럴) / 3 + 2i (식)
+        self.row = re.compile(
+            INSERT_LEAD_PATTERN + r"(" + r"[ \t]+".join(map(re.escape, key.split())) + r")[ \t]*\([ \t]*"
+            + r"[ \t]*,[ \t]*".join([f"(?:({INSERT_LITERAL_PATTERN})|({_SIMPLE_EXPR_PATTERN}))"] * width)
+            + r"[ \t]*\)[ \t]*;[ \t\r]*\n?\Z", re.I)
+        self.expr_groups = range(3, 3 + 2 * width, 2)
+        self.memos = [{} for _ in range(width)]
+
+
+class BulkInsertPlan:
+    """
+    변환 단위(라인 또는 문장) 목록에서 찾은 대량 INSERT ... VALUES 구간의 변환 경로입니다. (BULK_INSERT_MODE)
+
+    구간 안의 행은 SQLTransformer 의 전체 규칙 대신 값 위치의 식에만 DML 규칙을 적용합니다.
+    문자열/숫자/NULL 리터럴은 바꾸지 않으며(토큰 인식 모드와 같음), 주석이 있거나 여러 라인에 걸친 행 등
+    행으로 분리할 수 없는 단위는 None 을 반환하여 호출한 쪽이 일반 경로로 변환합니다.
+    변환 후 emit() 이 mode 에 따라 구간을 multi-row INSERT 또는 CSV + COPY 문으로 바꿉니다.
+    """
+
+    def __init__(self, transformer, texts: List[str], runs: List[Tuple[int, int]], mode: str = 'rows',
+                 batch_rows: int = 1000, s3_prefix: str = None, iam_role: str = None):
+        self.transformer = transformer
+        self.mode = mode
+        self.batch_rows = max(1, batch_rows)
+        self.s3_prefix = s3_prefix
+        self.iam_role = iam_role
+        self.runs = runs
+        self.templates: Dict[str, InsertTemplate] = {}
+        self._patterns = {rule["rule_key"]: rule["pattern"].pattern for rule in transformer.compiled_rules}
+        # 단위별 템플릿 (구간 밖과 빈 단위는 None) 과 빠른 경로로 변환한 행의 라인 번호 (0 이면 일반 경로)
+        self._unit_templates: List[Optional[InsertTemplate]] = [None] * len(texts)
+        self.row_lines = array('l', bytes(8 * len(texts)))
+        for start, end in runs:
+            # 구간의 INSERT 는 모두 같은 헤더
+            template = self._template(texts, start, end)
+            if template is None:
+                continue
+            for index in range(start, end):
+                if texts[index].strip():
+                    self._unit_templates[index] = template
+        # COPY 모드에서 기록할 CSV 파일 (파일명 → 내용)
+        self.copy_files: Dict[str, str] = {}
+        self.row_count = 0
+
+    @classmethod
+    def build(cls, transformer, texts: List[str], mode: str = 'rows', min_rows: int = 100, **options):
+        """sql_classifier 로 대량 INSERT 구간을 찾아 계획을 만듭니다. 구간이 없으면 None."""
+        if mode not in BULK_INSERT_MODES:
+            raise ValueError(f"지원하지 않는 BULK_INSERT_MODE 입니다: {mode} ({', '.join(BULK_INSERT_MODES)})")
+        runs = find_insert_runs(texts, max(1, min_rows))
+        if not runs:
+            return None
+        return cls(transformer, texts, runs, mode, **options)
+
+    def _template(self, texts, start, end) -> Optional[InsertTemplate]:
+        match = match_insert_header(texts[start])
+        key = insert_header_key(match)
+        template = self.templates.get(key)
+        if template is None:
+            # 열 수는 값 목록을 나눌 수 있는 첫 행 기준 (없으면 구간 전체를 일반 경로로 변환)
+            for index in range(start, end):
+                row = match_insert_header(texts[index])
+                parsed = parse_insert_values(texts[index], row.end()) if row is not None else None
+                if parsed is not None:
+                    break
+            else:
+                return None
+            header = match.group('header')
+            new_header, _, _, _ = self.transformer.apply_transformations(header, 0, set(), 'DML')
+            template = InsertTemplate(key, len(parsed[0]), new_header == header)
+            self.templates[key] = template
+        return template if template.usable else None
+
+    def transform_row(self, index: int, text: str, start_line: int, applied_changes, rule_trace: list = None):
+        """
+        index 번째 변환 단위가 대량 INSERT 행이면 값 위치의 식에만 규칙을 적용합니다.
+
+        :param start_line: 단위가 시작하는 라인 번호 (문장 단위는 앞쪽 빈 라인 포함)
+        :return: apply_transformations 와 같은 (변환된 텍스트(끝 공백 제거), 변경 기록, 수동 검토 여부, 사유) 또는
+                 일반 경로로 변환해야 하면 None
+        """
+        template = self._unit_templates[index]
+        if template is None:
+            return None
+        row = template.row.match(text)
+        if row is not None:
+            row_start = row.start(1)
+            values = [(column, row.span(group)) for column, group in enumerate(template.expr_groups)
+                      if row.start(group) != -1]
+        else:
+            match = match_insert_header(text)
+            parsed = parse_insert_values(text, match.end()) if match is not None else None
+            if parsed is None or len(parsed[0]) != template.width:
+                return None
+            row_start = match.start('header')
+            values = [(column, (start, end)) for column, (start, end, kind) in enumerate(parsed[0])
+                      if kind == 'expr']
+        line_number = start_line + text.count('\n', 0, row_start) if row_start else start_line
+        self.row_lines[index] = line_number
+        self.row_count += 1
+        if not values:
+            return text.rstrip(), [], False, []
+
+        pieces = []
+        cursor = 0
+        fired = []
+        manual_required = False
+        manual_reasons = []
+        for column, (start, end) in values:
+            entry = self._transform_value(template.memos[column], text[start:end])
+            new_value, records, value_manual, value_reasons, trace = entry
+            pieces.append(text[cursor:start])
+            pieces.append(new_value)
+            cursor = end
+            fired.extend(records)
+            if value_manual:
+                manual_required = True
+                manual_reasons.extend(value_reasons)
+            if rule_trace is not None:
+                rule_trace.extend((rule_key, line_number, rule_fired) for rule_key, rule_fired in trace)
+        pieces.append(text[cursor:])
+        new_text = "".join(pieces).rstrip()
+
+        change_log = []
+        if fired:
+            # 변경 전/후는 행 전체 (라인 모드의 변경 기록과 같은 형식)
+            line_start = text.rfind('\n', 0, row_start) + 1
+            before = text[line_start:].rstrip('\n')
+            after = new_text[line_start:]
+            for rule_key, description, suffix, flag, reason in fired:
+                if suffix is not None:
+                    applied_key = f"{line_number}-{suffix}"
+                    if applied_key in applied_changes:
+                        continue
+                    applied_changes.add(applied_key)
+                change_log.append(ChangeRecord(line_number, rule_key, description, before, after, flag, reason))
+        return new_text, change_log, manual_required, list(dict.fromkeys(manual_reasons))
+
+    def _transform_value(self, memo, value):
+        # 식 하나에 DML 규칙 적용. 변경 기록은 (rule_key, 설명, 규칙 적용 키 접미사, flag, 사유) 로 보관
+        entry = memo.get(value)
+        if entry is not None:
+            return entry
+        trace = []
+        new_value, change_log, manual_required, manual_reasons = self.transformer.apply_transformations(
+            value, 0, set(), 'DML', rule_trace=trace)
+        records = [
+            (record.rule_key, record.description,
+             None if record.flag == TIMEOUT else f"{record.description}-{self._patterns[record.rule_key]}",
+             record.flag, record.reason)
+            for record in change_log
+        ]
+        entry = (new_value, records, manual_required, manual_reasons,
+                 [(rule_key, rule_fired) for rule_key, _, rule_fired in trace])
+        # 정규식 시간 초과는 실행 환경에 따라 달라지므로 저장하지 않음
+        # 규칙 프로파일 수집 중에도 저장하지 않음 (식마다 규칙을 실행해야 실행/매치 횟수가 맞음)
+        if (self.transformer.profiler is None and len(memo) < MEMO_MAX_ENTRIES
+                and not any(record[3] == TIMEOUT for record in records)):
+            memo[value] = entry
+        return entry
+
+    def emit(self, outputs: List[str], applied_changes, as_parts: bool = False) -> Tuple[List[ChangeRecord], List[str]]:
+        """
+        mode 가 multirow / copy 이면 빠른 경로로 변환한 연속 행을 multi-row INSERT 또는 COPY 문으로 바꿉니다.
+        outputs 는 단위별 변환 결과이며 제자리에서 바뀝니다. (as_parts: 문장 단위처럼 앞쪽 공백/줄바꿈을 포함한 조각)
+
+        :return: (구간마다 추가할 변경 기록, 수동 검토 사유 목록)
+        """
+        if self.mode == 'rows':
+            return [], []
+        records = []
+        manual_reasons = []
+        fallback = 0
+        for start, end in reversed(self.runs):
+            # as_parts 이면 이어 붙일 조각(앞쪽 줄바꿈 포함), 아니면 라인 목록
+            pieces = []
+            index = start
+            while index < end:
+                if not self.row_lines[index]:
+                    if as_parts or outputs[index].strip():
+                        pieces.append(outputs[index])
+                    index += 1
+                    continue
+                # 행 앞의 주석(배치 구분 주석 등)은 출력 블록 앞에 유지하고, 주석이 있는 행에서 새 블록 시작
+                rows = [index]
+                index += 1
+                while index < end and (self.row_lines[index] or not outputs[index].strip()):
+                    if self.row_lines[index]:
+                        if self._row_parts(outputs[index])[0].strip():
+                            break
+                        rows.append(index)
+                    index += 1
+                emitted = self._emit_copy(rows, outputs) if self.mode == 'copy' else None
+                if emitted is None:
+                    fallback += self.mode == 'copy'
+                    emitted = self._emit_multirow(rows, outputs)
+                segment_lines, description, flag, reason = emitted
+                line_number = self.row_lines[rows[0]]
+                prefix, _, _, _ = self._row_parts(outputs[rows[0]])
+                first_row = outputs[rows[0]][len(prefix):].strip()
+                applied_changes.add(f"{line_number}-{description}-BULK_INSERT_MODE={self.mode}")
+                summary = " ".join(line.strip() for line in segment_lines[:3])
+                records.append(ChangeRecord(line_number, f"bulk-insert:{self.mode}", description, first_row,
+                                            summary + (" ..." if len(segment_lines) > 3 else ""), flag, reason))
+                if reason:
+                    manual_reasons.append(reason)
+                if as_parts:
+                    pieces.append(prefix + "\n".join(segment_lines))
+                else:
+                    if prefix.strip():
+                        pieces.append(prefix.rstrip())
+                    pieces.extend(segment_lines)
+            outputs[start:end] = ["".join(pieces)] if as_parts else pieces
+        if fallback:
+            logging.info(f"COPY 로 옮길 수 없는 식이 있는 INSERT 구간 {fallback}개는 multi-row INSERT 로 기록합니다.")
+        records.reverse()
+        return records, list(dict.fromkeys(manual_reasons))
+
+    @staticmethod
+    def _row_parts(output):
+        # 변환된 행 → (행 앞의 공백/줄바꿈/주석, 행 라인의 들여쓰기, 헤더 match, 값 목록 '(...)')
+        match = match_insert_header(output)
+        header_start = match.start('header')
+        line_start = output.rfind('\n', 0, header_start) + 1
+        line_lead = output[line_start:header_start]
+        indent = line_lead[:len(line_lead) - len(line_lead.lstrip())]
+        if line_lead.strip():
+            # 같은 라인의 /* ... */ 주석은 블록 앞 라인으로
+            prefix = output[:header_start].rstrip() + "\n"
+        else:
+            prefix = output[:line_start]
+        values = output[match.end() - 1:output.rindex(')') + 1]
+        return prefix, indent, match, values
+
+    def _emit_multirow(self, rows, outputs):
+        lines = []
+        for batch_start in range(0, len(rows), self.batch_rows):
+            batch = rows[batch_start:batch_start + self.batch_rows]
+            _, indent, match, _ = self._row_parts(outputs[batch[0]])
+            lines.append(indent + match.group('header'))
+            for position, index in enumerate(batch):
+                _, _, _, values = self._row_parts(outputs[index])
+                lines.append(indent + "  " + values + (";" if position == len(batch) - 1 else ","))
+        return lines, f"INSERT ... VALUES {len(rows)}행 → multi-row INSERT", APPLIED, ""
+
+    def _emit_copy(self, rows, outputs):
+        csv_lines = []
+        for index in rows:
+            output = outputs[index]
+            match = match_insert_header(output)
+            parsed = parse_insert_values(output, match.end())
+            if parsed is None:
+                return None
+            fields = []
+            for start, end, kind in parsed[0]:
+                field = _csv_field(output[start:end], kind)
+                if field is None:
+                    return None
+                fields.append(field)
+            csv_lines.append(",".join(fields))
+        csv_text = "\n".join(csv_lines) + "\n"
+        _, indent, match, _ = self._row_parts(outputs[rows[0]])
+        table = match.group('table')
+        name = f"{re.sub(r'[^0-9A-Za-z_]+', '_', table).strip('_') or 'table'}_" \
+               f"{hashlib.sha1(csv_text.encode('utf-8')).hexdigest()[:12]}.csv"
+        self.copy_files[name] = csv_text
+        columns = match.group('columns')
+        target = table + (f" ({columns.strip()})" if columns is not None else "")
+        lines = [
+            f"-- {len(rows)}행 → COPY (데이터 파일: {name})",
+            f"COPY {target}",
+            f"FROM '{(self.s3_prefix or S3_PREFIX_PLACEHOLDER).rstrip('/')}/{name}'",
+            f"IAM_ROLE '{self.iam_role or IAM_ROLE_PLACEHOLDER}'",
+            "FORMAT AS CSV EMPTYASNULL DATEFORMAT 'auto' TIMEFORMAT 'auto';",
+        ]
+        if self.s3_prefix and self.iam_role:
+            flag, reason = APPLIED, ""
+        else:
+            flag = MANUAL
+            reason = "COPY 문의 S3 경로 / IAM 역할을 지정하세요. (BULK_COPY_S3_PREFIX, BULK_COPY_IAM_ROLE)"
+        # 다른 출력처럼 COPY 문도 줄바꿈으로 끝냄
+        return [indent + line for line in lines] + [""], f"INSERT ... VALUES {len(rows)}행 → COPY", flag, reason
+
+
+def _csv_field(value: str, kind: str) -> Optional[str]:
+    """
+    값 하나를 CSV 필드로 바꿉니다. (COPY ... CSV EMPTYASNULL 기준, 옮길 수 없는 식이면 None)
+    Oracle 은 빈 문자열을 NULL 로 취급하므로 NULL 과 '' 는 모두 빈 필드로 기록합니다.
+    """
+    if kind == 'expr':
+        cast = _CAST_LITERAL_RE.match(value)
+        if cast is not None:
+            value, kind = cast.group(1), 'string'
+        elif _LITERAL_VALUE_RE.match(value):
+            kind = 'string' if value.startswith("'") else 'null' if value.upper() == 'NULL' else 'number'
+        else:
+            return None
+    if kind == 'null':
+        return ""
+    if kind == 'number':
+        return value
+    text = value[1:-1].replace("''", "'")
+    return '"' + text.replace('"', '""') + '"' if text else ""
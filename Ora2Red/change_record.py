@@ -0,0 +1,137 @@
+import os
+from typing import Iterable, List
+
+# ChangeRecord.flag 값
+APPLIED = 0     # 규칙 적용
+MANUAL = 1      # 규칙 적용, 수동 검토 필요
+TIMEOUT = 2     # 정규식 시간 초과로 규칙을 건너뜀 (수동 검토 필요)
+
+
+class ChangeRecord:
+    """
+    규칙 적용 한 건의 변경 기록입니다.
+
+    HTML/텍스트는 리포트·로그 파일을 만들 때만 렌더링하며,
+    캐시/결과 파일에는 to_row() 의 리스트 형태로 저장합니다.
+    """
+
+    __slots__ = ("line", "rule_key", "description", "before", "after", "flag", "reason")
+
+    def __init__(self, line, rule_key, description, before, after, flag=APPLIED, reason=""):
+        self.line = line
+        self.rule_key = rule_key
+        self.description = description
+        self.before = before
+        self.after = after
+        self.flag = flag
+        self.reason = reason
+
+    def to_row(self) -> list:
+        return [self.line, self.rule_key, self.description, self.before, self.after, self.flag, self.reason]
+
+    @classmethod
+    def from_row(cls, row) -> "ChangeRecord":
+        return cls(*row)
+
+    def __reduce__(self):
+        # 워커 프로세스 → 부모 프로세스 전달 시 리스트 형태로 직렬화
+        return (ChangeRecord.from_row, (self.to_row(),))
+
+    def __eq__(self, other):
+        return isinstance(other, ChangeRecord) and self.to_row() == other.to_row()
+
+    def __repr__(self):
+        return f"ChangeRecord({self.to_row()!r})"
+
+    def _notice(self) -> str:
+        if self.flag == TIMEOUT:
+            return f" ⏱️ 시간 초과로 건너뜀 - 수동 검토 필요: {self.reason}"
+        if self.flag == MANUAL and self.reason:
+            return f" ⚠️ 수동 검토 필요: {self.reason}"
+        return ""
+
+    def to_html(self) -> str:
+        return (
+            f"<div style='margin-bottom: 10px;'>"
+            f"<b>[Line {self.line}] 🔄 {self.description}{self._notice()}</b><br>"
+            f"<span style='background-color: #ffe5e5;'>🟢 변경 전: {self.before}</span><br>"
+            f"<span style='background-color: #e5ffe5;'>🔵 변경 후: {self.after}</span>"
+            f"</div>"
+        )
+
+    def to_text(self) -> str:
+        return (
+            f"[Line {self.line}] {self.description}{self._notice()}\n"
+            f"  변경 전: {self.before}\n"
+            f"  변경 후: {self.after}"
+        )
+
+
+def to_rows(records: Iterable[ChangeRecord]) -> List[list]:
+    return [record.to_row() for record in records]
+
+
+def from_rows(rows) -> List[ChangeRecord]:
+    return [ChangeRecord.from_row(row) for row in rows]
+
+
+def render_change_log_html(change_log) -> str:
+    """
+    변경 기록(ChangeRecord 또는 to_row() 리스트)을 리포트용 HTML 로 렌더링합니다.
+    이전 형식(미리 렌더링된 HTML 문자열)의 결과 파일도 그대로 표시합니다.
+    """
+    if not change_log:
+        return ""
+    if isinstance(change_log, str):
+        return change_log
+    return "\n".join(_as_record(record).to_html() for record in change_log)
+
+
+def render_change_log_text(change_log) -> str:
+    return "\n\n".join(_as_record(record).to_text() for record in change_log)
+
+
+class ChangeLogWriter:
+    """
+    변경 기록을 render_change_log_text 결과(+ 마지막 줄바꿈)와 같은 형식으로 파일에 차례로 기록합니다.
+    변경 기록을 모두 메모리에 모을 수 없는 대용량 파일 변환에 사용합니다.
+    """
+
+    def __init__(self, path):
+        # path 가 None 이면 (DRY_RUN) 개수만 셈
+        self._file = open(path if path is not None else os.devnull, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, change_log):
+        for record in change_log:
+            if self.count:
+                self._file.write("\n\n")
+            self._file.write(_as_record(record).to_text())
+            self.count += 1
+
+    def close(self):
+        if self.count:
+            self._file.write("\n")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def change_log_text(change_log) -> str:
+    """앵커 검색용으로 변경 기록의 변경 전/후 라인을 이어 붙입니다. (규칙 적용 직후의 중간 결과 포함)"""
+    if isinstance(change_log, str):
+        return change_log
+    parts = []
+    for record in change_log:
+        record = _as_record(record)
+        parts.append(record.before)
+        parts.append(record.after)
+    return "\n".join(parts)
+
+
+def _as_record(record) -> ChangeRecord:
+    return record if isinstance(record, ChangeRecord) else ChangeRecord.from_row(record)
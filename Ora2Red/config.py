@@ -4,8 +4,9 @@ import logging
 from pathlib import Path
 
 class Config:
-    def __init__(self):
-        self.BASE_DIR = Path('.')
+    def __init__(self, base_dir='.'):
+        # 출력 루트 (converted_sqls / logs / reports 가 이 아래에 생성됨, CLI --output-dir)
+        self.BASE_DIR = Path(base_dir)
         # 변환 파일 저장 폴더: 모든 변환된 SQL 파일은 converted_sqls 내부에 위치
         self.CONVERTED_DIR = self.BASE_DIR / 'converted_sqls'
         # DDL 결과용 폴더 (converted_sqls/DDL/...)
@@ -23,10 +24,103 @@ class Config:
         self.REPORT_DIR = self.BASE_DIR / 'reports'
         # 변환 규칙 파일 설정
         self.TRANSFORMATIONS_FILE = 'transformations.json'
+        # 컴파일된 규칙 집합 파일 (--compile-rules 로 생성). TRANSFORMATIONS_FILE 과 내용이 일치할 때만 사용
+        self.COMPILED_RULES_FILE = 'transformations.compiled.json'
         self.manual_check_keywords = ['DECLARE', 'EXCEPTION WHEN OTHERS', 'CONNECT BY PRIOR']
         # 리포트 파일명 설정
         self.CSV_REPORT_NAME = 'transformation_report.csv'
         self.HTML_REPORT_NAME = 'transformation_report.html'
+        # 생성할 리포트 형식 (csv / html / db / json, CLI --formats)
+        # db: 결과 DB(REPORT_DIR/RESULTS_DB_NAME, SQLite)에 실행 결과 추가, json: validation_results.json (선택)
+        self.REPORT_FORMATS = ('csv', 'html', 'db')
+        # 결과 DB 파일명과 보관할 최근 실행 수 (오래된 실행과 참조되지 않는 SQL 은 삭제)
+        self.RESULTS_DB_NAME = 'results.db'
+        self.RESULTS_DB_KEEP_RUNS = 5
+        # HTML 리포트 형식: 'inline' (한 페이지에 모든 상세 포함) / 'sharded' (요약 페이지 + 청크별 상세 파일)
+        # 'auto' 는 파일 수가 HTML_REPORT_INLINE_MAX_FILES 를 넘으면 sharded 로 생성
+        self.HTML_REPORT_MODE = 'auto'
+        self.HTML_REPORT_INLINE_MAX_FILES = 500
+        self.HTML_REPORT_CHUNK_SIZE = 200
+        # 리포트 diff 알고리즘: 'auto' (DIFF_FULL_RENDER_MAX_LINES 이하는 전체 라인 표시, 큰 파일은 변경 hunk 만 표시)
+        # / 'full' / 'positional' (같은 위치 라인 비교) / 'myers'. hunk 앞뒤로 DIFF_CONTEXT_LINES 라인 표시
+        self.DIFF_ALGORITHM = 'auto'
+        self.DIFF_FULL_RENDER_MAX_LINES = 2000
+        self.DIFF_CONTEXT_LINES = 3
+        # 파일별 결과를 메모리 대신 JSON Lines 저장소(REPORT_DIR/RESULTS_STORE_NAME, 변경 로그는 <이름>_logs.jsonl)에 기록하고
+        # CSV/HTML/JSON 리포트는 저장소를 순회하며 생성
+        self.STREAM_RESULTS = True
+        self.RESULTS_STORE_NAME = 'results.jsonl'
+        # 변환 단위: 'line' (라인별 규칙 적용) / 'statement' (문장 분리·분류 후 applicable_to 규칙만 적용)
+        # / 'buffer' (line 과 같은 결과를 파일 전체 버퍼에 규칙별 한 번 스캔으로 계산, 라인 수가 많은 파일용.
+        #   TOKEN_AWARE 또는 RULE_TIMEOUT_MS 사용 시 line 으로 처리)
+        self.PROCESSING_MODE = 'line'
+        # statement 모드의 문장 분리기: 'lexer' (기본, 단일 패스 렉서) / 'sqlparse' (기존 방식)
+        self.STATEMENT_SPLITTER = 'lexer'
+        # 문자열 리터럴 / 인용 식별자 / 주석 안의 텍스트는 규칙이 바꾸지 않도록 가린 뒤 변환 (CLI --token-aware)
+        # 패턴에 따옴표가 있는 규칙(TO_DATE 형식 문자열 등)은 한 라인 안의 완전한 문자열은 그대로 봄
+        self.TOKEN_AWARE = False
+        # DRY_RUN: 변환 결과 통계만 계산하고 변환 SQL / 변경 로그 파일은 쓰지 않음 (CLI --dry-run)
+        # SUMMARY_ONLY: 파일별 원본/변환 SQL 을 리포트용으로 보관하지 않아 diff 렌더링을 생략 (CLI --summary-only)
+        self.DRY_RUN = False
+        self.SUMMARY_ONLY = False
+        # 디렉토리 변환 시 사용할 워커 프로세스 수 (1이면 직렬 처리)
+        self.WORKERS = 1
+        # 읽기 → 변환 → 쓰기 단계를 겹쳐 실행하는 파이프라인 사용 (NFS 등 I/O 대기가 큰 환경, CLI --pipeline)
+        # 변환 단계 동시성은 WORKERS, 읽기 스레드 수는 PIPELINE_READERS, 단계 사이 큐 크기는 PIPELINE_QUEUE_SIZE
+        self.USE_PIPELINE = False
+        self.PIPELINE_READERS = 4
+        self.PIPELINE_QUEUE_SIZE = 32
+        self.PIPELINE_WRITE_BATCH_SIZE = 16
+        # 중복 제거 (결과는 동일): DEDUP_FILES 는 내용이 같은 파일을 한 번만 변환하고 나머지 경로는 결과 재사용,
+        # DEDUP_STATEMENTS 는 같은 문장(라인 모드는 라인) 본문을 한 번만 변환. memo 는 최근 DEDUP_MEMO_MAX_ENTRIES 개 보관
+        self.DEDUP_FILES = True
+        self.DEDUP_STATEMENTS = True
+        self.DEDUP_MEMO_MAX_ENTRIES = 50000
+        # 규칙 패턴의 리터럴 앵커로 후보 규칙만 실행 (결과는 동일, 속도 향상)
+        self.USE_RULE_PREFILTER = True
+        # 규칙별 실행 시간/횟수 프로파일 수집 (REPORT_DIR 에 rule_profile_*.csv/json, HTML 리포트 섹션 추가)
+        # 수집 중에는 DEDUP_STATEMENTS 를 사용하지 않음 (모든 문장에 규칙을 실행해 횟수를 정확히 집계)
+        self.PROFILE_RULES = False
+        # 규칙 하나가 라인(문장) 하나에 쓸 수 있는 최대 시간(ms). 초과 시 규칙을 건너뛰고 수동 검토로 표시
+        # (SIGALRM 사용: 메인 스레드, Unix 계열에서만 동작. None 이면 제한 없음)
+        self.RULE_TIMEOUT_MS = None
+        # 입력 파일 인코딩 설정
+        # FILE_ENCODING: 지정 시 감지 없이 해당 인코딩으로 읽음 (예: 'cp949')
+        # ENCODING_HINTS: 디렉토리별 인코딩 힌트 (예: {'legacy_sqls': 'euc-kr'})
+        # ENCODING_SAMPLE_SIZE: chardet 감지에 사용할 파일 앞부분 바이트 수
+        # 파일은 청크 단위로 디코딩하지만(전체 바이트/전체 chardet 감지 없음), 일반 변환 경로는 리포트와 캐시에 쓰는
+        # 원본/변환 SQL 전체를 보관하므로 메모리는 파일 크기에 비례합니다. 일정한 메모리는 아래 MMAP_MIN_BYTES 경로만 보장
+        self.FILE_ENCODING = None
+        self.ENCODING_HINTS = {}
+        self.ENCODING_SAMPLE_SIZE = 64 * 1024
+        # 이 크기(바이트) 이상인 파일은 메모리 매핑으로 읽어 규칙 앵커가 있는 라인만 디코딩해 변환하고 결과는 파일에 바로 기록
+        # (UTF-8 / 단일 바이트 인코딩만, 파일 크기와 무관한 메모리 사용. 변환 캐시 미사용, CLI --mmap-min-mb)
+        # 리포트에는 원본/변환 SQL 앞부분 MMAP_REPORT_LINES 라인만 포함. None 이면 사용 안 함
+        self.MMAP_MIN_BYTES = 256 * 1024 * 1024
+        self.MMAP_REPORT_LINES = 200
+        # 대량 INSERT ... VALUES 경로 (CLI --bulk-insert). 같은 헤더의 한 라인짜리 INSERT VALUES 행이
+        # BULK_INSERT_MIN_ROWS 개 이상 이어지는 구간은 값 위치의 식(TO_DATE, SYSDATE 등)에만 DML 규칙을 적용 (리터럴은 그대로)
+        # 'rows': 행 형태 유지 / 'multirow': BULK_INSERT_BATCH_ROWS 행씩 multi-row INSERT 로 합침
+        # / 'copy': 값을 CSV 로 BULK_COPY_DIR 에 기록하고 Redshift COPY 문 생성 (S3 경로/IAM 역할이 없으면 수동 검토)
+        # None 이면 사용 안 함 (메모리 매핑 대상 대용량 파일은 파일 전체를 읽어 변환)
+        self.BULK_INSERT_MODE = None
+        self.BULK_INSERT_MIN_ROWS = 100
+        self.BULK_INSERT_BATCH_ROWS = 1000
+        self.BULK_COPY_DIR = self.CONVERTED_DIR / 'copy_data'
+        self.BULK_COPY_S3_PREFIX = None
+        self.BULK_COPY_IAM_ROLE = None
+        # DDL 분산/정렬 키 권장 단계 (CLI --ddl-advisor). 변환 결과 전체의 CREATE TABLE 과 Oracle 기본 키 / 인덱스 / 파티션 정의,
+        # 변환된 DML 의 조인 조건으로 DISTSTYLE / DISTKEY / SORTKEY / ENCODE 권장 (REPORT_DIR 에 ddl_advice_*.csv/json,
+        # HTML 리포트 섹션 추가). 'emit' 이면 권장 절을 붙인 CREATE TABLE 스크립트를 DDL_ADVISOR_FILE 에 기록
+        # None 이면 사용 안 함
+        self.DDL_ADVISOR = None
+        self.DDL_ADVISOR_FILE = self.DDL_DIR / 'redshift_optimized_ddl.sql'
+        # 변환 캐시 설정 (파일 내용 해시 + 규칙 집합 해시 기준으로 변환 결과 재사용)
+        self.USE_CACHE = True
+        self.CACHE_DIR = self.REPORT_DIR / 'cache'
+        self.CACHE_MAX_BYTES = 1024 * 1024 * 1024
+        # 규칙 → 파일/라인 역색인 (--changed-rules 모드에서 영향 파일만 재변환)
+        self.USE_RULE_INDEX = True
 
         self.create_directories()
         self.setup_logging()
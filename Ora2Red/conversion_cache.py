@@ -0,0 +1,227 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from rule_prefilter import fold_text, matches_anchors
+from change_record import to_rows, from_rows, change_log_text
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# 캐시 항목 형식 버전 (2: 변경 로그를 ChangeRecord 행 목록으로 저장)
+CACHE_FORMAT_VERSION = 2
+
+
+def file_content_hash(file_path) -> str:
+    """파일 내용의 SHA-256 해시 (청크 단위로 읽어 계산)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_json(path: Path, data):
+    # 워커 프로세스가 동시에 쓰더라도 깨진 파일이 남지 않도록 임시 파일 후 교체
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class ConversionCache:
+    """
+    파일 내용 해시 → 변환 결과를 저장하는 영구 캐시입니다.
+
+    각 항목은 생성 당시의 규칙 집합 해시를 함께 저장합니다. 규칙 집합이 바뀐 경우
+    추가/삭제/수정된 규칙의 리터럴 앵커가 원본 및 변환 중간 결과(변경 로그)에 전혀 없으면
+    해당 규칙이 적용될 수 없으므로 기존 결과를 그대로 재사용합니다.
+    """
+
+    def __init__(self, cache_dir, transformer, max_bytes=None, variant="line"):
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / 'entries'
+        self.rulesets_dir = self.cache_dir / 'rulesets'
+        self.max_bytes = max_bytes
+        self.variant = variant
+        self.rules_hash = transformer.rules_hash
+        self.fingerprints = [rule["fingerprint"] for rule in transformer.compiled_rules]
+        self.rule_keys = {rule["fingerprint"]: rule["rule_key"] for rule in transformer.compiled_rules}
+        self.anchors = {rule["fingerprint"]: rule["anchors"] for rule in transformer.compiled_rules}
+        self._rule_set_cache = {}
+        self.hits = 0
+        self.misses = 0
+
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.rulesets_dir.mkdir(parents=True, exist_ok=True)
+        self._save_rule_set()
+
+    def _save_rule_set(self):
+        path = self.rulesets_dir / f"{self.rules_hash}.json"
+        if not path.exists():
+            _atomic_write_json(path, {
+                "fingerprints": self.fingerprints,
+                "anchors": [self.anchors[fp] for fp in self.fingerprints],
+                "rule_keys": [self.rule_keys[fp] for fp in self.fingerprints]
+            })
+
+    def _load_rule_set(self, rules_hash):
+        if rules_hash not in self._rule_set_cache:
+            path = self.rulesets_dir / f"{rules_hash}.json"
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                anchors = {
+                    fp: (tuple(alts) if alts is not None else None)
+                    for fp, alts in zip(data["fingerprints"], data["anchors"])
+                }
+                rule_keys = dict(zip(data["fingerprints"], data.get("rule_keys", [])))
+                self._rule_set_cache[rules_hash] = (data["fingerprints"], anchors, rule_keys)
+            except (OSError, ValueError, KeyError):
+                self._rule_set_cache[rules_hash] = None
+        return self._rule_set_cache[rules_hash]
+
+    def _entry_path(self, content_hash) -> Path:
+        return self.entries_dir / content_hash[:2] / f"{content_hash}.json"
+
+    def _diff_rule_set(self, old_rules_hash):
+        """
+        이전 규칙 집합 대비 (삭제/수정 전 규칙 목록, 추가/수정 후 규칙 목록, 이전 스냅샷)을 반환합니다.
+        비교가 불가능하면 (스냅샷 없음, 공통 규칙의 순서 변경) None 을 반환합니다.
+        """
+        old_rule_set = self._load_rule_set(old_rules_hash)
+        if old_rule_set is None:
+            return None
+        old_fingerprints = old_rule_set[0]
+        old_set, new_set = set(old_fingerprints), set(self.fingerprints)
+        common_old = [fp for fp in old_fingerprints if fp in new_set]
+        common_new = [fp for fp in self.fingerprints if fp in old_set]
+        if common_old != common_new:
+            return None
+        removed = [fp for fp in old_fingerprints if fp not in new_set]
+        added = [fp for fp in self.fingerprints if fp not in old_set]
+        return removed, added, old_rule_set
+
+    def _changed_rule_anchors(self, old_rules_hash):
+        """달라진 규칙(삭제/추가/수정)의 앵커 목록. 비교 불가 시 None."""
+        diff = self._diff_rule_set(old_rules_hash)
+        if diff is None:
+            return None
+        removed, added, (_, old_anchors, _) = diff
+        return [old_anchors[fp] for fp in removed] + [self.anchors[fp] for fp in added]
+
+    def changed_rules(self, old_rules_hash):
+        """
+        이전 규칙 집합 대비 달라진 규칙을 반환합니다.
+
+        :return: (삭제/수정 전 규칙의 rule_key 목록, 추가/수정 후 규칙의 앵커 목록), 비교 불가 시 None
+        """
+        diff = self._diff_rule_set(old_rules_hash)
+        if diff is None:
+            return None
+        removed, added, (_, _, old_rule_keys) = diff
+        if any(fp not in old_rule_keys for fp in removed):
+            return None
+        return [old_rule_keys[fp] for fp in removed], [self.anchors[fp] for fp in added]
+
+    def peek(self, content_hash):
+        """유효성 검사 없이 캐시 항목의 변환 결과를 반환합니다. (없으면 None, 변경 로그는 행 목록 그대로)"""
+        try:
+            with open(self._entry_path(content_hash), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("format") != CACHE_FORMAT_VERSION:
+            return None
+        return entry.get("result")
+
+    def get(self, content_hash, encoding, original_text, assume_valid=False):
+        """
+        캐시된 변환 결과를 반환합니다. 없거나 현재 규칙 집합에서 유효하지 않으면 None.
+
+        :param content_hash: 원본 파일 내용 해시
+        :param encoding: 원본 파일을 디코딩한 인코딩
+        :param original_text: 디코딩된 원본 텍스트 (규칙 변경 영향 판단용)
+        :param assume_valid: 규칙 색인으로 영향 없음이 확인된 경우 앵커 검사 생략
+        """
+        path = self._entry_path(content_hash)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if (entry.get("format") != CACHE_FORMAT_VERSION or entry.get("variant") != self.variant
+                or entry.get("encoding") != encoding):
+            self.misses += 1
+            return None
+
+        result = entry["result"]
+        if entry.get("rules_hash") != self.rules_hash and not assume_valid:
+            changed_anchors = self._changed_rule_anchors(entry.get("rules_hash"))
+            if changed_anchors is None:
+                self.misses += 1
+                return None
+            # 원본 + 변경 로그(각 규칙 적용 직후의 라인 포함)에 앵커가 없으면 결과가 바뀔 수 없음
+            probe_text = fold_text(original_text + "\n" + change_log_text(result["change_log"]))
+            if any(matches_anchors(anchors, probe_text) for anchors in changed_anchors):
+                self.misses += 1
+                return None
+        if entry.get("rules_hash") != self.rules_hash:
+            entry["rules_hash"] = self.rules_hash
+            _atomic_write_json(path, entry)
+        else:
+            os.utime(path)
+
+        self.hits += 1
+        result["change_log"] = from_rows(result["change_log"])
+        return result
+
+    def put(self, content_hash, encoding, result):
+        path = self._entry_path(content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_json(path, {
+            "format": CACHE_FORMAT_VERSION,
+            "rules_hash": self.rules_hash,
+            "variant": self.variant,
+            "encoding": encoding,
+            "result": dict(result, change_log=to_rows(result["change_log"]))
+        })
+
+    def evict(self):
+        """캐시 크기가 max_bytes 를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        if not self.max_bytes:
+            return 0
+        entries = []
+        total = 0
+        for path in self.entries_dir.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            logging.info(f"변환 캐시 정리: {removed}개 항목 삭제 (현재 {total} bytes)")
+        return removed
+
+    def clear(self):
+        """캐시 전체를 무효화합니다."""
+        shutil.rmtree(self.entries_dir, ignore_errors=True)
+        shutil.rmtree(self.rulesets_dir, ignore_errors=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.rulesets_dir.mkdir(parents=True, exist_ok=True)
+        self._rule_set_cache.clear()
+        self._save_rule_set()
+        logging.info(f"변환 캐시를 초기화했습니다: {self.cache_dir}")
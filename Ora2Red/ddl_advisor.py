@@ -0,0 +1,507 @@
+import os
+import re
+import csv
+import json
+import html
+import logging
+import datetime
+from typing import Dict, List, Optional, Tuple
+from sql_classifier import classify_statements, statement_code_at
+
+# DDL_ADVISOR 값: report (리포트 섹션 + CSV/JSON) / emit (권장 절을 붙인 CREATE TABLE 스크립트도 생성)
+DDL_ADVISOR_MODES = ('report', 'emit')
+
+# 권장 리포트 컬럼 (CSV/JSON/HTML 공통, 순서 유지)
+ADVICE_COLUMNS = {
+    "table": "테이블",
+    "source": "정의 파일",
+    "diststyle": "DISTSTYLE",
+    "distkey": "DISTKEY",
+    "sortkey": "SORTKEY",
+    "encodings": "ENCODE",
+    "join_columns": "조인 컬럼(횟수)",
+    "reasons": "근거"
+}
+
+# 컬럼 타입(첫 단어) → 압축 인코딩 (Redshift ENCODE AUTO 기본값과 같은 기준)
+# 변환 규칙이 그대로 두는 Oracle 타입(NUMBER(n), NUMBER, VARCHAR2(n CHAR), BINARY_FLOAT 등)도 같은 계열로 지정
+_COLUMN_ENCODINGS = {}
+for _encoding, _types in (
+        ("AZ64", ("SMALLINT", "INT2", "INTEGER", "INT", "INT4", "BIGINT", "INT8", "DECIMAL", "NUMERIC", "NUMBER",
+                  "DATE", "TIMESTAMP", "TIMESTAMPTZ", "TIME", "TIMETZ")),
+        ("ZSTD", ("CHAR", "CHARACTER", "NCHAR", "BPCHAR", "VARCHAR", "NVARCHAR", "VARCHAR2", "NVARCHAR2", "TEXT")),
+        ("RAW", ("BOOLEAN", "BOOL", "REAL", "FLOAT4", "FLOAT8", "FLOAT", "DOUBLE",
+                 "BINARY_FLOAT", "BINARY_DOUBLE"))):
+    _COLUMN_ENCODINGS.update(dict.fromkeys(_types, _encoding))
+_DATE_TYPES = {"DATE", "TIMESTAMP", "TIMESTAMPTZ"}
+
+_IDENT = r'(?:"[^"\n]+"|[A-Za-z_][\w$#]*)'
+_QUALIFIED = rf"{_IDENT}(?:\s*\.\s*{_IDENT})?"
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:GLOBAL|LOCAL)\s+)?(?:(?:TEMPORARY|TEMP)\s+)?TABLE\s+"
+    rf"(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>{_QUALIFIED})\s*\(", re.I)
+_ALTER_TABLE_RE = re.compile(
+    rf"ALTER\s+TABLE\s+(?P<name>{_QUALIFIED})\s+ADD\s*\(?\s*(?:CONSTRAINT\s+{_IDENT}\s+)?"
+    r"(?P<constraint>PRIMARY\s+KEY|FOREIGN\s+KEY)\s*\((?P<columns>[^)]*)\)", re.I)
+_CREATE_INDEX_RE = re.compile(
+    rf"CREATE\s+(?:UNIQUE\s+|BITMAP\s+)?INDEX\s+{_QUALIFIED}\s+ON\s+(?P<name>{_QUALIFIED})\s*\(", re.I)
+_REFERENCES_RE = re.compile(rf"REFERENCES\s+(?P<name>{_QUALIFIED})(?:\s*\((?P<columns>[^)]*)\))?", re.I)
+_KEY_COLUMNS_RE = re.compile(r"(?:PRIMARY|FOREIGN)\s+KEY\s*\((?P<columns>[^)]*)\)", re.I)
+_PARTITION_RE = re.compile(r"\b(?P<sub>SUB)?PARTITION\s+BY\s+(?P<kind>RANGE|LIST|HASH)\s*\((?P<columns>[^)]*)\)", re.I)
+_PARTITION_CLAUSE_RE = re.compile(r"\s*\bPARTITION\s+BY\b", re.I)
+_LAYOUT_RE = re.compile(r"\b(?:DISTSTYLE|DISTKEY|SORTKEY)\b", re.I)
+_ENCODE_RE = re.compile(r"\bENCODE\b", re.I)
+_INLINE_PRIMARY_KEY_RE = re.compile(r"\bPRIMARY\s+KEY\b", re.I)
+_CONSTRAINT_WORDS = {"CONSTRAINT", "PRIMARY", "UNIQUE", "FOREIGN", "CHECK", "LIKE"}
+# 함수 기반 인덱스(TRUNC(order_dt) 등)는 첫 인자 컬럼 기준
+_INDEX_COLUMN_RE = re.compile(rf"(?:[A-Za-z_][\w$#]*\s*\(\s*)*(?P<column>{_IDENT})")
+
+# 라인 처음에서 시작하는 정의 문장 (대량 데이터 파일도 전체를 문장 분리하지 않고 해당 문장만 분석)
+_DEFINITION_START_RE = re.compile(
+    r"^[ \t]*(?:CREATE\s+(?:(?:OR\s+REPLACE|GLOBAL|LOCAL|TEMPORARY|TEMP|UNIQUE|BITMAP)\s+)*(?:TABLE|INDEX)|ALTER\s+TABLE)\b",
+    re.I | re.M)
+# 조인 조건 수집: 테이블 참조(별칭 포함)와 '별칭.컬럼 = 별칭.컬럼'
+_JOIN_HINT_RE = re.compile(r"\.\s*[\w$#\"]+\s*=\s*[\w$#\"]+\s*\.")
+_TABLE_LIST_RE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO|USING)\s+", re.I)
+_TABLE_REF_RE = re.compile(rf"(?P<table>{_QUALIFIED})(?:\s+(?:AS\s+)?(?P<alias>{_IDENT}))?", re.I)
+_LIST_SEPARATOR_RE = re.compile(r"\s*,\s*")
+_EQUI_JOIN_RE = re.compile(
+    rf"(?<![\w$#.\"])(?P<left>{_IDENT})\s*\.\s*(?P<left_column>{_IDENT})\s*=\s*"
+    rf"(?P<right>{_IDENT})\s*\.\s*(?P<right_column>{_IDENT})(?![\w$#(])", re.I)
+_NOT_ALIAS = {
+    "WHERE", "ON", "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "CROSS", "OUTER", "NATURAL", "GROUP", "ORDER",
+    "HAVING", "SET", "USING", "UNION", "MINUS", "INTERSECT", "EXCEPT", "VALUES", "SELECT", "CONNECT", "START",
+    "WHEN", "LIMIT", "AS", "WITH", "FROM", "AND", "OR", "PARTITION", "QUALIFY", "WINDOW", "RETURNING", "FETCH"
+}
+
+
+def _name(text: str) -> str:
+    # 식별자 정규화: 따옴표 제거, 소문자 (Redshift 는 식별자를 소문자로 저장)
+    return ".".join(part.strip().strip('"').lower() for part in text.split("."))
+
+
+def _closing_paren(text: str, open_pos: int) -> int:
+    # open_pos 의 '(' 와 짝이 맞는 ')' 위치 (문자열/인용 식별자 안은 무시, 없으면 -1)
+    depth = 0
+    pos = open_pos
+    length = len(text)
+    while pos < length:
+        char = text[pos]
+        if char in "'\"":
+            end = text.find(char, pos + 1)
+            if end == -1:
+                return -1
+            pos = end
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return pos
+        pos += 1
+    return -1
+
+
+def _split_elements(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    # text[start:end] 를 최상위 ',' 로 나눈 요소의 (시작, 끝) 위치 목록 (앞뒤 공백 제외)
+    spans = []
+    depth = 0
+    element_start = pos = start
+    while pos <= end:
+        char = text[pos] if pos < end else ','
+        if char in "'\"" and pos < end:
+            close = text.find(char, pos + 1, end)
+            pos = end if close == -1 else close
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            element = text[element_start:pos]
+            stripped = element.strip()
+            if stripped:
+                lead = element_start + len(element) - len(element.lstrip())
+                spans.append((lead, lead + len(stripped)))
+            element_start = pos + 1
+        pos += 1
+    return spans
+
+
+def _column_list(text: str) -> List[str]:
+    # '(a, b DESC, TRUNC(c))' 안쪽 텍스트 → 정규화한 컬럼명 목록
+    columns = []
+    for start, end in _split_elements(text, 0, len(text)):
+        match = _INDEX_COLUMN_RE.match(text, start, end)
+        if match is not None:
+            columns.append(_name(match.group('column')))
+    return columns
+
+
+class _TableInfo:
+    """
+    테이블 하나의 정의 정보입니다.
+
+    - 변환된 CREATE TABLE: 원문(statement), 컬럼 (정규화 이름, 표시 이름, 타입 첫 단어, 문장 안 위치), 컬럼 목록 끝 위치,
+      남아 있는 Oracle PARTITION BY 절 위치
+    - Oracle 원본 정의: 기본 키, 외래 키, 인덱스, 파티션 키 (ALTER TABLE / CREATE INDEX 포함)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.source = None
+        self.statement = None
+        self.columns = []
+        self.close_pos = -1
+        # 변환된 DDL 에 남은 Oracle PARTITION BY 절 시작 위치 (없으면 -1)
+        self.partition_pos = -1
+        self.has_layout = False
+        self.encoded = set()
+        self.primary_key = []
+        self.foreign_keys = []
+        self.indexes = []
+        self.partition = None
+        self.hash_columns = []
+
+    def column_names(self) -> List[str]:
+        return [column[0] for column in self.columns]
+
+
+class DDLAdvisor:
+    """
+    변환 결과 전체에서 CREATE TABLE 과 Oracle PRIMARY KEY / INDEX / PARTITION 정의, 변환된 DML 의 조인 조건을 모아
+    테이블별 Redshift DISTSTYLE / DISTKEY / SORTKEY / 컬럼 ENCODE 를 권장합니다. (DDL_ADVISOR)
+
+    - DISTKEY: 변환된 DML 의 등가 조인 조건에 가장 많이 쓰인 컬럼 → Oracle 해시 파티션 키 → 외래 키 순.
+      근거가 없으면 DISTSTYLE AUTO (테이블 크기에 따라 Redshift 가 선택)
+    - SORTKEY: Oracle 범위/목록 파티션 키 → 날짜 타입인 인덱스/기본 키 선두 컬럼 → 조인 DISTKEY (병합 조인) → 기본 키 순
+    - ENCODE: 타입별 인코딩 (정수/소수/날짜 AZ64, 문자열 ZSTD), 첫 SORTKEY 컬럼은 RAW
+    이미 DISTSTYLE/DISTKEY/SORTKEY 가 있는 테이블은 권장만 기록하고 문장은 바꾸지 않습니다.
+    """
+
+    def __init__(self, mode: str = 'report'):
+        if mode not in DDL_ADVISOR_MODES:
+            raise ValueError(f"지원하지 않는 DDL_ADVISOR 입니다: {mode} ({', '.join(DDL_ADVISOR_MODES)})")
+        self.mode = mode
+        self.tables: Dict[str, _TableInfo] = {}
+        # (테이블, 컬럼) → 등가 조인 조건 수
+        self.join_counts: Dict[Tuple[str, str], int] = {}
+
+    def _table(self, name: str) -> _TableInfo:
+        key = _name(name)
+        table = self.tables.get(key)
+        if table is None:
+            table = self.tables[key] = _TableInfo(re.sub(r"\s*\.\s*", ".", name))
+        return table
+
+    def add_result(self, result):
+        """파일 하나의 변환 결과에서 Oracle 원본 정의와 변환된 CREATE TABLE / 조인 조건을 수집합니다."""
+        if result.get("streamed_sql") is not None:
+            # 메모리 매핑으로 변환한 대용량 파일은 앞부분만 보관하므로 제외
+            return
+        original_sql = result.get("original_sql") or ""
+        transformed_sql = result.get("transformed_sql") or ""
+        for match in _DEFINITION_START_RE.finditer(original_sql):
+            self._add_oracle_definition(statement_code_at(original_sql, match.start()))
+        for match in _DEFINITION_START_RE.finditer(transformed_sql):
+            code = statement_code_at(transformed_sql, match.start())
+            code = "\n".join(line.rstrip() for line in code.rstrip(';').rstrip().splitlines())
+            self._add_converted_table(code, result.get("file_name"))
+        if _JOIN_HINT_RE.search(transformed_sql):
+            for code, _ in classify_statements(transformed_sql):
+                self._add_joins(code)
+
+    def _add_oracle_definition(self, code: str):
+        match = _CREATE_TABLE_RE.match(code)
+        if match is not None:
+            table = self._table(match.group('name'))
+            close = _closing_paren(code, match.end() - 1)
+            if close == -1:
+                return
+            for start, end in _split_elements(code, match.end(), close):
+                element = code[start:end]
+                first = element.split(None, 1)[0].upper()
+                if first in _CONSTRAINT_WORDS:
+                    self._add_constraint(table, element)
+                    continue
+                column = re.match(_IDENT, element)
+                if column is None:
+                    continue
+                column = _name(column.group())
+                if _INLINE_PRIMARY_KEY_RE.search(element) and not table.primary_key:
+                    table.primary_key = [column]
+                reference = _REFERENCES_RE.search(element)
+                if reference is not None:
+                    table.foreign_keys.append(([column], _name(reference.group('name')),
+                                               _column_list(reference.group('columns') or "")))
+            for partition in _PARTITION_RE.finditer(code, close):
+                columns = _column_list(partition.group('columns'))
+                if partition.group('kind').upper() == 'HASH':
+                    table.hash_columns.extend(columns)
+                elif table.partition is None:
+                    table.partition = (partition.group('kind').upper(), columns)
+            return
+        match = _ALTER_TABLE_RE.match(code)
+        if match is not None:
+            self._add_constraint(self._table(match.group('name')), code[match.start('constraint'):])
+            return
+        match = _CREATE_INDEX_RE.match(code)
+        if match is not None:
+            close = _closing_paren(code, match.end() - 1)
+            columns = _column_list(code[match.end():close]) if close != -1 else []
+            if columns:
+                self._table(match.group('name')).indexes.append(columns)
+
+    @staticmethod
+    def _add_constraint(table: _TableInfo, element: str):
+        key = _KEY_COLUMNS_RE.search(element)
+        if key is None:
+            return
+        columns = _column_list(key.group('columns'))
+        if key.group().upper().startswith('PRIMARY'):
+            table.primary_key = columns
+            return
+        reference = _REFERENCES_RE.search(element, key.end())
+        if reference is not None:
+            table.foreign_keys.append((columns, _name(reference.group('name')),
+                                       _column_list(reference.group('columns') or "")))
+
+    def _add_converted_table(self, code: str, source: Optional[str]):
+        match = _CREATE_TABLE_RE.match(code)
+        if match is None:
+            return
+        close = _closing_paren(code, match.end() - 1)
+        if close == -1 or re.match(r"\s*AS\b", code[close + 1:], re.I):
+            # CREATE TABLE ... AS SELECT 는 컬럼 정의가 없으므로 제외
+            return
+        table = self._table(match.group('name'))
+        if table.statement is not None:
+            # 같은 테이블을 다시 정의하면 첫 정의 기준
+            return
+        columns = []
+        for start, end in _split_elements(code, match.end(), close):
+            element = code[start:end]
+            words = element.split(None, 2)
+            if words[0].upper() in _CONSTRAINT_WORDS:
+                continue
+            display = re.match(_IDENT, element)
+            if display is None:
+                continue
+            display = display.group()
+            type_word = re.match(r"\w*", words[1]).group().upper() if len(words) > 1 else ""
+            columns.append((_name(display), display, type_word, (start, end)))
+            if _ENCODE_RE.search(element):
+                table.encoded.add(_name(display))
+            if _LAYOUT_RE.search(element):
+                table.has_layout = True
+        table.statement = code
+        table.source = source
+        table.columns = columns
+        table.close_pos = close
+        partition = _PARTITION_CLAUSE_RE.search(code, close + 1)
+        table.partition_pos = partition.start() if partition is not None else -1
+        table.has_layout = table.has_layout or _LAYOUT_RE.search(code, close) is not None
+
+    def _add_joins(self, code: str):
+        if not _EQUI_JOIN_RE.search(code):
+            return
+        aliases = {}
+        for keyword in _TABLE_LIST_RE.finditer(code):
+            pos = keyword.end()
+            while True:
+                ref = _TABLE_REF_RE.match(code, pos)
+                if ref is None:
+                    break
+                table = _name(ref.group('table'))
+                alias = ref.group('alias')
+                pos = ref.end()
+                if alias is not None and alias.upper() in _NOT_ALIAS:
+                    alias = None
+                    pos = ref.end('table')
+                aliases[table] = aliases[table.rsplit('.', 1)[-1]] = table
+                if alias is not None:
+                    aliases[_name(alias)] = table
+                separator = _LIST_SEPARATOR_RE.match(code, pos)
+                if separator is None or keyword.group().strip().upper() != 'FROM':
+                    break
+                pos = separator.end()
+        for join in _EQUI_JOIN_RE.finditer(code):
+            left, right = _name(join.group('left')), _name(join.group('right'))
+            if left == right or left not in aliases or right not in aliases:
+                continue
+            for qualifier, column in ((left, join.group('left_column')), (right, join.group('right_column'))):
+                key = (aliases[qualifier], _name(column))
+                self.join_counts[key] = self.join_counts.get(key, 0) + 1
+
+    def _resolve_joins(self) -> Dict[str, Dict[str, int]]:
+        # 조인 조건의 테이블 참조 → 정의된 테이블 (스키마 없이 참조한 경우 이름이 하나뿐인 테이블에 대응)
+        by_name = {}
+        for key in self.tables:
+            by_name.setdefault(key.rsplit('.', 1)[-1], []).append(key)
+        resolved = {}
+        for (table, column), count in self.join_counts.items():
+            if table not in self.tables:
+                candidates = by_name.get(table.rsplit('.', 1)[-1], [])
+                if len(candidates) != 1:
+                    continue
+                table = candidates[0]
+            columns = resolved.setdefault(table, {})
+            columns[column] = columns.get(column, 0) + count
+        return resolved
+
+    def _advise(self, table: _TableInfo, joins: Dict[str, int]):
+        # → (DISTSTYLE, DISTKEY, SORTKEY 컬럼 목록, {컬럼: ENCODE}, 근거 목록)
+        names = table.column_names()
+        position = {name: index for index, name in enumerate(names)}
+        types = {column[0]: column[2] for column in table.columns}
+        reasons = []
+
+        distkey = None
+        candidates = [(count, column) for column, count in joins.items() if column in position]
+        if candidates:
+            count, distkey = min(candidates, key=lambda c: (-c[0], c[1] not in table.primary_key, position[c[1]]))
+            reasons.append(f"DISTKEY {distkey}: 변환된 DML 의 조인 조건 {count}회")
+        else:
+            hash_columns = [column for column in table.hash_columns if column in position]
+            foreign = [columns[0] for columns, _, _ in table.foreign_keys if columns and columns[0] in position]
+            referenced = [columns[0] for other in self.tables.values() for _, ref_table, columns in other.foreign_keys
+                          if ref_table == _name(table.name) and columns and columns[0] in position]
+            if hash_columns:
+                distkey = hash_columns[0]
+                reasons.append(f"DISTKEY {distkey}: Oracle 해시 파티션 키")
+            elif foreign or referenced:
+                distkey = (foreign or referenced)[0]
+                reasons.append(f"DISTKEY {distkey}: 외래 키 관계")
+        diststyle = "KEY" if distkey else "AUTO"
+        if distkey is None:
+            reasons.append("조인/외래 키 정보 없음: DISTSTYLE AUTO")
+
+        sortkey = []
+        leading = [columns[0] for columns in ([table.primary_key] if table.primary_key else []) + table.indexes
+                   if columns and columns[0] in position]
+        partition_columns = [column for column in table.partition[1] if column in position] if table.partition else []
+        date_columns = [column for column in leading if types.get(column) in _DATE_TYPES]
+        if partition_columns:
+            sortkey = partition_columns
+            reasons.append(f"SORTKEY: Oracle {table.partition[0]} 파티션 키")
+        elif date_columns:
+            sortkey = date_columns[:1]
+            reasons.append("SORTKEY: 날짜 타입 인덱스 선두 컬럼")
+        elif distkey and candidates:
+            sortkey = [distkey]
+            reasons.append("SORTKEY: 조인 DISTKEY 와 같은 컬럼 (병합 조인)")
+        elif table.primary_key and all(column in position for column in table.primary_key):
+            sortkey = list(table.primary_key)
+            reasons.append("SORTKEY: 기본 키")
+
+        encodings = {}
+        for name, _, type_word, _ in table.columns:
+            if name in table.encoded:
+                continue
+            if sortkey and name == sortkey[0]:
+                encodings[name] = "RAW"
+            elif type_word in _COLUMN_ENCODINGS:
+                encodings[name] = _COLUMN_ENCODINGS[type_word]
+        if sortkey and sortkey[0] in encodings:
+            reasons.append("첫 SORTKEY 컬럼은 ENCODE RAW")
+        if table.has_layout:
+            reasons.append("변환된 DDL 에 분산/정렬 지정이 이미 있어 문장은 그대로 둠")
+        elif table.partition_pos != -1:
+            reasons.append("Oracle PARTITION BY 절은 DISTKEY/SORTKEY 로 대체하여 제거")
+        return diststyle, distkey, sortkey, encodings, reasons
+
+    def _defined_tables(self) -> List[_TableInfo]:
+        return [table for table in self.tables.values() if table.statement is not None]
+
+    def recommend(self) -> List[dict]:
+        """변환된 CREATE TABLE 이 있는 테이블별 권장 행 목록 (정의 순서)"""
+        joins = self._resolve_joins()
+        rows = []
+        for table in self._defined_tables():
+            table_joins = joins.get(_name(table.name), {})
+            diststyle, distkey, sortkey, encodings, reasons = self._advise(table, table_joins)
+            rows.append({
+                "table": table.name,
+                "source": table.source or "",
+                "diststyle": diststyle,
+                "distkey": distkey or "",
+                "sortkey": ", ".join(sortkey),
+                "encodings": ", ".join(f"{column} {encoding}" for column, encoding in encodings.items()),
+                "join_columns": ", ".join(f"{column}({count})" for column, count in
+                                          sorted(table_joins.items(), key=lambda item: (-item[1], item[0]))),
+                "reasons": "; ".join(reasons)
+            })
+        return rows
+
+    def render_table_ddl(self, table: _TableInfo, joins: Dict[str, int]) -> str:
+        """권장 ENCODE / DISTSTYLE / DISTKEY / SORTKEY 를 붙인 CREATE TABLE 문"""
+        diststyle, distkey, sortkey, encodings, _ = self._advise(table, joins)
+        statement = table.statement
+        if table.has_layout:
+            return statement + ";"
+        display = {column[0]: column[1] for column in table.columns}
+        attributes = f" DISTSTYLE {diststyle}"
+        if distkey:
+            attributes += f" DISTKEY ({display[distkey]})"
+        if sortkey:
+            attributes += f" SORTKEY ({', '.join(display[column] for column in sortkey)})"
+        # 테이블 속성은 컬럼 목록 뒤에 (Redshift 에 없는 PARTITION BY 절은 제거),
+        # ENCODE 는 뒤쪽 컬럼부터 (앞쪽 위치가 바뀌지 않도록)
+        tail_end = table.partition_pos if table.partition_pos != -1 else len(statement)
+        result = statement[:table.close_pos + 1] + attributes + statement[table.close_pos + 1:tail_end]
+        for name, _, _, (_, end) in reversed(table.columns):
+            if name in encodings:
+                result = result[:end] + f" ENCODE {encodings[name]}" + result[end:]
+        return result + ";"
+
+    def write_ddl(self, path) -> int:
+        """권장 절을 붙인 CREATE TABLE 스크립트를 path 에 저장하고 테이블 수를 반환합니다."""
+        joins = self._resolve_joins()
+        tables = self._defined_tables()
+        os.makedirs(os.path.dirname(str(path)) or ".", exist_ok=True)
+        with open(path, 'w', encoding="utf-8") as f:
+            f.write(f"-- Redshift 분산/정렬 키 권장 DDL (생성: {datetime.datetime.now():%Y-%m-%d %H:%M}, 테이블 {len(tables)}개)\n")
+            for table in tables:
+                table_joins = joins.get(_name(table.name), {})
+                reasons = self._advise(table, table_joins)[4]
+                f.write(f"\n-- {table.name}{f' ({table.source})' if table.source else ''}: {'; '.join(reasons)}\n")
+                f.write(self.render_table_ddl(table, table_joins) + "\n")
+        logging.info(f"분산/정렬 키 권장 DDL 생성: {path} (테이블 {len(tables)}개)")
+        return len(tables)
+
+    @staticmethod
+    def write_reports(rows, output_dir, base_name='ddl_advice'):
+        """
+        권장 행 목록을 CSV(utf-8-sig, 한글 컬럼)와 JSON 으로 저장합니다.
+
+        :return: (csv 경로, json 경로)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M")
+        csv_path = os.path.join(output_dir, f"{base_name}_{timestamp}.csv")
+        json_path = os.path.join(output_dir, f"{base_name}_{timestamp}.json")
+        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(ADVICE_COLUMNS.values())
+            for row in rows:
+                writer.writerow([row[column] for column in ADVICE_COLUMNS])
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"분산/정렬 키 권장 리포트 생성: {csv_path}, {json_path}")
+        return csv_path, json_path
+
+
+def render_advice_table(rows):
+    """권장 행 목록을 HTML 표로 만듭니다. (HTML 리포트의 분산/정렬 키 권장 섹션)"""
+    parts = ["<table class='diff'><tr>"]
+    parts.extend(f"<th>{label}</th>" for label in ADVICE_COLUMNS.values())
+    parts.append("</tr>")
+    for row in rows:
+        parts.append("<tr>")
+        for column in ADVICE_COLUMNS:
+            value = html.escape(str(row[column]))
+            if column in ("distkey", "sortkey", "encodings") and value:
+                value = f"<code>{value}</code>"
+            parts.append(f"<td>{value}</td>")
+        parts.append("</tr>")
+    parts.append("</table>")
+    return "".join(parts)
@@ -0,0 +1,129 @@
+import hashlib
+from collections import OrderedDict
+from change_record import ChangeRecord, TIMEOUT
+
+
+class _AppliedKeys(dict):
+    """applied_changes(set) 대신 전달하여 규칙 적용 키가 추가된 순서를 기록합니다."""
+
+    def add(self, key):
+        self[key] = None
+
+
+class StatementMemo:
+    """
+    문장(라인 모드에서는 라인) 본문 → 변환 결과를 기억하여 같은 본문은 한 번만 변환합니다.
+
+    변경 기록의 라인 번호와 규칙 적용 키("라인-설명-패턴")는 문장 시작 라인 기준 상대값으로 저장했다가
+    재사용할 때 현재 위치로 옮기며, 이미 적용된 키는 직접 변환할 때와 같이 건너뜁니다.
+    정규식 시간 초과가 있었던 결과는 실행 환경에 따라 달라지므로 저장하지 않습니다.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+
+    def clear(self):
+        self._entries.clear()
+
+    def apply(self, transform, text, start_line, applied_changes, sql_type=None, rule_trace=None, protected=None):
+        """
+        transform(text, start_line, applied_changes, sql_type, rule_trace=..., protected=...) 결과를 반환합니다.
+        (SQLTransformer.apply_transformations / apply_statement_transformations 와 같은 형식)
+        """
+        self.lookups += 1
+        digest = hashlib.sha1(text.encode('utf-8', 'surrogatepass'))
+        if protected:
+            # 라인 모드에서는 같은 라인이라도 여러 라인 주석 안인지에 따라 가릴 구간이 다름
+            digest.update(repr(protected).encode('utf-8'))
+        key = (sql_type, digest.digest())
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._replay(entry, start_line, applied_changes, rule_trace)
+
+        applied_keys = _AppliedKeys()
+        trace = [] if rule_trace is not None else None
+        new_text, change_log, manual_required, manual_reasons = transform(
+            text, start_line, applied_keys, sql_type, rule_trace=trace, protected=protected)
+
+        # 시간 초과 기록을 제외한 변경 기록은 같은 라인의 규칙 적용 키와 추가된 순서대로 대응
+        # (문장 모드의 변경 기록은 라인 순서로 정렬되어 키 추가 순서와 다를 수 있음)
+        keys_by_line = {}
+        for applied_key in applied_keys:
+            line, suffix = applied_key.split('-', 1)
+            keys_by_line.setdefault(int(line), []).append(suffix)
+        records = []
+        for record in change_log:
+            suffix = None if record.flag == TIMEOUT else keys_by_line[record.line].pop(0)
+            records.append((record, suffix))
+        entry = (new_text, [(record.line - start_line, record, suffix) for record, suffix in records],
+                 manual_required, manual_reasons,
+                 [(rule_key, line - start_line, fired) for rule_key, line, fired in trace or ()])
+        if not any(record.flag == TIMEOUT for record in change_log) and self.max_entries:
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self._replay(entry, start_line, applied_changes, rule_trace)
+
+    @staticmethod
+    def _replay(entry, start_line, applied_changes, rule_trace):
+        new_text, records, manual_required, manual_reasons, trace = entry
+        change_log = []
+        for offset, record, suffix in records:
+            line = start_line + offset
+            if suffix is not None:
+                applied_key = f"{line}-{suffix}"
+                if applied_key in applied_changes:
+                    continue
+                applied_changes.add(applied_key)
+            change_log.append(ChangeRecord(line, record.rule_key, record.description, record.before,
+                                           record.after, record.flag, record.reason))
+        if rule_trace is not None:
+            rule_trace.extend((rule_key, start_line + offset, fired) for rule_key, offset, fired in trace)
+        return new_text, change_log, manual_required, list(manual_reasons)
+
+
+class FileDedupPlan:
+    """
+    파일 내용 키가 같은 파일을 묶어 대표 파일(첫 번째 파일)만 변환하고,
+    나머지 파일은 대표 파일의 변환 결과를 입력 순서대로 재사용하도록 합니다.
+
+    대표 파일 결과를 unique_indices 순서대로 complete() 에 넘기면, 다음 대표 파일 전까지
+    입력 순서상 이어지는 중복 파일의 (입력 인덱스, 대표 파일 결과) 목록을 돌려줍니다.
+    대표 결과는 남은 중복 파일이 있는 동안만 보관합니다.
+    """
+
+    def __init__(self, keys):
+        first_index = {}
+        self.representative = []
+        self._remaining = {}
+        for index, key in enumerate(keys):
+            # 키가 없는 파일(읽기 실패 등)은 묶지 않음
+            representative = index if key is None else first_index.setdefault(key, index)
+            self.representative.append(representative)
+            if representative != index:
+                self._remaining[representative] = self._remaining.get(representative, 0) + 1
+        self.unique_indices = [index for index, rep in enumerate(self.representative) if rep == index]
+        self.duplicate_count = len(self.representative) - len(self.unique_indices)
+        self._results = {}
+        self._position = 0
+
+    def complete(self, result):
+        index = self.unique_indices[self._position]
+        self._position += 1
+        if self._remaining.get(index):
+            self._results[index] = result
+        end = (self.unique_indices[self._position] if self._position < len(self.unique_indices)
+               else len(self.representative))
+        duplicates = []
+        for duplicate_index in range(index + 1, end):
+            representative = self.representative[duplicate_index]
+            duplicates.append((duplicate_index, self._results[representative]))
+            self._remaining[representative] -= 1
+            if not self._remaining[representative]:
+                del self._results[representative]
+        return duplicates
@@ -0,0 +1,330 @@
+import re
+import html
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Set, Tuple
+from change_record import ChangeRecord
+
+# 이전 형식 변경 로그(HTML 문자열)의 라인 번호 ("<b>[Line 12] ...")
+_LOG_LINE_RE = re.compile(r"\[Line (\d+)\]")
+
+# Myers 탐색을 포기하는 편집 거리 (이보다 다르면 남은 구간을 통째로 교체로 표시)
+MAX_EDIT_DISTANCE = 4000
+# Myers 탐색 비용 상한 (구간 라인 수 × 편집 거리). 구간이 길면 허용 편집 거리가 이만큼 줄어듦
+MAX_DIFF_COST = 2000000
+
+# (태그, 원본 시작, 원본 끝, 변환 시작, 변환 끝) — difflib opcodes 와 같은 형식
+Opcode = Tuple[str, int, int, int, int]
+
+
+def changed_lines_from_log(change_log) -> Set[int]:
+    """
+    변경 기록(ChangeRecord 또는 행 목록, 이전 형식의 HTML 문자열)에서 변경된 라인 번호(1부터)를 모읍니다.
+    문장 모드의 여러 라인에 걸친 매치는 시작 라인에만 기록되므로, 변경 전/후 텍스트가 걸친 라인까지 포함합니다.
+    """
+    if not change_log:
+        return set()
+    if isinstance(change_log, str):
+        return {int(number) for number in _LOG_LINE_RE.findall(change_log)}
+    lines = set()
+    for record in change_log:
+        if isinstance(record, ChangeRecord):
+            line, before, after = record.line, record.before, record.after
+        else:
+            line, before, after = record[0], record[3], record[4]
+        span = max((before or '').count('\n'), (after or '').count('\n')) + 1
+        lines.update(range(line, line + span))
+    return lines
+
+
+def select_algorithm(orig_count: int, trans_count: int, full_render_max_lines: int = 2000) -> str:
+    """
+    diff 알고리즘을 고릅니다.
+
+    - full: 작은 파일은 기존처럼 모든 라인을 표시
+    - positional: 라인 수가 같으면 (라인 모드 변환) 같은 위치끼리 비교 - O(n)
+    - myers: 라인 수가 다르면 (문장 모드 등) Myers O((N+M)D) 비교
+    """
+    if max(orig_count, trans_count) <= full_render_max_lines:
+        return 'full'
+    if orig_count == trans_count:
+        return 'positional'
+    return 'myers'
+
+
+def positional_opcodes(orig_lines: List[str], trans_lines: List[str],
+                       changed_lines: Optional[Iterable[int]] = None) -> List[Opcode]:
+    """
+    라인 수가 같은 두 텍스트를 같은 위치끼리 비교합니다.
+    changed_lines(변경 로그의 라인 번호)가 주어지면 해당 라인만 확인합니다.
+    """
+    count = len(orig_lines)
+    if changed_lines is None:
+        candidates = range(count)
+    else:
+        candidates = sorted(number - 1 for number in changed_lines if 0 < number <= count)
+    opcodes = []
+    position = 0
+    for index in candidates:
+        if orig_lines[index].strip() == trans_lines[index].strip():
+            continue
+        if opcodes and opcodes[-1][0] == 'replace' and opcodes[-1][2] == index:
+            opcodes[-1] = ('replace', opcodes[-1][1], index + 1, opcodes[-1][3], index + 1)
+        else:
+            if position < index:
+                opcodes.append(('equal', position, index, position, index))
+            opcodes.append(('replace', index, index + 1, index, index + 1))
+        position = index + 1
+    if position < count:
+        opcodes.append(('equal', position, count, position, count))
+    return opcodes
+
+
+def _middle_snake(a, alo, ahi, b, blo, bhi, max_d):
+    """
+    앞/뒤 양방향 Myers 탐색이 만나는 가운데 snake 를 찾습니다. (선형 공간, V 배열 두 개만 사용)
+
+    :return: (snake 시작 x, y, snake 끝 x, y, 편집 거리). 편집 거리가 max_d 를 넘으면 None
+    """
+    n, m = ahi - alo, bhi - blo
+    delta = n - m
+    odd = delta & 1
+    limit = min((n + m + 1) // 2, (max_d + 1) // 2)
+    offset = limit + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range(limit + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and -d < delta - k < d and x + backward[offset + delta - k] >= n:
+                return alo + start_x, blo + start_y, alo + x, blo + y, 2 * d - 1
+        # 뒤쪽 탐색은 뒤집은 구간 기준 (x, y 는 끝에서부터 소비한 라인 수)
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return ahi - x, bhi - y, ahi - start_x, bhi - start_y, 2 * d
+    return None
+
+
+def _myers_range(a, b, alo, ahi, blo, bhi, max_d, opcodes) -> bool:
+    """
+    선형 공간 Myers(가운데 snake 로 분할 정복)로 구간의 opcodes 를 opcodes 에 추가합니다.
+    편집 거리가 max_d 를 넘으면 아무것도 추가하지 않고 False 를 반환합니다.
+    """
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        opcodes.append(('equal', alo, alo + 1, blo, blo + 1))
+        alo += 1
+        blo += 1
+    suffix_end = (ahi, bhi)
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+    if alo == ahi or blo == bhi:
+        opcodes.append(('delete' if alo < ahi else 'insert', alo, ahi, blo, bhi))
+    else:
+        snake = _middle_snake(a, alo, ahi, b, blo, bhi, max_d)
+        if snake is None:
+            return False
+        x, y, u, v, d = snake
+        # 양쪽 하위 구간의 편집 거리는 d 이하이므로 다시 실패하지 않음
+        _myers_range(a, b, alo, x, blo, y, d, opcodes)
+        opcodes.append(('equal', x, u, y, v))
+        _myers_range(a, b, u, ahi, v, bhi, d, opcodes)
+    opcodes.append(('equal', ahi, suffix_end[0], bhi, suffix_end[1]))
+    return True
+
+
+def _edit_distance_limit(n: int, m: int, max_d: int) -> int:
+    # Myers 비용은 (N+M)·D 에 비례하므로 구간이 길수록 허용 편집 거리를 줄임
+    return max(1, min(max_d, MAX_DIFF_COST // (n + m)))
+
+
+def _merge_opcodes(opcodes) -> List[Opcode]:
+    # 인접한 같은 구간끼리, 변경 구간끼리 합침 (삭제와 추가가 섞이면 replace)
+    merged = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if i1 == i2 and j1 == j2:
+            continue
+        if merged and (merged[-1][0] == 'equal') == (tag == 'equal'):
+            last_tag, last_i1, _, last_j1, _ = merged[-1]
+            merged[-1] = (last_tag if last_tag == tag else 'replace', last_i1, i2, last_j1, j2)
+        else:
+            merged.append((tag, i1, i2, j1, j2))
+    return merged
+
+
+def _unique_anchors(a, b, alo, ahi, blo, bhi) -> List[Tuple[int, int]]:
+    """
+    양쪽 구간에 한 번씩만 나오는 라인을 짝지은 뒤, 순서가 유지되는 가장 긴 짝 목록(patience 정렬)을 반환합니다.
+    """
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, i, 0, 0])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+    pairs = sorted((entry[1], entry[3]) for entry in counts.values() if entry[0] == 1 and entry[2] == 1)
+    if not pairs:
+        return []
+    # b 위치의 최장 증가 부분 수열 (O(k log k))
+    tails = []
+    tail_index = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        position = bisect_left(tails, j)
+        if position == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[position] = j
+            tail_index[position] = index
+        previous[index] = tail_index[position - 1] if position else -1
+    anchors = []
+    index = tail_index[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _diff_range(a, b, alo, ahi, blo, bhi, max_d, opcodes):
+    # 공통 앞/뒤 제거 → 고유 라인 앵커로 분할(patience) → 앵커가 없는 구간만 Myers
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        opcodes.append(('equal', alo, alo + 1, blo, blo + 1))
+        alo += 1
+        blo += 1
+    suffix = []
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        suffix.append(('equal', ahi, ahi + 1, bhi, bhi + 1))
+    if alo == ahi or blo == bhi:
+        opcodes.append(('replace', alo, ahi, blo, bhi))
+    else:
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            for i, j in anchors:
+                _diff_range(a, b, alo, i, blo, j, max_d, opcodes)
+                opcodes.append(('equal', i, i + 1, j, j + 1))
+                alo, blo = i + 1, j + 1
+            _diff_range(a, b, alo, ahi, blo, bhi, max_d, opcodes)
+        else:
+            middle = []
+            if _myers_range(a, b, alo, ahi, blo, bhi, _edit_distance_limit(ahi - alo, bhi - blo, max_d), middle):
+                opcodes.extend(middle)
+            else:
+                opcodes.append(('replace', alo, ahi, blo, bhi))
+    opcodes.extend(reversed(suffix))
+
+
+def myers_opcodes(orig_lines: List[str], trans_lines: List[str], max_d: int = MAX_EDIT_DISTANCE) -> List[Opcode]:
+    """
+    두 라인 목록의 opcodes 를 만듭니다. (공백 차이만 있는 라인은 같게 취급)
+
+    양쪽에 한 번씩만 나오는 라인을 기준점으로 구간을 나누고(patience diff),
+    기준점이 없는 구간만 선형 공간 Myers O((N+M)D) 로 비교합니다.
+    편집 거리가 max_d 또는 구간 길이에 따른 한도(MAX_DIFF_COST // (N+M))를 넘는 구간은 하나의 교체로 표시합니다.
+    """
+    a = [line.strip() for line in orig_lines]
+    b = [line.strip() for line in trans_lines]
+    opcodes = []
+    _diff_range(a, b, 0, len(a), 0, len(b), max_d, opcodes)
+    return _merge_opcodes(opcodes)
+
+
+def group_hunks(opcodes: List[Opcode], context: int = 3) -> List[List[Opcode]]:
+    """변경 구간 앞뒤로 context 라인만 남겨 hunk 단위로 묶습니다. (difflib.get_grouped_opcodes 와 같은 방식)"""
+    hunks = []
+    current = []
+    last = len(opcodes) - 1
+    for index, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+        if tag != 'equal':
+            current.append((tag, i1, i2, j1, j2))
+            continue
+        head = (i1, min(i2, i1 + context)) if index > 0 else None
+        tail = (max(i1, i2 - context), i2) if index < last else None
+        if head and tail and head[1] >= tail[0]:
+            current.append((tag, i1, i2, j1, j2))
+            continue
+        if head:
+            current.append((tag, head[0], head[1], j1, j1 + head[1] - head[0]))
+        if current:
+            hunks.append(current)
+            current = []
+        if tail:
+            current.append((tag, tail[0], tail[1], j2 - (tail[1] - tail[0]), j2))
+    if current and any(op[0] != 'equal' for op in current):
+        hunks.append(current)
+    return hunks
+
+
+def render_hunks_html(hunks: List[List[Opcode]], orig_lines: List[str], trans_lines: List[str],
+                      is_manual: bool = False) -> str:
+    """hunk 목록을 generate_custom_line_diff 와 같은 표 형식(원본/변경 라인 번호 포함)으로 렌더링합니다."""
+    css_sub = 'diff_sub_manual' if is_manual else 'diff_sub'
+    css_add = 'diff_add_manual' if is_manual else 'diff_add'
+    escape = html.escape
+    parts = ["<table class='diff'>",
+             "<tr><th class='line-number'>#</th><th>원본</th><th class='line-number'>#</th><th>변경</th></tr>"]
+    for hunk_index, hunk in enumerate(hunks):
+        if hunk_index:
+            parts.append("<tr><td class='line-number'>…</td><td></td><td class='line-number'>…</td><td></td></tr>")
+        for tag, i1, i2, j1, j2 in hunk:
+            if tag == 'equal':
+                for offset in range(i2 - i1):
+                    line = escape(orig_lines[i1 + offset])
+                    parts.append(f"<tr><td class='line-number'>{i1 + offset + 1}</td><td>{line}</td>"
+                                 f"<td class='line-number'>{j1 + offset + 1}</td><td>{line}</td></tr>")
+                continue
+            for offset in range(max(i2 - i1, j2 - j1)):
+                i, j = i1 + offset, j1 + offset
+                left = (f"<td class='line-number'>{i + 1}</td><td class='{css_sub}'>{escape(orig_lines[i])}</td>"
+                        if i < i2 else "<td class='line-number'></td><td></td>")
+                right = (f"<td class='line-number'>{j + 1}</td><td class='{css_add}'>{escape(trans_lines[j])}</td>"
+                         if j < j2 else "<td class='line-number'></td><td></td>")
+                parts.append(f"<tr>{left}{right}</tr>")
+    if not hunks:
+        parts.append("<tr><td colspan='4' style='padding:10px;'>변경 없음</td></tr>")
+    parts.append("</table>")
+    return "".join(parts)
+
+
+def render_fast_diff(original_sql: str, transformed_sql: str, is_manual: bool = False, change_log=None,
+                     algorithm: str = 'auto', context: int = 3) -> str:
+    """
+    변경된 hunk 만 context 라인과 함께 렌더링합니다.
+
+    :param change_log: 변경 로그. 라인 수가 같으면 로그의 라인 번호만 비교합니다.
+    :param algorithm: positional / myers / auto (라인 수가 같으면 positional)
+    """
+    orig_lines = original_sql.splitlines()
+    trans_lines = transformed_sql.splitlines()
+    if algorithm == 'auto':
+        algorithm = 'positional' if len(orig_lines) == len(trans_lines) else 'myers'
+    if algorithm == 'positional' and len(orig_lines) == len(trans_lines):
+        changed = changed_lines_from_log(change_log) if change_log is not None else None
+        opcodes = positional_opcodes(orig_lines, trans_lines, changed)
+    else:
+        opcodes = myers_opcodes(orig_lines, trans_lines)
+    return render_hunks_html(group_hunks(opcodes, context), orig_lines, trans_lines, is_manual)
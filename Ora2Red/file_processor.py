@@ -1,64 +1,546 @@
-
 import os
+import glob
+import shutil
 import logging
+import itertools
+from functools import partial
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import chardet  # pip install chardet
+from sql_transformer import SQLTransformer
+from conversion_cache import ConversionCache, file_content_hash
+from rule_index import RuleIndex
+from sql_classifier import split_statements, stream_statements, protected_spans
+from literal_mask import unit_spans
+from change_record import ChangeLogWriter, render_change_log_text
+from dedup import StatementMemo, FileDedupPlan
+from bulk_insert import BulkInsertPlan
+from ddl_advisor import DDLAdvisor
+from mmap_reader import (MappedSQLFile, StreamedOutput, KeywordScan, ChangeTracker, build_line_gate,
+                         mapped_codec, strip_block)
+
+# 인코딩 감지에 사용할 기본 샘플 크기와 디코딩 단위
+DEFAULT_ENCODING_SAMPLE_SIZE = 64 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+# '\r' 로 끝난 줄은 다음 청크의 '\n'과 이어질 수 있으므로 보류합니다.
+_PENDING_LINE_END = '\r'
+# determine_sql_type 키워드: DDL 키워드가 하나라도 있으면 DDL, 없고 DML 키워드가 있으면 DML
+_DDL_TYPE_KEYWORDS = ("CREATE", "ALTER", "DROP", "TRUNCATE", "COMMENT", "RENAME")
+_DML_TYPE_KEYWORDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "MERGE")
+# 대용량 파일 변환 중 기록하는 임시 파일 일련번호
+_TEMP_IDS = itertools.count()
+
+
+def configured_encoding(file_path, config=None):
+    """Config.FILE_ENCODING 고정값 또는 Config.ENCODING_HINTS 디렉토리 힌트로 정해지는 인코딩 (없으면 None)"""
+    fixed_encoding = getattr(config, 'FILE_ENCODING', None)
+    if fixed_encoding:
+        return fixed_encoding
+
+    hints = getattr(config, 'ENCODING_HINTS', None) or {}
+    if hints:
+        resolved = Path(file_path).resolve()
+        matched = [
+            (len(Path(directory).resolve().parts), encoding)
+            for directory, encoding in hints.items()
+            if Path(directory).resolve() in resolved.parents
+        ]
+        if matched:
+            return max(matched)[1]
+    return None
+
+
+def detect_file_encoding(file_path, config=None):
+    """
+    파일 인코딩을 결정합니다.
+    우선순위: Config.FILE_ENCODING 고정값 → Config.ENCODING_HINTS 디렉토리 힌트 → 앞부분 샘플 chardet 감지
+
+    :param file_path: SQL 파일 경로
+    :param config: Config 객체 (없으면 샘플 감지만 수행)
+    :return: 파이썬 코덱 이름
+    """
+    encoding = configured_encoding(file_path, config)
+    if encoding:
+        return encoding
+
+    sample_size = getattr(config, 'ENCODING_SAMPLE_SIZE', DEFAULT_ENCODING_SAMPLE_SIZE)
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size + 1)
+    if len(sample) > sample_size:
+        # 멀티바이트 문자가 잘리지 않도록 마지막 줄바꿈까지만 사용
+        sample = sample[:sample_size]
+        last_newline = sample.rfind(b'\n')
+        if last_newline > 0:
+            sample = sample[:last_newline + 1]
+    detected = chardet.detect(sample)
+    file_encoding = detected.get("encoding") or "utf-8"
+    # 샘플이 ASCII 뿐이어도 뒷부분에 UTF-8 문자가 있을 수 있음 (ASCII ⊂ UTF-8)
+    if file_encoding.lower() == 'ascii':
+        file_encoding = 'utf-8'
+    return file_encoding
 
-def read_file_lines(file_path):
+
+def iter_lines(chunks):
+    """
+    텍스트 조각을 차례로 이어 받아 "".join(chunks).splitlines(keepends=True) 와 같은 라인을 차례로 반환합니다.
+    """
+    pending = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (pending + chunk).splitlines(keepends=True)
+        last_line = lines[-1]
+        # 줄바꿈 없이 끝난 마지막 줄과, 다음 조각의 '\n'과 합쳐질 수 있는 '\r' 줄은 보류
+        if last_line.endswith(_PENDING_LINE_END) or last_line.splitlines()[0] == last_line:
+            pending = lines.pop()
+        else:
+            pending = ''
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_file_lines(file_path, encoding, chunk_size=READ_CHUNK_SIZE):
+    """
+    파일을 청크 단위로 디코딩하며 str.splitlines(keepends=True)와 동일한 라인을 차례로 반환합니다.
+    읽기/디코딩 단계에서는 파일 전체를 메모리에 올리지 않습니다. (변환 결과 보관은 호출하는 쪽에 따름)
+    """
+    with open(file_path, 'r', encoding=encoding, errors="replace", newline='') as f:
+        yield from iter_lines(iter(partial(f.read, chunk_size), ''))
+
+
+def read_file_lines(file_path, config=None):
     try:
-        with open(file_path, 'rb') as f:
-            raw_data = f.read()
-        detected = chardet.detect(raw_data)
-        file_encoding = detected.get("encoding", "utf-8")
-        decoded_data = raw_data.decode(file_encoding, errors="replace")
-        return decoded_data.splitlines(keepends=True)
+        file_encoding = detect_file_encoding(file_path, config)
+        return list(iter_file_lines(file_path, file_encoding))
     except Exception as e:
         logging.error(f"파일 읽기 오류 (인코딩 감지 실패): {e}")
         raise
 
+class _MappedConversion:
+    """
+    메모리 매핑 변환(transform_mapped_file) 중 누적하는 상태입니다.
+    변경 기록은 ChangeLogWriter 로 바로 기록하고, 리포트 발췌 범위(head_count 라인 이하)의 기록과 규칙 적용 키만 보관합니다.
+    """
+
+    def __init__(self, head_count):
+        self.head_count = head_count
+        self.changes = None
+        self.change_log = []
+        # 규칙 적용 키("라인-설명-패턴")는 같은 라인 안에서만 겹치므로 현재 라인의 키만 유지
+        self.applied_changes = set()
+        self.applied_excerpt = set()
+        self.manual_required = False
+        self.manual_reasons = {}
+        self.tracker = ChangeTracker()
+        self.ddl_scan = KeywordScan(_DDL_TYPE_KEYWORDS)
+        self.dml_scan = KeywordScan(_DML_TYPE_KEYWORDS)
+
+    def flush_applied(self, keep_from):
+        """keep_from 라인 이전의 규칙 적용 키를 비웁니다. (발췌 범위의 키는 applied_excerpt 에 모음)"""
+        if not self.applied_changes:
+            return
+        kept = set()
+        for key in self.applied_changes:
+            line_number = int(key.split('-', 1)[0])
+            if line_number >= keep_from:
+                kept.add(key)
+            elif line_number <= self.head_count:
+                self.applied_excerpt.add(key)
+        self.applied_changes = kept
+
+    def add(self, change_log, manual_required, manual_reasons):
+        self.changes.write(change_log)
+        self.change_log.extend(record for record in change_log if record.line <= self.head_count)
+        if manual_required:
+            self.manual_required = True
+            self.manual_reasons.update(dict.fromkeys(manual_reasons))
+
+    def feed_bytes(self, block):
+        self.ddl_scan.feed_bytes(block)
+        self.dml_scan.feed_bytes(block)
+
+    def feed_text(self, text):
+        self.ddl_scan.feed_text(text)
+        self.dml_scan.feed_text(text)
+
+    def sql_type(self):
+        # determine_sql_type 과 같은 기준
+        return "DML" if self.dml_scan.found and not self.ddl_scan.found else "DDL"
+
+
 class FileProcessor:
     def __init__(self, config, transformer, reporter):
         self.config = config
         self.transformer = transformer
         self.reporter = reporter
+        self.cache = None
+        if getattr(config, 'USE_CACHE', False):
+            self.cache = ConversionCache(
+                config.CACHE_DIR, transformer,
+                max_bytes=getattr(config, 'CACHE_MAX_BYTES', None),
+                variant=self._cache_variant()
+            )
+        self.rule_index = None
+        if self.cache is not None and getattr(config, 'USE_RULE_INDEX', False):
+            self.rule_index = RuleIndex(config.CACHE_DIR / 'rule_index.json')
+        # 같은 문장(라인) 본문은 한 번만 변환 (DEDUP_STATEMENTS)
+        # 규칙 프로파일 수집 중에는 사용하지 않음: memo 재사용 문장은 규칙을 실행하지 않아 실행/매치 횟수가 빠지므로
+        self.statement_memo = None
+        if getattr(config, 'DEDUP_STATEMENTS', False) and transformer.profiler is None:
+            self.statement_memo = StatementMemo(getattr(config, 'DEDUP_MEMO_MAX_ENTRIES', 50000))
+        # 변환 결과를 모아 실행 후 분산/정렬 키를 권장 (DDL_ADVISOR)
+        self.ddl_advisor = None
+        if getattr(config, 'DDL_ADVISOR', None):
+            self.ddl_advisor = DDLAdvisor(config.DDL_ADVISOR)
+        self._file_dedup = None
+        self._dedup_paths = None
+        self.processed_count = 0
+        self.cache_hit_count = 0
+        # 중복 제거 통계: 내용이 같은 파일 결과 재사용 수, 문장 memo 조회/재사용 수
+        self.dedup_file_count = 0
+        self.statement_lookup_count = 0
+        self.statement_hit_count = 0
+
+    def _cache_variant(self):
+        # 분리기에 따라 statement 모드 결과가 달라질 수 있으므로 캐시 항목을 구분합니다.
+        mode = getattr(self.config, 'PROCESSING_MODE', 'line')
+        if mode == 'buffer':
+            # buffer 모드 결과는 line 모드와 같으므로 캐시 항목을 공유
+            mode = 'line'
+        if mode == 'statement':
+            mode = f"{mode}:{getattr(self.config, 'STATEMENT_SPLITTER', 'lexer')}"
+        # 토큰 인식 모드는 문자열/주석 안을 변환하지 않으므로 결과가 다름
+        if getattr(self.config, 'TOKEN_AWARE', False):
+            mode += ":token"
+        # 대량 INSERT 경로는 리터럴을 변환하지 않고, multirow / copy 는 출력 형식이 다름
+        bulk_mode = getattr(self.config, 'BULK_INSERT_MODE', None)
+        if bulk_mode:
+            mode += ":bulk-" + ",".join(str(value) for value in (
+                bulk_mode, getattr(self.config, 'BULK_INSERT_MIN_ROWS', 100),
+                getattr(self.config, 'BULK_INSERT_BATCH_ROWS', 1000),
+                getattr(self.config, 'BULK_COPY_S3_PREFIX', None), getattr(self.config, 'BULK_COPY_IAM_ROLE', None)))
+        return mode
 
     def determine_sql_type(self, sql_text):
         upper_sql = sql_text.upper()
-        ddl_keywords = ["CREATE", "ALTER", "DROP", "TRUNCATE", "COMMENT", "RENAME"]
-        dml_keywords = ["SELECT", "INSERT", "UPDATE", "DELETE", "MERGE"]
 
-        for kw in ddl_keywords:
+        for kw in _DDL_TYPE_KEYWORDS:
             if kw in upper_sql:
                 return "DDL"
-        for kw in dml_keywords:
+        for kw in _DML_TYPE_KEYWORDS:
             if kw in upper_sql:
                 return "DML"
         return "DDL"
 
-    def process_sql_file(self, file_path):
+    def transform_sql_file(self, file_path, cache_mode="normal"):
+        """
+        SQL 파일을 읽어 변환하고, 저장/리포트에 필요한 결과를 dict로 반환합니다.
+        파일 저장이나 reporter 갱신은 하지 않으므로 워커 프로세스에서도 호출할 수 있습니다.
+
+        :param file_path: 변환할 SQL 파일 경로
+        :param cache_mode: normal (캐시 검증 후 재사용) / refresh (항상 재변환) / reuse (검증 없이 재사용)
+        :return: 변환 결과 dict (읽기 실패 시 None)
+        """
         if not os.path.isfile(file_path):
             logging.error(f"유효하지 않은 파일 경로입니다: {file_path}")
-            return
+            return None
 
-        file_name = Path(file_path).name
+        try:
+            file_encoding = detect_file_encoding(file_path, self.config)
+            content_hash = file_content_hash(file_path) if self.cache is not None else None
+        except Exception as e:
+            logging.error(f"파일 읽기 오류: {e}")
+            return None
+        if self._use_mapped_reader(file_path, file_encoding):
+            return self.transform_mapped_file(file_path, file_encoding, content_hash)
+
+        # 라인을 읽는 즉시 변환합니다. (파일 바이트 전체 읽기/전체 chardet 감지 없음)
+        # 단, 캐시 검증과 리포트에 원본 전체 텍스트가 필요하므로 원본/변환 SQL 은 메모리에 보관됩니다.
+        # 파일 크기와 무관한 메모리는 MMAP_MIN_BYTES 이상 파일의 메모리 매핑 경로(transform_mapped_file)에서만 보장합니다.
+        query_lines = iter_file_lines(file_path, file_encoding)
+        if self.cache is not None:
+            original_sql = "".join(query_lines)
+            if cache_mode != "refresh":
+                cached = self.cache.get(content_hash, file_encoding, original_sql,
+                                        assume_valid=(cache_mode == "reuse"))
+                if cached is not None:
+                    return self._build_result(file_path, original_sql, cached, content_hash,
+                                              file_encoding, cache_hit=True)
+            query_lines = original_sql.splitlines(keepends=True)
+        return self._convert(file_path, query_lines, file_encoding, content_hash)
 
+    def read_source(self, file_path):
+        """
+        파일 읽기 단계: 인코딩 감지, 내용 해시 계산 후 파일 전체를 디코딩합니다. (파이프라인 읽기 단계용)
+        메모리 매핑으로 변환할 대용량 파일은 디코딩하지 않고 원본 텍스트 자리에 None 을 둡니다.
+
+        :return: (인코딩, 내용 해시, 원본 텍스트) 또는 읽기 실패 시 None
+        """
+        if not os.path.isfile(file_path):
+            logging.error(f"유효하지 않은 파일 경로입니다: {file_path}")
+            return None
         try:
-            query_lines = read_file_lines(file_path)
+            file_encoding = detect_file_encoding(file_path, self.config)
+            content_hash = file_content_hash(file_path) if self.cache is not None else None
+            if self._use_mapped_reader(file_path, file_encoding):
+                return file_encoding, content_hash, None
+            original_sql = "".join(iter_file_lines(file_path, file_encoding))
         except Exception as e:
             logging.error(f"파일 읽기 오류: {e}")
+            return None
+        return file_encoding, content_hash, original_sql
+
+    def transform_source(self, file_path, source, cache_mode="normal"):
+        """read_source 로 미리 읽은 내용을 변환합니다. transform_sql_file 과 같은 결과 dict 를 반환합니다."""
+        if source is None:
+            return None
+        file_encoding, content_hash, original_sql = source
+        if original_sql is None:
+            return self.transform_mapped_file(file_path, file_encoding, content_hash)
+        if self.cache is not None and cache_mode != "refresh":
+            cached = self.cache.get(content_hash, file_encoding, original_sql,
+                                    assume_valid=(cache_mode == "reuse"))
+            if cached is not None:
+                return self._build_result(file_path, original_sql, cached, content_hash,
+                                          file_encoding, cache_hit=True)
+        return self._convert(file_path, original_sql.splitlines(keepends=True), file_encoding, content_hash)
+
+    def _convert(self, file_path, query_lines, file_encoding, content_hash):
+        timeout_count = self.transformer.timeout_count
+        memo = self.statement_memo
+        lookups, hits = (memo.lookups, memo.hits) if memo is not None else (0, 0)
+        original_sql, conversion = self.transform_lines(query_lines)
+        # 규칙 시간 초과는 실행 환경에 따라 달라지므로 해당 결과는 캐시하지 않습니다.
+        if self.cache is not None and self.transformer.timeout_count == timeout_count:
+            self.cache.put(content_hash, file_encoding, conversion)
+        result = self._build_result(file_path, original_sql, conversion, content_hash, file_encoding)
+        if memo is not None:
+            # 워커 프로세스에서 변환한 경우에도 부모 프로세스에서 합산할 수 있도록 결과에 포함
+            result["statement_dedup"] = (memo.lookups - lookups, memo.hits - hits)
+        return result
+
+    def _use_mapped_reader(self, file_path, file_encoding):
+        """MMAP_MIN_BYTES 이상인 파일을 메모리 매핑 경로(transform_mapped_file)로 변환할지 결정합니다."""
+        min_bytes = getattr(self.config, 'MMAP_MIN_BYTES', None)
+        if not min_bytes or os.path.getsize(file_path) < min_bytes:
+            return False
+        if mapped_codec(file_encoding) is None:
+            reason = f"인코딩({file_encoding})"
+        elif getattr(self.config, 'TOKEN_AWARE', False):
+            reason = "토큰 인식 모드"
+        elif getattr(self.config, 'BULK_INSERT_MODE', None):
+            reason = "대량 INSERT 경로"
+        elif (getattr(self.config, 'PROCESSING_MODE', 'line') == 'statement'
+              and getattr(self.config, 'STATEMENT_SPLITTER', 'lexer') == 'sqlparse'):
+            reason = "sqlparse 문장 분리기"
+        else:
+            return True
+        logging.warning(f"{reason}은(는) 메모리 매핑 읽기를 지원하지 않아 파일 전체를 읽어 변환합니다: {file_path}")
+        return False
+
+    def transform_mapped_file(self, file_path, file_encoding, content_hash=None):
+        """
+        대용량 파일을 메모리 매핑으로 읽어 변환하고, 변환 SQL 과 변경 로그는 임시 파일에 바로 기록합니다.
+        (write_outputs 에서 출력 경로로 이동) 파일 크기나 변경 수와 무관한 메모리로 변환하며,
+        결과 dict 의 원본/변환 SQL, 변경 기록, 적용 규칙은 앞부분 MMAP_REPORT_LINES 라인 범위만 리포트용으로 보관합니다.
+        변환 SQL 과 변경 로그 파일 내용은 line(buffer) / statement 모드와 같습니다. (변환 캐시와 규칙 색인 추적은 사용하지 않음)
+
+        :return: transform_sql_file 과 같은 결과 dict (읽기 실패 시 None)
+        """
+        head_count = getattr(self.config, 'MMAP_REPORT_LINES', 200)
+        try:
+            mapped = MappedSQLFile(file_path, file_encoding)
+        except (OSError, ValueError) as e:
+            logging.error(f"파일 읽기 오류: {e}")
+            return None
+        temp_sql = temp_log = None
+        if not getattr(self.config, 'DRY_RUN', False):
+            temp_sql = self._temp_output(self.config.CONVERTED_DIR, file_path)
+            temp_log = self._temp_output(self.config.LOG_DIR, file_path)
+        logging.info(f"대용량 파일을 메모리 매핑으로 변환합니다: {file_path} ({mapped.size:,} bytes)")
+
+        memo = self.statement_memo
+        lookups, hits = (memo.lookups, memo.hits) if memo is not None else (0, 0)
+        state = _MappedConversion(head_count)
+        try:
+            with mapped, StreamedOutput(temp_sql, head_count) as output, ChangeLogWriter(temp_log) as changes:
+                state.changes = changes
+                if getattr(self.config, 'PROCESSING_MODE', 'line') == 'statement':
+                    self._transform_mapped_statements(mapped, output, state)
+                else:
+                    self._transform_mapped_lines(mapped, output, state)
+                original_head = "".join(mapped.head_lines(head_count))
+                size = mapped.size
+        except BaseException:
+            for path in (temp_sql, temp_log):
+                if path is not None and path.exists():
+                    path.unlink()
+            raise
+        state.flush_applied(float('inf'))
+        if temp_log is not None and not state.changes.count:
+            temp_log.unlink()
+            temp_log = None
+
+        # 리포트에는 앞부분 발췌와 안내 주석만 기록. 리포트의 변경 여부(원본/변환 SQL 비교)가 전체 파일 기준과 같도록
+        # 변경이 없으면 원본 발췌를 그대로 쓰고, 있으면 안내 주석을 다르게 씀
+        note = f"-- (대용량 파일 {size:,} bytes: 앞부분 {head_count}라인만 표시, 전체 결과는 변환 파일 참조)"
+        original_sql = original_head + ("" if original_head.endswith("\n") else "\n") + note
+        transformed_sql = (("\n".join(output.head) + "\n" + note + " - 변환됨") if state.tracker.changed
+                           else original_sql)
+        conversion = self._conversion(transformed_sql, state.sql_type(), state.change_log, state.applied_excerpt,
+                                      state.manual_required, list(state.manual_reasons), None,
+                                      change_count=state.changes.count)
+        result = self._build_result(file_path, original_sql, conversion, content_hash, file_encoding)
+        result.update({"change_count": state.changes.count, "streamed_sql": temp_sql, "streamed_log": temp_log,
+                       "streamed_temp": temp_sql is not None})
+        if memo is not None:
+            result["statement_dedup"] = (memo.lookups - lookups, memo.hits - hits)
+        return result
+
+    @staticmethod
+    def _temp_output(directory, file_path):
+        # 프로세스 ID + 일련번호로 워커 간에도 겹치지 않는 이름 (출력 파일과 같은 기본 권한으로 생성됨)
+        return Path(directory) / f"{Path(file_path).stem}.{os.getpid()}.{next(_TEMP_IDS)}.partial"
+
+    def _transform_mapped_lines(self, mapped, output, state):
+        """
+        line 모드 변환. 규칙 앵커와 디코딩이 필요한 바이트가 없는 라인은 디코딩 없이 줄 끝 공백만 정리해 기록하고,
+        나머지 라인만 디코딩해 apply_transformations 를 적용합니다. (buffer 모드도 결과가 같으므로 이 경로 사용)
+        """
+        # 프리필터를 쓰지 않으면 모든 규칙을 모든 라인에 실행 (앵커 없는 규칙과 같이 취급)
+        use_prefilter = self.transformer.use_prefilter
+        gate = build_line_gate([rule["anchors"] if use_prefilter else None
+                                for rule in self.transformer.compiled_rules])
+
+        line_number = 0
+        for needs_decode, data in mapped.iter_blocks(gate):
+            if not needs_decode:
+                if not data.endswith(b"\n"):
+                    # 줄바꿈 없이 끝난 마지막 라인
+                    data += b"\n"
+                block = strip_block(data)
+                state.tracker.block(data, block)
+                state.feed_bytes(block)
+                line_number += block.count(b"\n")
+                output.write_block(block.decode('ascii'))
+                continue
+
+            text = mapped.decode(data)
+            state.feed_text(text)
+            for line in text.splitlines(keepends=True):
+                line_number += 1
+                state.flush_applied(line_number)
+                new_line, logs, manual_req, manual_reasons = \
+                    self._apply_line(line, line_number, state.applied_changes, None)
+                new_line = new_line.rstrip('\n')
+                output.write_line(new_line)
+                state.tracker.line(line, new_line)
+                state.add(logs, manual_req, manual_reasons)
+
+    def _transform_mapped_statements(self, mapped, output, state):
+        """statement 모드 변환. 라인 경계에서 나눠 디코딩한 조각을 이어 받으며 문장을 분리해 변환합니다."""
+
+        def chunks():
+            for chunk in mapped.iter_text():
+                state.feed_text(chunk)
+                yield chunk
+
+        def transformed_statements():
+            for statement, kind, start_line in stream_statements(chunks()):
+                # 한 라인에 여러 문장이 있을 수 있으므로 시작 라인의 규칙 적용 키는 유지
+                state.flush_applied(start_line)
+                sql_type = kind if kind in ('DDL', 'DML') else None
+                new_statement, logs, manual_req, manual_reasons = \
+                    self._apply_statement(statement, start_line, state.applied_changes, sql_type, None)
+                if new_statement.strip() != statement.strip():
+                    state.tracker.changed = True
+                state.add(logs, manual_req, manual_reasons)
+                yield new_statement
+
+        # transform_statements 와 같은 형식(줄 끝 공백 제거, '\n' 구분)으로 기록
+        # (규칙이 바꾼 문장이 없으면 변환 전 라인과 같으므로 라인별로 변경 여부 비교)
+        for line in iter_lines(transformed_statements()):
+            new_line = line.rstrip()
+            output.write_line(new_line)
+            state.tracker.line(line, new_line)
+
+    def _apply_line(self, line, line_number, applied_changes, rule_trace, protected=None):
+        if self.statement_memo is None:
+            return self.transformer.apply_transformations(
+                line, line_number, applied_changes, rule_trace=rule_trace, protected=protected)
+        return self.statement_memo.apply(self.transformer.apply_transformations, line, line_number,
+                                         applied_changes, rule_trace=rule_trace, protected=protected)
+
+    def _apply_statement(self, statement, start_line, applied_changes, sql_type, rule_trace, protected=None):
+        if self.statement_memo is None:
+            return self.transformer.apply_statement_transformations(
+                statement, start_line, applied_changes, sql_type, rule_trace=rule_trace, protected=protected)
+        return self.statement_memo.apply(self.transformer.apply_statement_transformations, statement, start_line,
+                                         applied_changes, sql_type, rule_trace=rule_trace, protected=protected)
+
+    def _protected_units(self, units, full_sql_text):
+        """
+        TOKEN_AWARE 이면 파일 전체를 한 번 훑어 찾은 문자열/인용 식별자/주석 구간을
+        변환 단위(라인 또는 문장)별 위치로 잘라 (단위, 구간 목록) 을 순서대로 반환합니다.
+        """
+        if not getattr(self.config, 'TOKEN_AWARE', False):
+            for unit in units:
+                yield unit, None
             return
+        spans = protected_spans(full_sql_text)
+        span_index = 0
+        offset = 0
+        for unit in units:
+            text = unit if isinstance(unit, str) else unit[0]
+            local, span_index = unit_spans(spans, span_index, offset, offset + len(text))
+            offset += len(text)
+            yield unit, local
+
+    def transform_lines(self, query_lines):
+        """
+        라인 단위로 규칙을 적용합니다. (PROCESSING_MODE 가 statement 이면 문장 단위로 적용,
+        buffer 이면 같은 결과를 파일 버퍼 단위 스캔으로 계산)
 
+        원본 텍스트와 변환된 라인을 모두 보관하므로 메모리 사용량은 파일 크기에 비례합니다.
+        (일정한 메모리 변환은 transform_mapped_file)
+
+        :param query_lines: 원본 라인 iterable (줄바꿈 포함)
+        :return: (원본 전체 텍스트, 변환 결과 dict)
+        """
+        mode = getattr(self.config, 'PROCESSING_MODE', 'line')
+        if mode == 'statement':
+            return self.transform_statements(query_lines)
+        bulk = None
+        if getattr(self.config, 'BULK_INSERT_MODE', None):
+            # 대량 INSERT 구간을 찾으려면 라인 목록이 필요 (구간이 있으면 buffer 모드도 라인별로 변환)
+            query_lines = list(query_lines)
+            bulk = self._bulk_insert_plan(query_lines)
+        if mode == 'buffer' and bulk is None and self._buffer_mode_available():
+            return self.transform_buffer(query_lines)
+
+        original_parts = []
         transformed_lines = []
         change_log = []
         applied_changes = set()
         all_manual_reasons = []
-        all_applied_rules = []
         manual_required_flag = False
+        rule_trace = [] if self.rule_index is not None else None
+
+        if getattr(self.config, 'TOKEN_AWARE', False):
+            # 여러 라인에 걸친 주석/문자열을 알아야 하므로 파일 전체를 먼저 읽음
+            query_lines = list(query_lines)
+            units = self._protected_units(query_lines, "".join(query_lines))
+        else:
+            units = self._protected_units(query_lines, None)
 
-        for idx, line in enumerate(query_lines, start=1):
+        for idx, (line, protected) in enumerate(units, start=1):
+            original_parts.append(line)
+            converted = bulk.transform_row(idx - 1, line, idx, applied_changes, rule_trace) if bulk else None
+            if converted is None:
+                converted = self._apply_line(line, idx, applied_changes, rule_trace, protected)
             # apply_transformations는 (new_line, logs, manual_req, manual_reasons) 튜플을 반환합니다.
-            new_line, logs, manual_req, manual_reasons = \
-                self.transformer.apply_transformations(line, idx, applied_changes)
+            new_line, logs, manual_req, manual_reasons = converted
 
             transformed_lines.append(new_line.rstrip('\n'))
             change_log.extend(logs)
@@ -66,67 +548,460 @@ class FileProcessor:
                 manual_required_flag = True
                 all_manual_reasons.extend(manual_reasons)
 
-        # 적용된 룰 목록은 applied_changes 집합에서 가져옵니다.
-        all_applied_rules = list(applied_changes)
+        if bulk is not None:
+            manual_required_flag = self._finish_bulk_insert(
+                bulk, transformed_lines, change_log, applied_changes, all_manual_reasons) or manual_required_flag
 
-        formatted_sql = self.transformer.format_sql("\n".join(transformed_lines))
+        full_sql_text = "".join(original_parts)
+        return full_sql_text, self._with_copy_files(bulk, self._build_conversion(
+            full_sql_text, transformed_lines, change_log, applied_changes,
+            manual_required_flag, all_manual_reasons, rule_trace))
+
+    def _bulk_insert_plan(self, texts):
+        """BULK_INSERT_MODE 이면 변환 단위(라인/문장) 목록에서 대량 INSERT 구간을 찾습니다. (없으면 None)"""
+        mode = getattr(self.config, 'BULK_INSERT_MODE', None)
+        if not mode:
+            return None
+        return BulkInsertPlan.build(
+            self.transformer, texts, mode,
+            min_rows=getattr(self.config, 'BULK_INSERT_MIN_ROWS', 100),
+            batch_rows=getattr(self.config, 'BULK_INSERT_BATCH_ROWS', 1000),
+            s3_prefix=getattr(self.config, 'BULK_COPY_S3_PREFIX', None),
+            iam_role=getattr(self.config, 'BULK_COPY_IAM_ROLE', None))
+
+    @staticmethod
+    def _finish_bulk_insert(bulk, outputs, change_log, applied_changes, all_manual_reasons, as_parts=False):
+        """
+        대량 INSERT 구간을 BULK_INSERT_MODE 형식(multirow / copy)으로 바꾸고 변경 기록과 수동 검토 사유를 추가합니다.
+        :return: 수동 검토가 필요한지 여부 (COPY 설정값 누락)
+        """
+        records, manual_reasons = bulk.emit(outputs, applied_changes, as_parts)
+        if records:
+            change_log.extend(records)
+            change_log.sort(key=lambda record: record.line)
+        all_manual_reasons.extend(manual_reasons)
+        logging.info(f"대량 INSERT 경로로 변환: {bulk.row_count}행, 구간 {len(bulk.runs)}개 ({bulk.mode})")
+        return bool(manual_reasons)
+
+    @staticmethod
+    def _with_copy_files(bulk, conversion):
+        # COPY 모드의 CSV 데이터 (write_outputs 에서 BULK_COPY_DIR 에 기록)
+        if bulk is not None and bulk.copy_files:
+            conversion["copy_files"] = bulk.copy_files
+        return conversion
+
+    def _buffer_mode_available(self):
+        # 토큰 인식 모드, 규칙 시간 제한은 라인별 처리에서만 지원
+        return not getattr(self.config, 'TOKEN_AWARE', False) and self.transformer.regex_guard is None
+
+    def transform_buffer(self, query_lines):
+        """
+        파일 전체를 한 버퍼로 보고 규칙마다 한 번씩 스캔합니다. 결과(변환 SQL, 변경 기록, 적용 규칙)는 line 모드와 같습니다.
+        생성된 대용량 스크립트처럼 라인 수가 많은 파일에서 라인별 호출 비용을 줄입니다.
+        """
+        lines = list(query_lines)
+        applied_changes = set()
+        rule_trace = [] if self.rule_index is not None else None
+        transformed_lines, change_log, manual_required_flag, all_manual_reasons = \
+            self.transformer.apply_buffer_transformations(lines, applied_changes, rule_trace=rule_trace)
+
+        full_sql_text = "".join(lines)
+        return full_sql_text, self._build_conversion(
+            full_sql_text, transformed_lines, change_log, applied_changes,
+            manual_required_flag, all_manual_reasons, rule_trace)
+
+    def transform_statements(self, query_lines):
+        """
+        sql_classifier 로 파일을 한 번 분리/분류한 뒤, 문장별로 applicable_to 가 맞는 규칙만 적용합니다.
+        여러 라인에 걸친 구문도 변환되며, 변경 로그의 라인 번호는 원본 파일 기준입니다.
+
+        :param query_lines: 원본 라인 iterable (줄바꿈 포함)
+        :return: (원본 전체 텍스트, 변환 결과 dict)
+        """
         full_sql_text = "".join(query_lines)
+        transformed_parts = []
+        change_log = []
+        applied_changes = set()
+        all_manual_reasons = []
+        manual_required_flag = False
+        rule_trace = [] if self.rule_index is not None else None
+
+        use_sqlparse = getattr(self.config, 'STATEMENT_SPLITTER', 'lexer') == 'sqlparse'
+        statements = split_statements(full_sql_text, use_sqlparse=use_sqlparse)
+        bulk = self._bulk_insert_plan([statement for statement, _, _ in statements])
+        units = self._protected_units(statements, full_sql_text)
+        for index, ((statement, kind, start_line), protected) in enumerate(units):
+            converted = bulk.transform_row(index, statement, start_line, applied_changes, rule_trace) if bulk else None
+            if converted is None:
+                # DDL/DML 이 아닌 문장(PLSQL, UNKNOWN 등)은 모든 규칙을 적용합니다.
+                sql_type = kind if kind in ('DDL', 'DML') else None
+                converted = self._apply_statement(statement, start_line, applied_changes, sql_type, rule_trace,
+                                                  protected)
+            new_statement, logs, manual_req, manual_reasons = converted
+
+            transformed_parts.append(new_statement)
+            change_log.extend(logs)
+            if manual_req:
+                manual_required_flag = True
+                all_manual_reasons.extend(manual_reasons)
+
+        if bulk is not None:
+            manual_required_flag = self._finish_bulk_insert(
+                bulk, transformed_parts, change_log, applied_changes, all_manual_reasons,
+                as_parts=True) or manual_required_flag
+
+        # 라인 모드와 같은 형식(줄 끝 공백 제거, '\n' 구분)으로 맞춥니다.
+        transformed_lines = [line.rstrip() for line in "".join(transformed_parts).splitlines()]
+        return full_sql_text, self._with_copy_files(bulk, self._build_conversion(
+            full_sql_text, transformed_lines, change_log, applied_changes,
+            manual_required_flag, all_manual_reasons, rule_trace))
+
+    def _build_conversion(self, full_sql_text, transformed_lines, change_log, applied_changes,
+                          manual_required_flag, all_manual_reasons, rule_trace):
+        formatted_sql = self.transformer.format_sql("\n".join(transformed_lines))
         sql_type = self.determine_sql_type(full_sql_text)
+        return self._conversion(formatted_sql, sql_type, change_log, applied_changes,
+                                manual_required_flag, all_manual_reasons, rule_trace)
 
-        if not change_log:
+    def _conversion(self, formatted_sql, sql_type, change_log, applied_changes,
+                    manual_required_flag, all_manual_reasons, rule_trace, change_count=None):
+        # 적용된 룰 목록은 applied_changes 집합에서 가져옵니다.
+        # (실행마다 같은 결과가 나오도록 라인 번호 순으로 정렬)
+        all_applied_rules = sorted(applied_changes, key=lambda key: (int(key.split('-', 1)[0]), key))
+
+        # change_count: 변경 기록 일부만 보관한 경우(대용량 파일)의 전체 변경 수
+        if not (len(change_log) if change_count is None else change_count):
             conversion_method = "변환 불필요"
-            output_dir = self.config.DDL_NOCHANGE_DIR if sql_type == "DDL" else self.config.DML_NOCHANGE_DIR
         elif manual_required_flag:
             conversion_method = "메뉴얼 변경"
-            output_dir = self.config.DDL_MANUAL_DIR if sql_type == "DDL" else self.config.DML_MANUAL_DIR
         else:
             conversion_method = "변환 성공"
-            output_dir = self.config.DDL_SUCCESS_DIR if sql_type == "DDL" else self.config.DML_SUCCESS_DIR
 
+        conversion = {
+            "transformed_sql": formatted_sql,
+            "change_log": change_log,
+            "applied_rules": all_applied_rules,
+            "manual_reason": ", ".join(dict.fromkeys(all_manual_reasons)) if manual_required_flag else None,
+            "sql_type": sql_type,
+            "conversion_method": conversion_method
+        }
+        if rule_trace is not None:
+            conversion["rule_trace"] = self._summarize_rule_trace(rule_trace)
+        return conversion
+
+    @staticmethod
+    def _summarize_rule_trace(rule_trace):
+        # (rule_key, line, fired) 목록 → {rule_key: {"fired": [라인], "candidate": [라인]}}
+        summary = {}
+        for key, line_number, fired in rule_trace:
+            lines = summary.setdefault(key, {"fired": [], "candidate": []})
+            lines["candidate"].append(line_number)
+            if fired:
+                lines["fired"].append(line_number)
+        return summary
+
+    def output_file_for(self, file_path, sql_type, conversion_method):
+        if conversion_method == "변환 불필요":
+            output_dir = self.config.DDL_NOCHANGE_DIR if sql_type == "DDL" else self.config.DML_NOCHANGE_DIR
+        elif conversion_method == "메뉴얼 변경":
+            output_dir = self.config.DDL_MANUAL_DIR if sql_type == "DDL" else self.config.DML_MANUAL_DIR
+        else:
+            output_dir = self.config.DDL_SUCCESS_DIR if sql_type == "DDL" else self.config.DML_SUCCESS_DIR
         file_basename = Path(file_path).with_suffix('').name.replace(' ', '_')
-        output_file = output_dir / f"{file_basename}_converted.sql"
+        return output_dir / f"{file_basename}_converted.sql"
+
+    def _build_result(self, file_path, original_sql, conversion, content_hash=None,
+                      encoding=None, cache_hit=False):
+        result = dict(conversion)
+        result.update({
+            "file_path": str(file_path),
+            "content_hash": content_hash,
+            "encoding": encoding,
+            "file_name": Path(file_path).name,
+            "original_sql": original_sql,
+            "output_file": self.output_file_for(file_path, conversion["sql_type"], conversion["conversion_method"]),
+            "log_file": None,
+            "cache_hit": cache_hit
+        })
+        return result
+
+    def write_outputs(self, result):
+        if getattr(self.config, 'DRY_RUN', False):
+            return
+        output_file = result["output_file"]
         log_file = self.config.LOG_DIR / (output_file.stem + '_log.txt')
+        change_log = result["change_log"]
 
+        streamed_sql = result.get("streamed_sql")
+        streamed_temp = result.get("streamed_temp")
         try:
-            with open(output_file, 'w', encoding="utf-8") as out_f:
-                out_f.write(formatted_sql)
+            if streamed_sql is None:
+                with open(output_file, 'w', encoding="utf-8") as out_f:
+                    out_f.write(result["transformed_sql"])
+            elif streamed_temp:
+                # 메모리 매핑으로 변환한 대용량 파일은 변환 중 기록한 임시 파일을 옮김
+                os.replace(streamed_sql, output_file)
+                result["streamed_sql"] = output_file
+            elif Path(streamed_sql) != Path(output_file):
+                # 내용이 같은 중복 파일은 대표 파일의 변환 결과를 복사
+                shutil.copyfile(streamed_sql, output_file)
         except Exception as e:
             logging.error(f"변환된 SQL 파일 저장 오류: {e}")
 
-        if change_log:
+        streamed_log = result.get("streamed_log")
+        if streamed_log is not None:
+            # 대용량 파일의 변경 로그도 변환 중 기록한 임시 파일을 옮기거나 (중복 파일은) 복사
+            try:
+                if streamed_temp:
+                    os.replace(streamed_log, log_file)
+                    result["streamed_log"] = log_file
+                elif Path(streamed_log) != Path(log_file):
+                    shutil.copyfile(streamed_log, log_file)
+            except Exception as e:
+                logging.error(f"변환 로그 파일 저장 오류: {e}")
+            result["log_file"] = log_file
+        elif change_log:
             try:
                 with open(log_file, 'w', encoding="utf-8") as log_f:
-                    log_f.write("\n".join(change_log) + "\n")
+                    log_f.write(render_change_log_text(change_log) + "\n")
             except Exception as e:
                 logging.error(f"변환 로그 파일 저장 오류: {e}")
-        else:
-            log_file = None
+            result["log_file"] = log_file
+        if streamed_temp:
+            result["streamed_temp"] = False
+        if result.get("copy_files"):
+            self._write_copy_files(result["copy_files"])
 
-        manual_reason_summary = ", ".join(set(all_manual_reasons)) if manual_required_flag else None
+    def _write_copy_files(self, copy_files):
+        """대량 INSERT COPY 모드의 CSV 데이터를 BULK_COPY_DIR 에 기록합니다. (S3 업로드 대상)"""
+        copy_dir = Path(getattr(self.config, 'BULK_COPY_DIR', self.config.CONVERTED_DIR / 'copy_data'))
+        try:
+            copy_dir.mkdir(parents=True, exist_ok=True)
+            for name, csv_text in copy_files.items():
+                path = copy_dir / name
+                # 파일명에 내용 해시가 있으므로 이미 있으면 같은 내용 (중복 파일, 같은 데이터를 적재하는 스크립트)
+                if not path.exists():
+                    with open(path, 'w', encoding="utf-8", newline='') as csv_f:
+                        csv_f.write(csv_text)
+        except Exception as e:
+            logging.error(f"COPY 데이터 파일 저장 오류: {e}")
+
+    def record_result(self, result):
+        file_name = result["file_name"]
+        log_file = result["log_file"]
 
         self.reporter.add_execution_result(
             file_name=file_name,
-            original_sql=full_sql_text,
-            transformed_sql=formatted_sql,
+            original_sql=result["original_sql"],
+            transformed_sql=result["transformed_sql"],
             execution_time=0.0,
-            error=manual_reason_summary,
+            error=result["manual_reason"],
             plan="(변환기 전용)",
             rows="",
             cpu_time="",
-            applied_rules=all_applied_rules
+            applied_rules=result["applied_rules"]
         )
 
-        self.reporter.html_logs.append((file_name, full_sql_text, formatted_sql, "\n".join(change_log)))
-        logging.info(f"변환 완료: {output_file} [SQL 유형: {sql_type}, 전환 방법: {conversion_method}], 변경 로그: {log_file.name if log_file else '없음'}")
+        self.processed_count += 1
+        if result.get("rule_profile") and self.transformer.profiler is not None:
+            # 워커 프로세스에서 수집한 규칙 프로파일 합산
+            self.transformer.profiler.merge(result["rule_profile"])
+        if result.get("cache_hit"):
+            self.cache_hit_count += 1
+        if result.get("dedup_hit"):
+            self.dedup_file_count += 1
+        if result.get("statement_dedup"):
+            lookups, hits = result["statement_dedup"]
+            self.statement_lookup_count += lookups
+            self.statement_hit_count += hits
+        if self.rule_index is not None:
+            self.rule_index.update(result["file_path"], result, self.transformer)
+        if self.ddl_advisor is not None and not result.get("dedup_hit"):
+            # 내용이 같은 중복 파일은 대표 파일에서 이미 수집
+            self.ddl_advisor.add_result(result)
+
+        if not getattr(self.config, 'SUMMARY_ONLY', False):
+            self.reporter.add_html_log(file_name, result["original_sql"], result["transformed_sql"],
+                                       result["change_log"])
+        logging.info(f"변환 완료: {result['output_file']} [SQL 유형: {result['sql_type']}, 전환 방법: {result['conversion_method']}], 변경 로그: {log_file.name if log_file else '없음'}")
 
+    def process_sql_file(self, file_path, cache_mode="normal"):
+        self.complete_result(self.transform_sql_file(file_path, cache_mode))
 
-    def process_directory(self, dir_path):
+    def complete_result(self, result):
+        """
+        변환 결과를 저장하고 리포트에 기록합니다. (읽기 실패 시 result 는 None)
+        파일 중복 제거 중이면 입력 순서상 이어지는 같은 내용의 파일도 이 결과를 재사용해 함께 기록합니다.
+        """
+        if result is not None:
+            self.write_outputs(result)
+            self.record_result(result)
+        if self._file_dedup is None:
+            return
+        for index, representative in self._file_dedup.complete(result):
+            if representative is None:
+                continue
+            duplicate = self._reuse_result(self._dedup_paths[index], representative)
+            self.write_outputs(duplicate)
+            self.record_result(duplicate)
+
+    def _reuse_result(self, file_path, representative):
+        # 대표 파일 결과에서 경로별 항목만 다시 계산 (규칙 프로파일/문장 통계는 대표 파일에서 이미 합산)
+        conversion = {key: value for key, value in representative.items()
+                      if key not in ("rule_profile", "statement_dedup")}
+        result = self._build_result(file_path, representative["original_sql"], conversion,
+                                    representative["content_hash"], representative["encoding"])
+        result["dedup_hit"] = True
+        return result
+
+    def _dedup_key(self, file_path):
+        # 내용 해시 + 설정으로 정해진 인코딩 (같은 바이트라도 디렉토리 인코딩 힌트가 다르면 다른 파일로 취급)
+        try:
+            return file_content_hash(file_path), configured_encoding(file_path, self.config)
+        except OSError:
+            return None
+
+    def plan_file_dedup(self, file_paths):
+        """
+        파일 내용 해시로 같은 내용의 파일을 묶어 FileDedupPlan 을 만듭니다. 중복이 없으면 None.
+        """
+        plan = FileDedupPlan([self._dedup_key(file_path) for file_path in file_paths])
+        if not plan.duplicate_count:
+            return None
+        logging.info(f"내용이 같은 파일 {plan.duplicate_count}/{len(file_paths)}개는 변환 결과를 재사용합니다.")
+        return plan
+
+    def _collect_sql_files(self, dir_path):
         if not os.path.isdir(dir_path):
             logging.error(f"유효하지 않은 디렉토리 경로입니다: {dir_path}")
-            return
-        files = list(Path(dir_path).rglob('*.sql'))
+            return []
+        # 병렬/직렬 실행 결과가 같은 순서로 기록되도록 경로 기준으로 정렬합니다.
+        files = [str(file) for file in sorted(Path(dir_path).rglob('*.sql'))]
         if not files:
             logging.info("디렉토리에서 SQL 파일을 찾을 수 없습니다.")
+        return files
+
+    def collect_input_files(self, paths):
+        """
+        파일 / 디렉토리 / glob 패턴 목록을 변환할 SQL 파일 목록으로 펼칩니다. (중복 제거, 경로 순 정렬)
+        디렉토리는 하위의 *.sql 을 모두 포함하고, glob 패턴은 ** 재귀 매칭을 지원합니다.
+        """
+        files = set()
+        for path in paths:
+            if os.path.isdir(path):
+                files.update(self._collect_sql_files(path))
+            elif os.path.isfile(path):
+                files.add(str(Path(path)))
+            else:
+                matches = glob.glob(path, recursive=True)
+                if not matches:
+                    logging.warning(f"입력 경로와 일치하는 파일이 없습니다: {path}")
+                for match in matches:
+                    if os.path.isdir(match):
+                        files.update(self._collect_sql_files(match))
+                    elif os.path.isfile(match):
+                        files.add(str(Path(match)))
+        return sorted(files)
+
+    def process_directory(self, dir_path, workers=None):
+        files = self._collect_sql_files(dir_path)
+        if files:
+            self.process_files(files, workers)
+
+    def process_changed_rules(self, dir_path, workers=None):
+        self.process_changed_rule_files(self._collect_sql_files(dir_path), workers)
+
+    def process_changed_rule_files(self, files, workers=None):
+        """
+        규칙 색인을 이용해 변경된 규칙의 영향을 받는 파일만 다시 변환하고,
+        나머지 파일은 캐시된 결과를 검증 없이 재사용합니다.
+        """
+        if not files:
             return
-        for file in files:
-            self.process_sql_file(str(file))
\ No newline at end of file
+        if self.rule_index is None:
+            logging.warning("규칙 색인이 비활성화되어 전체 파일을 변환합니다. (USE_CACHE/USE_RULE_INDEX 확인)")
+            return self.process_files(files, workers)
+        candidates = self.rule_index.plan_changed_rules(files, self.cache, self._read_text)
+        logging.info(f"규칙 변경 영향 파일: {len(candidates)}/{len(files)}개 (나머지는 캐시 재사용)")
+        cache_modes = ["refresh" if file in candidates else "reuse" for file in files]
+        self.process_files(files, workers, cache_modes)
+
+    @staticmethod
+    def _read_text(file_path, encoding):
+        return "".join(iter_file_lines(file_path, encoding))
+
+    def process_files(self, file_paths, workers=None, cache_modes=None):
+        if cache_modes is None:
+            cache_modes = ["normal"] * len(file_paths)
+        workers = workers or self.config.WORKERS
+        plan = None
+        if getattr(self.config, 'DEDUP_FILES', False) and len(file_paths) > 1:
+            plan = self.plan_file_dedup(file_paths)
+        if plan is not None:
+            # 대표 파일만 변환하고, 중복 파일은 complete_result 에서 입력 순서대로 기록
+            self._file_dedup, self._dedup_paths = plan, file_paths
+            file_paths = [file_paths[index] for index in plan.unique_indices]
+            cache_modes = [cache_modes[index] for index in plan.unique_indices]
+        try:
+            self._run_files(file_paths, workers, cache_modes)
+        finally:
+            self._file_dedup = self._dedup_paths = None
+        self.finish_run()
+
+    def _run_files(self, file_paths, workers, cache_modes):
+        if getattr(self.config, 'USE_PIPELINE', False):
+            from pipeline import FilePipeline  # pipeline 이 이 모듈의 워커 함수를 사용하므로 지연 import
+            FilePipeline(self, transform_workers=workers).run(file_paths, cache_modes)
+        elif workers > 1 and len(file_paths) > 1:
+            self.process_files_parallel(file_paths, workers, cache_modes)
+        else:
+            for file_path, cache_mode in zip(file_paths, cache_modes):
+                self.process_sql_file(file_path, cache_mode)
+
+    def finish_run(self):
+        if self.cache is not None:
+            logging.info(f"변환 캐시 재사용: {self.cache_hit_count}/{self.processed_count}개 파일")
+            self.cache.evict()
+        if self.rule_index is not None:
+            self.rule_index.save()
+
+    def process_files_parallel(self, file_paths, workers, cache_modes):
+        """
+        워커 프로세스 풀에서 파일을 변환하고, 결과 저장과 리포트 기록은
+        입력 순서대로 현재 프로세스에서 수행합니다. (직렬 실행과 동일한 출력 보장)
+        """
+        workers = min(workers, len(file_paths))
+        chunksize = max(1, min(64, len(file_paths) // (workers * 4)))
+        logging.info(f"병렬 변환 시작: 파일 {len(file_paths)}개, 워커 {workers}개")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config, self.transformer.rule_set)
+        ) as executor:
+            for result in executor.map(_transform_in_worker, file_paths, cache_modes, chunksize=chunksize):
+                self.complete_result(result)
+
+
+# 워커 프로세스별 FileProcessor (reporter 없이 변환만 수행)
+_worker_processor = None
+
+
+def _init_worker(config, rule_set):
+    global _worker_processor
+    transformer = SQLTransformer(config, rule_set=rule_set)
+    _worker_processor = FileProcessor(config, transformer, None)
+
+
+def _transform_in_worker(file_path, cache_mode="normal"):
+    return _attach_rule_profile(_worker_processor.transform_sql_file(file_path, cache_mode))
+
+
+def _transform_source_in_worker(file_path, source, cache_mode="normal"):
+    return _attach_rule_profile(_worker_processor.transform_source(file_path, source, cache_mode))
+
+
+def _attach_rule_profile(result):
+    profiler = _worker_processor.transformer.profiler
+    if result is not None and profiler is not None:
+        result["rule_profile"] = profiler.take()
+    return result
@@ -0,0 +1,161 @@
+import re
+from typing import List, Optional, Tuple
+from sql_classifier import protected_spans
+
+# 가려진 구간 하나를 나타내는 문자 (사설 영역: 정규식의 \w, \s, \d, 따옴표와 겹치지 않음)
+# BMP 사설 영역(U+E000~U+F8FF)을 먼저 쓰고 모자라면 보조 사설 영역(U+F0000~)을 사용
+# (보조 평면 문자가 하나라도 있으면 문자열 전체가 4바이트 문자로 저장되어 정규식/translate 가 느려짐)
+PLACEHOLDER_BASE = 0xE000
+_BMP_PLACEHOLDERS = 0xF8FF - PLACEHOLDER_BASE + 1
+_SUPPLEMENTARY_BASE = 0xF0000
+PLACEHOLDER_LIMIT = _BMP_PLACEHOLDERS + (0xFFFFD - _SUPPLEMENTARY_BASE + 1)
+_PLACEHOLDER_RE = re.compile('[\uE000-\uF8FF\U000F0000-\U000FFFFD]')
+# 가려지지 않은 텍스트에 따옴표가 있으면 드러낸 리터럴이거나 규칙 치환으로 새로 생긴 리터럴이므로 다시 가림
+_REMASK_MARKERS = ("'", '"')
+# 구간 안의 줄바꿈과 각 라인 조각 앞뒤 공백은 가리지 않음 (라인 번호, strip 결과 유지)
+_PIECE_RE = re.compile(r'(\s*)(.*?)(\s*)(\r?\n|\Z)', re.S)
+
+
+class LiteralMask:
+    """
+    문자열 리터럴 / 인용 식별자 / 주석 구간을 placeholder 문자 하나씩으로 바꿔 규칙 정규식이 코드 부분만 보게 합니다.
+
+    - 같은 내용의 구간은 같은 placeholder 를 쓰므로 가린 텍스트끼리 비교해도 원문 비교와 결과가 같습니다.
+    - 패턴에 따옴표가 있는 규칙(TO_DATE 형식 문자열 등)은 reveal() 로 완전한 리터럴만 드러낸 텍스트에 적용합니다.
+      여러 라인에 걸치거나 변환 단위 경계에서 잘린 리터럴, 주석은 드러내지 않습니다.
+    - 치환 결과에 새 리터럴이 생기면 remask() 로 다시 가립니다. 규칙이 넣은 주석("-- 수동 변환 필요: ..." 등)은
+      원본 주석이 아니므로 가리지 않습니다. (그 뒤의 코드에도 이후 규칙이 적용됨)
+    """
+
+    __slots__ = ("pieces", "revealable", "_codes", "masked", "has_code")
+
+    def __init__(self):
+        self.pieces = []
+        self.revealable = []
+        self._codes = {}
+        self.masked = ""
+        # 가린 구간 밖에 공백이 아닌 텍스트(코드)가 있는지 (없으면 주석뿐인 단위)
+        self.has_code = True
+
+    @classmethod
+    def build(cls, text: str, spans: List[Tuple[int, int, str]]) -> Optional["LiteralMask"]:
+        """
+        :param text: 변환 단위(라인 또는 문장) 텍스트
+        :param spans: text 기준 (시작, 끝, 종류) 목록. 종류가 'partial' 이면 단위 경계에서 잘린 구간
+        :return: LiteralMask (가릴 구간이 없거나 placeholder 를 만들 수 없으면 None)
+        """
+        if not spans or _PLACEHOLDER_RE.search(text):
+            return None
+        mask = cls()
+        masked = mask._mask(text, spans)
+        if masked is None:
+            return None
+        mask.masked = masked
+        cursor = 0
+        has_code = False
+        for start, end, _ in spans:
+            if text[cursor:start].strip():
+                has_code = True
+                break
+            cursor = end
+        mask.has_code = has_code or bool(text[cursor:].strip())
+        return mask
+
+    def _code(self, piece: str, revealable: bool) -> Optional[str]:
+        key = (piece, revealable)
+        code = self._codes.get(key)
+        if code is None:
+            if len(self.pieces) >= PLACEHOLDER_LIMIT:
+                return None
+            index = len(self.pieces)
+            code = chr(PLACEHOLDER_BASE + index if index < _BMP_PLACEHOLDERS
+                       else _SUPPLEMENTARY_BASE + index - _BMP_PLACEHOLDERS)
+            self._codes[key] = code
+            self.pieces.append(piece)
+            self.revealable.append(revealable)
+        return code
+
+    def _mask(self, text: str, spans) -> Optional[str]:
+        parts = []
+        cursor = 0
+        for start, end, kind in spans:
+            parts.append(text[cursor:start])
+            segment = text[start:end]
+            single = '\n' not in segment
+            for m in _PIECE_RE.finditer(segment):
+                lead, core, trail, newline = m.groups()
+                if not (lead or core or trail or newline):
+                    break
+                parts.append(lead)
+                if _PLACEHOLDER_RE.search(core):
+                    # 치환으로 생긴 리터럴이 이미 가려진 구간을 감싼 경우 원문으로 풀어서 한 구간으로 가림
+                    core = self.unmask(core)
+                if core:
+                    code = self._code(core, single and kind in ('string', 'identifier'))
+                    if code is None:
+                        return None
+                    parts.append(code)
+                parts.append(trail + newline)
+            cursor = end
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+    @property
+    def has_revealable(self) -> bool:
+        return any(self.revealable)
+
+    @property
+    def skippable(self) -> bool:
+        """코드도 드러낼 리터럴도 없어 규칙을 적용할 필요가 없는 단위인지 (주석만 있는 라인 등)"""
+        return not self.has_code and not self.has_revealable
+
+    def unmask(self, text: str) -> str:
+        pieces = self.pieces
+        return _PLACEHOLDER_RE.sub(lambda m: pieces[_index(m.group())], text)
+
+    def reveal(self, text: str) -> str:
+        """완전한 문자열 리터럴/인용 식별자만 원문으로 되돌립니다. (주석은 가린 채 유지)"""
+        pieces, revealable = self.pieces, self.revealable
+
+        def restore(m):
+            index = _index(m.group())
+            return pieces[index] if revealable[index] else m.group()
+
+        return _PLACEHOLDER_RE.sub(restore, text)
+
+    def remask(self, text: str) -> str:
+        """드러난 리터럴(reveal 결과 또는 치환으로 새로 생긴 리터럴)을 다시 가립니다."""
+        if not any(marker in text for marker in _REMASK_MARKERS):
+            return text
+        # 원본 주석은 가려진 상태이므로 여기서 찾은 주석은 규칙이 넣은 것 (렉싱에만 사용)
+        spans = [span for span in protected_spans(text) if span[2] != 'comment']
+        masked = self._mask(text, spans)
+        # placeholder 가 부족하면 드러난 채로 둠 (해당 단위의 이후 규칙은 리터럴도 봄)
+        return text if masked is None else masked
+
+
+def _index(code: str) -> int:
+    point = ord(code)
+    if point < _SUPPLEMENTARY_BASE:
+        return point - PLACEHOLDER_BASE
+    return point - _SUPPLEMENTARY_BASE + _BMP_PLACEHOLDERS
+
+
+def unit_spans(spans, span_index: int, unit_start: int, unit_end: int) -> Tuple[List[Tuple[int, int, str]], int]:
+    """
+    파일 전체 기준 구간 목록에서 [unit_start, unit_end) 변환 단위에 걸친 구간을 단위 기준 위치로 잘라 반환합니다.
+    단위를 순서대로 넘기면 span_index 를 이어서 사용해 전체를 한 번만 훑습니다.
+
+    :return: (단위 기준 구간 목록, 다음 단위에서 사용할 span_index)
+    """
+    while span_index < len(spans) and spans[span_index][1] <= unit_start:
+        span_index += 1
+    local = []
+    index = span_index
+    while index < len(spans) and spans[index][0] < unit_end:
+        start, end, kind = spans[index]
+        clipped = start < unit_start or end > unit_end
+        local.append((max(start, unit_start) - unit_start, min(end, unit_end) - unit_start,
+                      'partial' if clipped else kind))
+        index += 1
+    return local, span_index
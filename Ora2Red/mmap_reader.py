@@ -0,0 +1,272 @@
+import codecs
+import mmap
+import os
+import re
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+# 한 번에 복사/디코딩하는 구간 크기 (라인 경계에서 자르므로 긴 라인이 있으면 더 커질 수 있음)
+BLOCK_SIZE = 1024 * 1024
+# 바이트만 보고 line 모드 결과를 알 수 없어 디코딩해야 하는 라인의 표시
+# - ASCII 가 아닌 바이트 (대문자 변환 시 앵커가 생길 수 있는 ſ, ı 등과 유니코드 공백/줄 구분 문자 포함)
+# - str.splitlines / strip 이 줄 구분 또는 공백으로 취급하는 제어 문자 (\x0b \x0c \x1c-\x1f)
+# - '\n' 이 뒤따르지 않는 '\r' (단독 줄 구분)
+_DECODE_BYTES = rb"[\x0b\x0c\x1c-\x1f\x80-\xff]|\r(?!\n)"
+# 앵커가 없는 규칙은 모든 라인에서 실행해야 하므로 모든 위치와 매치
+_EVERY_LINE = re.compile(b"")
+# 내용이 있는 라인의 줄 끝 공백 (apply_transformations 의 strip 결과와 같게 제거, 공백뿐인 라인은 유지)
+_TRAILING_SPACE_RE = re.compile(rb"(?<=[^ \t\r\n])[ \t\r]+(?=\n)")
+# 디코딩하지 않는 블록에서 공백이 아닌 문자 (블록에는 \x0b \x0c \x1c-\x1f 가 없음)
+_CONTENT_RE = re.compile(rb"[^ \t\r\n]")
+
+
+@lru_cache(maxsize=None)
+def mapped_codec(encoding: str) -> Optional[str]:
+    """
+    메모리 매핑 경로로 읽을 수 있는 인코딩이면 정규화된 코덱 이름을, 아니면 None 을 반환합니다.
+    UTF-8 과 ASCII 호환 단일 바이트 인코딩(latin-1, cp1252 등)만 지원합니다.
+    (ASCII 바이트가 항상 같은 ASCII 문자이고 '\\n' 바이트가 줄바꿈에만 쓰여 바이트 단위로 라인을 나눌 수 있음)
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except (LookupError, TypeError):
+        return None
+    if name in ('utf-8', 'utf-8-sig'):
+        return name
+    table = bytes(range(256))
+    try:
+        decoded = table.decode(name, errors='replace')
+        single = ''.join(table[i:i + 1].decode(name, errors='replace') for i in range(256))
+    except (LookupError, UnicodeError):
+        return None
+    # 바이트마다 따로 디코딩한 결과와 같아야 단일 바이트 인코딩 (cp949 등 멀티바이트 인코딩 제외)
+    if decoded != single or decoded[:128] != table[:128].decode('ascii'):
+        return None
+    return name
+
+
+def build_line_gate(anchor_sets: List[Optional[Tuple[str, ...]]]):
+    """
+    규칙 앵커(ASCII 대소문자 무시) 또는 디코딩이 필요한 바이트가 있는 위치를 찾는 바이트 정규식을 만듭니다.
+    매치가 없는 라인은 어떤 규칙의 앵커도 없으므로 line 모드에서도 규칙이 실행되지 않습니다.
+    앵커가 없는 규칙이 있으면 모든 라인과 매치하는 정규식을 반환합니다.
+    """
+    if any(anchors is None for anchors in anchor_sets):
+        return _EVERY_LINE
+    # 앵커는 ASCII 대문자이며, ASCII 가 아닌 앵커는 디코딩할 라인에만 있을 수 있음
+    anchors = sorted({a for alts in anchor_sets for a in alts if a.isascii()}, key=len, reverse=True)
+    if not anchors:
+        return re.compile(_DECODE_BYTES)
+    return re.compile(b"(?i:" + b"|".join(re.escape(a.encode('ascii')) for a in anchors) + b")|" + _DECODE_BYTES)
+
+
+def strip_block(block: bytes) -> bytes:
+    """디코딩하지 않아도 되는 라인 블록('\\n' 으로 끝남)의 줄 끝 공백을 제거합니다."""
+    return _TRAILING_SPACE_RE.sub(b"", block)
+
+
+class KeywordScan:
+    """
+    텍스트를 대문자로 바꿨을 때 키워드 중 하나가 포함되는지 조각 단위로 확인합니다. (determine_sql_type 용)
+    키워드에 줄바꿈이 없으므로 라인 경계에서 나뉜 조각을 각각 확인해도 전체 텍스트와 결과가 같습니다.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self.found = False
+        self._bytes_re = re.compile(b"|".join(re.escape(k.encode('ascii')) for k in self.keywords), re.I)
+
+    def feed_bytes(self, block: bytes):
+        """ASCII 블록 (ASCII 는 대소문자 무시 비교가 upper() 비교와 같음)"""
+        if not self.found and self._bytes_re.search(block):
+            self.found = True
+
+    def feed_text(self, text: str):
+        if not self.found:
+            upper = text.upper()
+            self.found = any(keyword in upper for keyword in self.keywords)
+
+
+class ChangeTracker:
+    """
+    원본과 변환 결과를 라인 순서대로 비교해 리포트의 변경 여부(원본.strip() != 변환.strip())를 계산합니다.
+    파일 앞뒤 공백은 비교하지 않으므로, 공백만 다른 위치는 그 앞과 뒤에 모두 내용이 있을 때만 변경으로 봅니다.
+    """
+
+    def __init__(self):
+        self.changed = False
+        self._seen_content = False
+        # 내용 뒤에 공백만 다른 위치가 있었음 (뒤에 내용이 나오면 변경)
+        self._pending = False
+
+    def line(self, original: str, transformed: str):
+        """
+        :param original: 줄바꿈을 포함한 원본 라인
+        :param transformed: 줄바꿈 없는 변환 라인 (라인 사이는 '\\n' 으로 구분)
+        """
+        if self.changed:
+            return
+        content = original.strip()
+        if content:
+            if self._pending:
+                self.changed = True
+                return
+            self._seen_content = True
+        if content != transformed.strip():
+            self.changed = True
+        elif self._seen_content and transformed + "\n" != original:
+            self._pending = True
+
+    def block(self, original: bytes, transformed: bytes):
+        """디코딩하지 않은 ASCII 라인 블록 ('\\n' 으로 끝남, strip_block 결과와 비교)"""
+        if self.changed:
+            return
+        content = _CONTENT_RE.search(original)
+        if content is None:
+            return
+        if self._pending:
+            self.changed = True
+            return
+        self._seen_content = True
+        if original != transformed:
+            # 줄 끝 공백만 다르므로 첫 차이 뒤에 내용이 있으면 변경, 없으면 다음 내용을 기다림
+            first = _TRAILING_SPACE_RE.search(original)
+            if _CONTENT_RE.search(original, first.end()):
+                self.changed = True
+            else:
+                self._pending = True
+
+
+class MappedSQLFile:
+    """
+    SQL 파일을 읽기 전용으로 메모리 매핑하여 바이트 단위로 라인을 훑습니다. (mapped_codec 이 지원하는 인코딩)
+    필요한 구간만 복사/디코딩하므로 파일 크기와 무관하게 일정한 메모리로 읽을 수 있습니다.
+    디코딩 결과는 iter_file_lines(errors="replace") 와 같습니다.
+    """
+
+    def __init__(self, file_path, encoding: str):
+        codec = mapped_codec(encoding)
+        if codec is None:
+            raise ValueError(f"메모리 매핑으로 읽을 수 없는 인코딩입니다: {encoding}")
+        self._file = open(file_path, 'rb')
+        try:
+            self.size = os.fstat(self._file.fileno()).st_size
+            # 크기가 0 인 파일은 매핑할 수 없음
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        except Exception:
+            self._file.close()
+            raise
+        if self.size and hasattr(self._map, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        # utf-8-sig 는 파일 앞의 BOM 만 건너뛰고 나머지는 UTF-8 로 디코딩
+        self.start = len(codecs.BOM_UTF8) if codec == 'utf-8-sig' and self._map[:3] == codecs.BOM_UTF8 else 0
+        self.codec = 'utf-8' if codec == 'utf-8-sig' else codec
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def decode(self, data: bytes) -> str:
+        return data.decode(self.codec, errors='replace')
+
+    def _block_end(self, pos: int, limit: int, block_size: int) -> int:
+        # [pos, limit) 안에서 block_size 근처의 라인 경계 (limit 는 라인 경계)
+        if limit - pos <= block_size:
+            return limit
+        end = self._map.rfind(b"\n", pos, pos + block_size) + 1
+        if end:
+            return end
+        return self._map.find(b"\n", pos + block_size, limit) + 1 or limit
+
+    def iter_blocks(self, gate, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[bool, bytes]]:
+        """
+        파일을 처음부터 (디코딩 필요 여부, 바이트) 조각으로 나눠 순서대로 생성합니다.
+
+        - (True, 라인): gate 가 매치된 라인 하나 ('\\n' 기준, 디코딩 후 규칙 적용 대상)
+        - (False, 블록): gate 가 매치되지 않은 연속 라인 (ASCII 만 포함, block_size 근처에서 라인 경계로 나눔)
+        """
+        data, end = self._map, self.size
+        pos = self.start
+        while pos < end:
+            m = gate.search(data, pos)
+            if m is None:
+                flagged = line_start = end
+            else:
+                flagged = m.start()
+                line_start = data.rfind(b"\n", pos, flagged) + 1 or pos
+            while pos < line_start:
+                stop = self._block_end(pos, line_start, block_size)
+                yield False, data[pos:stop]
+                pos = stop
+            if m is None:
+                return
+            line_end = data.find(b"\n", flagged) + 1 or end
+            yield True, data[line_start:line_end]
+            pos = line_end
+
+    def iter_text(self, block_size: int = BLOCK_SIZE) -> Iterator[str]:
+        """파일 전체를 라인 경계에서 나눈 block_size 근처 크기의 디코딩된 조각으로 생성합니다."""
+        pos = self.start
+        while pos < self.size:
+            stop = self._block_end(pos, self.size, block_size)
+            yield self.decode(self._map[pos:stop])
+            pos = stop
+
+    def head_lines(self, count: int) -> List[str]:
+        """앞부분 count 라인 (줄바꿈 포함, 리포트 발췌용)"""
+        stop = self.start
+        for _ in range(count):
+            stop = self._map.find(b"\n", stop) + 1 or self.size
+            if stop >= self.size:
+                break
+        return self.decode(self._map[self.start:stop]).splitlines(keepends=True)[:count]
+
+
+class StreamedOutput:
+    """
+    변환 결과 라인을 파일에 바로 기록합니다. (write_outputs 와 같이 UTF-8 텍스트 모드)
+    라인은 '\\n' 으로 구분하고 마지막 라인 뒤에는 줄바꿈을 쓰지 않아 "\\n".join(라인 목록) 과 같은 내용이 됩니다.
+    앞부분 head_count 라인은 리포트 발췌용으로 보관합니다.
+    """
+
+    def __init__(self, path, head_count: int = 0):
+        # path 가 None 이면 (DRY_RUN) 기록하지 않고 발췌만 보관
+        self._file = open(path if path is not None else os.devnull, 'w', encoding='utf-8')
+        self._separator = ""
+        self.head_count = head_count
+        self.head = []
+
+    def write_line(self, line: str):
+        """줄바꿈 없는 라인 하나"""
+        self._file.write(self._separator)
+        self._file.write(line)
+        self._separator = "\n"
+        if len(self.head) < self.head_count:
+            self.head.append(line)
+
+    def write_block(self, block: str):
+        """'\\n' 으로 끝나는 여러 라인"""
+        if not block:
+            return
+        self._file.write(self._separator)
+        self._file.write(block[:-1])
+        self._separator = "\n"
+        needed = self.head_count - len(self.head)
+        if needed > 0:
+            self.head.extend(block[:-1].split("\n", needed)[:needed])
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from file_processor import _init_worker, _transform_source_in_worker
+
+# 큐 종료 표시
+_DONE = object()
+
+
+class FilePipeline:
+    """
+    읽기 → 변환 → 쓰기 단계를 크기가 제한된 asyncio 큐로 연결해 동시에 실행합니다.
+
+    - 읽기: readers 개 스레드가 파일을 미리 읽고 디코딩합니다. (NFS 등 I/O 대기 시간을 겹침)
+    - 변환: transform_workers 가 1 이면 이벤트 루프 스레드에서, 2 이상이면 워커 프로세스 풀에서 규칙을 적용합니다.
+      (RULE_TIMEOUT_MS 의 SIGALRM 타이머가 동작하도록 단일 변환은 메인 스레드에서 실행)
+    - 쓰기: 변환 결과를 입력 순서대로 모아 write_batch_size 개씩 별도 스레드에서 저장하고 리포트에 기록합니다.
+      (기록 순서가 직렬 실행과 같도록 쓰기 단계는 하나)
+
+    동시에 처리 중인 파일 수는 queue_size 로 제한되므로 메모리 사용량은 파일 수와 무관합니다.
+    """
+
+    def __init__(self, processor, transform_workers=1, readers=None, queue_size=None, write_batch_size=None):
+        config = processor.config
+        self.processor = processor
+        self.transform_workers = max(1, transform_workers or 1)
+        self.readers = max(1, readers or getattr(config, 'PIPELINE_READERS', 4))
+        self.queue_size = max(1, queue_size or getattr(config, 'PIPELINE_QUEUE_SIZE', 32))
+        self.write_batch_size = max(1, write_batch_size or getattr(config, 'PIPELINE_WRITE_BATCH_SIZE', 16))
+
+    def run(self, file_paths, cache_modes=None):
+        if cache_modes is None:
+            cache_modes = ["normal"] * len(file_paths)
+        logging.info(f"파이프라인 변환 시작: 파일 {len(file_paths)}개, 읽기 {self.readers}개, "
+                     f"변환 {self.transform_workers}개, 큐 {self.queue_size}")
+        asyncio.run(self._run(list(zip(file_paths, cache_modes))))
+
+    async def _run(self, jobs):
+        loop = asyncio.get_running_loop()
+        read_queue = asyncio.Queue(self.queue_size)
+        write_queue = asyncio.Queue(self.queue_size)
+        # 쓰기 단계가 처리하기 전까지 읽기 단계가 앞서 나갈 수 있는 파일 수
+        in_flight = asyncio.Semaphore(self.queue_size * 2)
+        pending = iter(enumerate(jobs))
+
+        read_pool = ThreadPoolExecutor(self.readers, thread_name_prefix="ora2red-read")
+        write_pool = ThreadPoolExecutor(1, thread_name_prefix="ora2red-write")
+        transform_pool = None
+        if self.transform_workers > 1:
+            transform_pool = ProcessPoolExecutor(
+                max_workers=self.transform_workers,
+                initializer=_init_worker,
+                initargs=(self.processor.config, self.processor.transformer.rule_set)
+            )
+
+        async def read_stage():
+            for index, (file_path, cache_mode) in pending:
+                await in_flight.acquire()
+                source = await loop.run_in_executor(read_pool, self.processor.read_source, file_path)
+                await read_queue.put((index, file_path, cache_mode, source))
+
+        async def transform_stage():
+            while True:
+                item = await read_queue.get()
+                if item is _DONE:
+                    return
+                index, file_path, cache_mode, source = item
+                if transform_pool is None:
+                    result = self.processor.transform_source(file_path, source, cache_mode)
+                    # 변환 중 쌓인 읽기/쓰기 완료 처리를 위해 루프에 제어를 넘김
+                    await asyncio.sleep(0)
+                else:
+                    result = await loop.run_in_executor(
+                        transform_pool, _transform_source_in_worker, file_path, source, cache_mode)
+                await write_queue.put((index, result))
+
+        async def write_stage():
+            # 입력 순서대로 기록하기 위해 먼저 끝난 결과는 next_index 가 될 때까지 보관
+            buffered = {}
+            next_index = 0
+            while True:
+                item = await write_queue.get()
+                if item is _DONE:
+                    break
+                buffered[item[0]] = item[1]
+                batch = []
+                while next_index in buffered:
+                    batch.append(buffered.pop(next_index))
+                    next_index += 1
+                    if len(batch) >= self.write_batch_size:
+                        await loop.run_in_executor(write_pool, self._write_batch, batch)
+                        batch = []
+                if batch:
+                    await loop.run_in_executor(write_pool, self._write_batch, batch)
+            if buffered:
+                raise RuntimeError(f"파이프라인 결과 {len(buffered)}개가 기록되지 않았습니다.")
+
+        async def close_stages():
+            # 앞 단계가 모두 끝나면 다음 단계에 종료 표시를 보냄
+            await asyncio.gather(*readers)
+            for _ in transformers:
+                await read_queue.put(_DONE)
+            await asyncio.gather(*transformers)
+            await write_queue.put(_DONE)
+
+        self._loop = loop
+        self._in_flight = in_flight
+        readers = [asyncio.create_task(read_stage()) for _ in range(self.readers)]
+        transformers = [asyncio.create_task(transform_stage()) for _ in range(self.transform_workers)]
+        tasks = readers + transformers + [asyncio.create_task(write_stage()), asyncio.create_task(close_stages())]
+        try:
+            # 어느 단계에서든 예외가 나면 즉시 전파하고 나머지 단계는 취소
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            read_pool.shutdown(wait=True)
+            write_pool.shutdown(wait=True)
+            if transform_pool is not None:
+                transform_pool.shutdown(wait=True, cancel_futures=True)
+
+    def _write_batch(self, batch):
+        # 쓰기 스레드: 변환 SQL / 변경 로그 저장 후 리포트 기록 (입력 순서 유지)
+        for result in batch:
+            self.processor.complete_result(result)
+            self._loop.call_soon_threadsafe(self._in_flight.release)
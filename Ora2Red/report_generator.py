@@ -1,15 +1,43 @@
 import os
+import csv
+import json
 import difflib
 from difflib import ndiff
 from jinja2 import Environment, FileSystemLoader
-import pandas as pd
 import datetime
+from results_store import ResultsStore
+from results_db import ResultsDatabase
+from diff_engine import select_algorithm, render_fast_diff
+from change_record import to_rows, render_change_log_html
+
+# 리포트 요약 컬럼과 CSV 한글 컬럼명
+SUMMARY_COLUMNS = ['file_name', 'transformed_file', 'log_file', 'changed', 'manual_required', 'reason', 'category']
+CSV_COLUMN_MAP = {
+    "file_name": "원본 파일명",
+    "transformed_file": "변환된 파일",
+    "log_file": "로그 파일",
+    "changed": "변경 여부",
+    "manual_required": "수동 검토 필요",
+    "reason": "수동 검토 사유",
+    "category": "SQL 유형"
+}
 
 class ReportGenerator:
     def __init__(self, config):
         self.config = config
         self.csv_results = []
         self.html_logs = []
+        # STREAM_RESULTS 이면 결과를 메모리 대신 JSON Lines 저장소에 기록
+        # HTML 리포트 사이드바에 추가할 섹션 [{"title": ..., "html": ...}] (규칙 프로파일 등)
+        self.report_sections = []
+        self.store = None
+        if not isinstance(config, dict) and getattr(config, 'STREAM_RESULTS', False):
+            self.store = ResultsStore(config.REPORT_DIR / config.RESULTS_STORE_NAME)
+
+    def close(self):
+        """결과 저장소 파일을 닫습니다. (저장소를 사용하지 않으면 아무것도 하지 않음)"""
+        if self.store is not None:
+            self.store.close()
 
     def add_execution_result(self, file_name, original_sql, transformed_sql,
                              execution_time, error=None, plan="", rows="", cpu_time="", applied_rules=None):
@@ -21,7 +49,7 @@ class ReportGenerator:
         transformed_file = file_name
         log_file = ''
 
-        self.csv_results.append({
+        row = {
             "file_name": file_name,
             "transformed_file": transformed_file,
             "log_file": log_file,
@@ -30,7 +58,43 @@ class ReportGenerator:
             "reason": reason,
             "category": category,
             "applied_rules": ", ".join(applied_rules or [])
-        })
+        }
+        if self.store is not None:
+            self.store.add_result(row)
+        else:
+            self.csv_results.append(row)
+
+    def add_html_log(self, file_name, original_sql, transformed_sql, change_log):
+        # 변경 기록은 행 목록으로 보관하고 HTML 은 리포트 생성 시 렌더링
+        if not isinstance(change_log, str):
+            change_log = to_rows(change_log)
+        if self.store is not None:
+            self.store.add_log(file_name, original_sql, transformed_sql, change_log)
+        else:
+            self.html_logs.append((file_name, original_sql, transformed_sql, change_log))
+
+    def add_report_section(self, title, html):
+        """HTML 리포트에 별도 섹션(사이드바 버튼으로 표시)을 추가합니다."""
+        self.report_sections.append({"title": title, "html": html})
+
+    def iter_results(self):
+        """리포트 요약 행을 순서대로 반환합니다. (저장소 사용 시 디스크에서 스트리밍)"""
+        if self.store is not None:
+            return self.store.iter_results()
+        return iter(self.csv_results)
+
+    def iter_logs(self):
+        """(파일명, 원본 SQL, 변환 SQL, 변경 로그) 를 순서대로 반환합니다."""
+        if self.store is not None:
+            return self.store.iter_logs()
+        return iter(self.html_logs)
+
+    def _log_lookup(self):
+        # 파일명 → 로그 조회 함수 (저장소 사용 시 오프셋으로 한 건씩 읽음)
+        if self.store is not None:
+            return self.store.get_log
+        logs_by_file = {log[0]: log for log in self.html_logs}
+        return logs_by_file.get
 
     def _get_config_value(self, key):
         if isinstance(self.config, dict):
@@ -42,6 +106,18 @@ class ReportGenerator:
                 return self.config.HTML_REPORT_NAME
             elif key == 'csv_name':
                 return self.config.CSV_REPORT_NAME
+            elif key == 'html_report_mode':
+                return getattr(self.config, 'HTML_REPORT_MODE', None)
+            elif key == 'html_chunk_size':
+                return getattr(self.config, 'HTML_REPORT_CHUNK_SIZE', None)
+            elif key == 'html_inline_max_files':
+                return getattr(self.config, 'HTML_REPORT_INLINE_MAX_FILES', None)
+            elif key == 'diff_algorithm':
+                return getattr(self.config, 'DIFF_ALGORITHM', None)
+            elif key == 'diff_full_render_max_lines':
+                return getattr(self.config, 'DIFF_FULL_RENDER_MAX_LINES', None)
+            elif key == 'diff_context_lines':
+                return getattr(self.config, 'DIFF_CONTEXT_LINES', None)
             else:
                 return None
 
@@ -56,31 +132,33 @@ class ReportGenerator:
         csv_base = os.path.join(output_dir, self._get_config_value('csv_name'))
         csv_path = self._generate_unique_filename(csv_base)
 
-        # 한글 컬럼명 정의
-        column_map = {
-            "file_name": "원본 파일명",
-            "transformed_file": "변환된 파일",
-            "log_file": "로그 파일",
-            "changed": "변경 여부",
-            "manual_required": "수동 검토 필요",
-            "reason": "수동 검토 사유",
-            "category": "SQL 유형"
-        }
-
-        summary_columns = ['file_name', 'transformed_file', 'log_file', 'changed', 'manual_required', 'reason', 'category']
-        df = pd.DataFrame(self.csv_results, columns=column_map.keys())
-        df.rename(columns=column_map, inplace=True)
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+        # pandas 없이 한 행씩 기록 (pandas to_csv 와 같은 형식: QUOTE_MINIMAL, os.linesep 줄바꿈)
+        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(CSV_COLUMN_MAP.values())
+            for row in self.iter_results():
+                writer.writerow([row.get(column, '') for column in CSV_COLUMN_MAP])
         # CSV 파일 마지막 줄에 검증 방법 요약 주석 추가
         with open(csv_path, 'a', encoding='utf-8-sig') as f:
             f.write("\n# 검증 방법: SQL AST 파싱 및 SQLite EXPLAIN을 사용하여 쿼리의 문법 및 최소 실행 계획 여부를 검증함.")
         print(f"CSV 리포트 생성: {csv_path}")
-        return df
+        return csv_path
 
     def save_csv_summary(self, df, output_dir):
         # 외부에서 호출 시 generate_csv() 대신 사용
         return self.generate_csv()
 
+    def to_dataframe(self, korean_columns=False):
+        """
+        리포트 요약 결과를 pandas DataFrame 으로 반환합니다.
+        pandas 는 이 메서드를 호출할 때만 import 합니다. (리포트 생성에는 필요 없음)
+        """
+        import pandas as pd
+        df = pd.DataFrame(list(self.iter_results()), columns=list(CSV_COLUMN_MAP))
+        if korean_columns:
+            df = df.rename(columns=CSV_COLUMN_MAP)
+        return df
+
     def generate_custom_line_diff(self, original_sql, transformed_sql, is_manual=False):
         orig_lines = original_sql.splitlines()
         trans_lines = transformed_sql.splitlines()
@@ -144,37 +222,104 @@ class ReportGenerator:
             f"  {line[2:]}" for line in diff
         ])
 
-    def generate_html_report(self, results, output_dir, use_custom_diff=True, use_word_level=False, use_ndiff=False):
+    def _render_diff(self, original_sql, transformed_sql, is_manual,
+                     use_custom_diff=True, use_word_level=False, use_ndiff=False, change_log=None):
+        if original_sql.strip() == transformed_sql.strip():
+            return "<div style='padding:10px;'>변경 없음</div>"
+        # 큰 파일은 변경된 hunk 만 렌더링 (라인 수가 같으면 위치 비교, 다르면 Myers)
+        algorithm = self._get_config_value('diff_algorithm') or 'auto'
+        if algorithm == 'auto':
+            algorithm = select_algorithm(len(original_sql.splitlines()), len(transformed_sql.splitlines()),
+                                         self._get_config_value('diff_full_render_max_lines') or 2000)
+        if algorithm != 'full':
+            context = self._get_config_value('diff_context_lines')
+            return render_fast_diff(original_sql, transformed_sql, is_manual, change_log=change_log,
+                                    algorithm=algorithm, context=3 if context is None else context)
+        if use_word_level:
+            return self.generate_word_level_diff(original_sql, transformed_sql, is_manual=is_manual)
+        if use_ndiff:
+            return self.diff_lines(original_sql, transformed_sql)
+        if use_custom_diff:
+            return self.generate_custom_line_diff(original_sql, transformed_sql, is_manual=is_manual)
+        html_diff_obj = difflib.HtmlDiff(wrapcolumn=80)
+        return html_diff_obj.make_table(original_sql.splitlines(), transformed_sql.splitlines(),
+                                        fromdesc="원본", todesc="변경", context=True, numlines=3)
+
+    def _report_mode(self, file_count):
+        mode = self._get_config_value('html_report_mode') or 'inline'
+        if mode == 'auto':
+            limit = self._get_config_value('html_inline_max_files') or 500
+            return 'sharded' if file_count > limit else 'inline'
+        return mode
+
+    def _write_detail_chunks(self, rows, detail_path, chunk_size, use_custom_diff, use_word_level, use_ndiff):
+        """
+        파일별 diff / 변경 로그를 chunk_size 개씩 묶어 detail_path/chunk_NNNNN.js 로 저장합니다.
+        한 번에 한 청크만 메모리에 만들므로 리포트 생성 메모리는 청크 크기에 비례합니다.
+        """
+        os.makedirs(detail_path, exist_ok=True)
+        get_log = self._log_lookup()
+        for chunk_index, start in enumerate(range(0, len(rows), chunk_size)):
+            details = []
+            for row in rows[start:start + chunk_size]:
+                log = get_log(row['file_name'])
+                if log is None:
+                    details.append({"diff": "", "change_log": ""})
+                    continue
+                _, original_sql, transformed_sql, change_log = log
+                details.append({
+                    "diff": self._render_diff(original_sql, transformed_sql, row['manual_required'] == 'O',
+                                              use_custom_diff, use_word_level, use_ndiff, change_log),
+                    "change_log": render_change_log_html(change_log)
+                })
+            # <script> 로 불러오므로 (file:// 에서도 동작) JSONP 형태로 저장
+            payload = json.dumps(details, ensure_ascii=False)
+            payload = payload.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+            chunk_file = os.path.join(detail_path, f"chunk_{chunk_index:05d}.js")
+            with open(chunk_file, 'w', encoding='utf-8') as f:
+                f.write(f"reportChunkLoaded({chunk_index}, {payload});\n")
+
+    def generate_html_report(self, results, output_dir, use_custom_diff=True, use_word_level=False, use_ndiff=False,
+                             mode=None):
+        """
+        HTML 리포트를 생성합니다.
+
+        mode 가 'inline' 이면 모든 파일의 diff / 변경 로그를 한 페이지에 포함하고,
+        'sharded' 이면 요약만 담은 인덱스 페이지와 청크 단위 상세 파일(<리포트명>_details/)을 만들어
+        파일을 클릭할 때 해당 청크만 불러옵니다. None 이면 Config.HTML_REPORT_MODE 를 따릅니다.
+        """
 
         os.makedirs(output_dir, exist_ok=True)
-        summary_columns = ['file_name', 'transformed_file', 'log_file', 'changed', 'manual_required', 'reason', 'category']
-        df = pd.DataFrame(results, columns=summary_columns)
-        manual_dict = {r['file_name']: r['manual_required'] for r in df.to_dict(orient='records')}
-        diff_dict = {}
-        change_log_dict = {}
-        for log in self.html_logs:
-            file_name, original_sql, transformed_sql, change_log = log
-            is_manual = (manual_dict.get(file_name, '') == 'O')
-            if original_sql.strip() == transformed_sql.strip():
-                diff_html = "<div style='padding:10px;'>변경 없음</div>"
-            else:
-                if use_word_level:
-                    diff_html = self.generate_word_level_diff(original_sql, transformed_sql, is_manual=is_manual)
-                elif use_ndiff:
-                    diff_html = self.diff_lines(original_sql, transformed_sql)
-                elif use_custom_diff:
-                    diff_html = self.generate_custom_line_diff(original_sql, transformed_sql, is_manual=is_manual)
-                else:
-                    html_diff_obj = difflib.HtmlDiff(wrapcolumn=80)
-                    diff_html = html_diff_obj.make_table(original_sql.splitlines(), transformed_sql.splitlines(),
-                                                        fromdesc="원본", todesc="변경", context=True, numlines=3)
-            diff_dict[file_name] = diff_html
-            change_log_dict[file_name] = change_log
-        df['diff'] = df['file_name'].map(lambda fn: diff_dict.get(fn, ""))
-        df['change_log'] = df['file_name'].map(lambda fn: change_log_dict.get(fn, ""))
-        total_files = len(df)
-        changed_files = df[df['changed'] == 'O'].shape[0]
-        manual_files = df[df['manual_required'] == 'O'].shape[0]
+        rows = []
+        changed_files = 0
+        manual_files = 0
+        for result in results:
+            rows.append({column: result.get(column, '') for column in SUMMARY_COLUMNS})
+            changed_files += result.get('changed') == 'O'
+            manual_files += result.get('manual_required') == 'O'
+        mode = mode or self._report_mode(len(rows))
+        html_base = os.path.join(self._get_config_value('output_dir'), self._get_config_value('html_name'))
+        html_path = self._generate_unique_filename(html_base)
+        detail_dir = None
+        chunk_size = max(1, self._get_config_value('html_chunk_size') or 200)
+        if mode == 'sharded':
+            detail_dir = os.path.splitext(os.path.basename(html_path))[0] + "_details"
+            self._write_detail_chunks(rows, os.path.join(os.path.dirname(html_path), detail_dir),
+                                      chunk_size, use_custom_diff, use_word_level, use_ndiff)
+        else:
+            manual_dict = {r['file_name']: r['manual_required'] for r in rows}
+            diff_dict = {}
+            change_log_dict = {}
+            for log in self.iter_logs():
+                file_name, original_sql, transformed_sql, change_log = log
+                is_manual = (manual_dict.get(file_name, '') == 'O')
+                diff_dict[file_name] = self._render_diff(original_sql, transformed_sql, is_manual,
+                                                         use_custom_diff, use_word_level, use_ndiff, change_log)
+                change_log_dict[file_name] = render_change_log_html(change_log)
+            for row in rows:
+                row['diff'] = diff_dict.get(row['file_name'], "")
+                row['change_log'] = change_log_dict.get(row['file_name'], "")
+        total_files = len(rows)
         global_summary = f"총 파일 수: {total_files}, 변경된 파일 수: {changed_files}, 수동 검토 필요: {manual_files}"
         
         env = Environment(loader=FileSystemLoader(searchpath="."))
@@ -233,6 +378,9 @@ class ReportGenerator:
             <button class="filter-btn" data-filter="auto_modified">수정 완료</button>
             <button class="filter-btn" data-filter="manual_modified">메뉴얼 수정</button>
           </div>
+          {% for section in sections %}
+            <button class="modal-btn section-btn" data-section="{{ loop.index0 }}">{{ section.title }}</button>
+          {% endfor %}
           <input type="text" id="searchInput" placeholder="파일 검색">
           <ul id="fileList">
             {% for row in rows %}
@@ -247,6 +395,9 @@ class ReportGenerator:
           </div>
         </div>
       </div>
+      {% for section in sections %}
+        <template id="section-{{ loop.index0 }}">{{ section.html }}</template>
+      {% endfor %}
       <footer>
         검증 방법: SQL AST 파싱 및 SQLite EXPLAIN을 사용하여 쿼리의 문법 및 최소 실행 계획 여부를 검증함.
       </footer>
@@ -261,6 +412,34 @@ class ReportGenerator:
         });
         
         const rows = {{ rows|tojson }};
+        {% if detail_dir %}
+        // 상세 내용(diff, 변경 로그)은 청크 파일에서 필요할 때만 불러옵니다.
+        const detailDir = {{ detail_dir|tojson }};
+        const chunkSize = {{ chunk_size }};
+        const loadedChunks = {};
+        const pendingChunks = {};
+        window.reportChunkLoaded = function(chunkIndex, details) {
+          loadedChunks[chunkIndex] = details;
+          (pendingChunks[chunkIndex] || []).forEach(function(callback) { callback(details); });
+          delete pendingChunks[chunkIndex];
+        };
+        function loadDetail(index, callback) {
+          const chunkIndex = Math.floor(index / chunkSize);
+          const done = function(details) { callback(Object.assign({}, rows[index], details[index % chunkSize])); };
+          if (loadedChunks[chunkIndex]) { done(loadedChunks[chunkIndex]); return; }
+          if (pendingChunks[chunkIndex]) { pendingChunks[chunkIndex].push(done); return; }
+          pendingChunks[chunkIndex] = [done];
+          const script = document.createElement('script');
+          script.src = detailDir + '/chunk_' + String(chunkIndex).padStart(5, '0') + '.js';
+          script.onerror = function() {
+            delete pendingChunks[chunkIndex];
+            document.getElementById('fileDetail').innerHTML = "<p>상세 파일을 불러올 수 없습니다: " + script.src + "</p>";
+          };
+          document.head.appendChild(script);
+        }
+        {% else %}
+        function loadDetail(index, callback) { callback(rows[index]); }
+        {% endif %}
         const fileList = document.getElementById('fileList');
         const searchInput = document.getElementById('searchInput');
         const filterButtons = document.querySelectorAll(".filter-btn");
@@ -289,11 +468,20 @@ class ReportGenerator:
             filterFileList();
           });
         });
+        document.querySelectorAll('.section-btn').forEach(function(btn) {
+          btn.addEventListener('click', function() {
+            const section = document.getElementById('section-' + this.getAttribute('data-section'));
+            document.getElementById('fileDetail').innerHTML = "<h3>" + this.textContent + "</h3>" + section.innerHTML;
+          });
+        });
         const items = document.getElementsByClassName('file-item');
         Array.from(items).forEach(function(item) {
           item.addEventListener('click', function() {
             const index = parseInt(this.getAttribute('data-index'));
-            const row = rows[index];
+            loadDetail(index, showDetail);
+          });
+        });
+        function showDetail(row) {
             let detailHTML = "<h3>변환 된 파일 경로: " + row.transformed_file + "</h3>";
             detailHTML += "<p><strong>로그 파일:</strong> " + row.log_file + "</p>";
             detailHTML += "<p><strong>검증 결과:</strong> ";
@@ -349,30 +537,70 @@ class ReportGenerator:
                 newWindow.document.close();
               });
             }
-          });
-        });
+        }
       </script>
     </body>
     </html>
         """)
-        html_output = template.render(rows=df.to_dict(orient='records'), global_summary=global_summary)
+        html_output = template.render(rows=rows, global_summary=global_summary,
+                                      detail_dir=detail_dir, chunk_size=chunk_size,
+                                      sections=self.report_sections)
         # HTML 리포트 파일을 output_dir 바로 하위에 생성 (예: reports/)
-        output_dir = self._get_config_value('output_dir')
-        os.makedirs(output_dir, exist_ok=True)
-        html_base = os.path.join(output_dir, self._get_config_value('html_name'))
-        html_path = self._generate_unique_filename(html_base)
+        os.makedirs(os.path.dirname(html_path), exist_ok=True)
         with open(html_path, 'w', encoding='utf-8') as f:
             f.write(html_output)
         print(f"HTML 리포트 생성: {html_path}")
-        return df
+        return html_path
 
     def generate_html(self):
 
         output_dir = self._get_config_value('output_dir')
-        return self.generate_html_report(self.csv_results, output_dir)
+        return self.generate_html_report(self.iter_results(), output_dir)
     
+    def _load_results(self, rows, logs):
+        if self.store is not None:
+            self.store.clear()
+            for row in rows:
+                self.store.add_result(row)
+            for log in logs:
+                self.store.add_log(*log)
+        else:
+            self.csv_results = list(rows)
+            self.html_logs = list(logs)
+
+    def import_results_from_db(self, db_path, status=None, category=None, rule=None, limit=None):
+        """
+        결과 DB 의 마지막 실행 결과를 불러옵니다.
+        status / category / rule / limit 를 지정하면 조건에 맞는 행과 해당 파일의 로그만 불러옵니다.
+        """
+        if not os.path.exists(db_path):
+            print(f"파일이 존재하지 않습니다: {db_path}")
+            return
+        db = ResultsDatabase(db_path)
+        try:
+            partial = any(value is not None for value in (status, category, rule, limit))
+            rows = list(db.iter_results(status=status, category=category, rule=rule, limit=limit))
+            file_names = {row["file_name"] for row in rows} if partial else None
+            self._load_results(rows, db.iter_logs(file_names=file_names))
+        finally:
+            db.close()
+        print(f"기존 결과 DB 를 불러왔습니다: {db_path} ({len(rows)}건)")
+
+    def export_results_to_db(self, db_path):
+        """현재 결과를 결과 DB 에 새 실행으로 추가합니다. (RESULTS_DB_KEEP_RUNS 개 초과분은 정리)"""
+        db = ResultsDatabase(db_path)
+        try:
+            run_id = db.begin_run()
+            db.add_results(run_id, (row for row in self.iter_results() if isinstance(row, dict)))
+            db.add_logs(run_id, self.iter_logs())
+            keep_runs = getattr(self.config, 'RESULTS_DB_KEEP_RUNS', None)
+            if keep_runs:
+                db.prune(keep_runs)
+        finally:
+            db.close()
+        print(f"결과가 DB 에 저장되었습니다: {db_path} (실행 #{run_id})")
+
     def import_results_from_json(self, json_path):
-        import json
         if not os.path.exists(json_path):
             print(f"파일이 존재하지 않습니다: {json_path}")
             return
@@ -385,21 +613,26 @@ class ReportGenerator:
                     cleaned_results.append(row)
                 else:
                     print(f"⚠️ [WARNING] csv_results[{i}]가 dict가 아님 → {type(row)}: {row}")
-            self.csv_results = cleaned_results
-            self.html_logs = data.get("html_logs", [])
+            self._load_results(cleaned_results, data.get("html_logs", []))
         print(f"기존 결과 파일을 불러왔습니다: {json_path}")
 
     def export_results_to_json(self, json_path):
-        import json
         os.makedirs(os.path.dirname(json_path), exist_ok=True)
 
-        # ✅ 딕셔너리만 저장하도록 필터링 추가
-        safe_csv_results = [dict(row) for row in self.csv_results if isinstance(row, dict)]
+        def write_items(f, items):
+            # json.dump(indent=2) 와 같은 형식으로 한 항목씩 기록 (전체 결과를 메모리에 올리지 않음)
+            first = True
+            for item in items:
+                f.write("[\n    " if first else ",\n    ")
+                f.write(json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n    "))
+                first = False
+            f.write("[]" if first else "\n  ]")
 
-        data = {
-            "csv_results": safe_csv_results,
-            "html_logs": self.html_logs
-        }
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"결과가 JSON으로 저장되었습니다: {json_path}")
\ No newline at end of file
+            f.write('{\n  "csv_results": ')
+            # ✅ 딕셔너리만 저장하도록 필터링 추가
+            write_items(f, (dict(row) for row in self.iter_results() if isinstance(row, dict)))
+            f.write(',\n  "html_logs": ')
+            write_items(f, (list(log) for log in self.iter_logs()))
+            f.write("\n}")
+        print(f"결과가 JSON으로 저장되었습니다: {json_path}")
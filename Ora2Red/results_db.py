@@ -0,0 +1,289 @@
+import json
+import zlib
+import itertools
+import sqlite3
+import hashlib
+import datetime
+from pathlib import Path
+
+# 스키마 버전 (테이블 구성이 바뀌면 올림 → 이전 DB 는 열지 않고 오류)
+RESULTS_DB_SCHEMA_VERSION = 1
+
+# 리포트 요약 행 컬럼 (ReportGenerator.add_execution_result 의 행과 같은 순서)
+# applied_rules 는 파일의 라인별 적용 규칙 전체라 길어서 blobs 에 압축 저장
+RESULT_COLUMNS = ('file_name', 'transformed_file', 'log_file', 'changed', 'manual_required',
+                  'reason', 'category', 'applied_rules')
+_RESULT_TEXT_COLUMNS = RESULT_COLUMNS[:-1]
+
+# 상태 필터 → 조건
+STATUS_FILTERS = {
+    "changed": "r.changed = 'O'",
+    "manual": "r.manual_required = 'O'",
+    "unchanged": "r.changed = ''",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL, seq INTEGER NOT NULL,
+    file_name TEXT, transformed_file TEXT, log_file TEXT, changed TEXT, manual_required TEXT,
+    reason TEXT, category TEXT, applied_rules_hash TEXT, extra TEXT,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS results_manual ON results (run_id, manual_required);
+CREATE INDEX IF NOT EXISTS results_changed ON results (run_id, changed);
+CREATE TABLE IF NOT EXISTS logs (
+    run_id INTEGER NOT NULL, seq INTEGER NOT NULL,
+    file_name TEXT, original_hash TEXT, transformed_hash TEXT, change_log_hash TEXT,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS logs_file ON logs (run_id, file_name);
+CREATE TABLE IF NOT EXISTS log_rules (
+    run_id INTEGER NOT NULL, file_name TEXT, rule_key TEXT, description TEXT, hits INTEGER
+);
+CREATE INDEX IF NOT EXISTS log_rules_key ON log_rules (run_id, rule_key);
+CREATE INDEX IF NOT EXISTS log_rules_desc ON log_rules (run_id, description);
+CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, data BLOB NOT NULL);
+"""
+
+
+class ResultsDatabase:
+    """
+    변환 결과를 SQLite 파일에 저장합니다. (validation_results.json 대체)
+
+    - 실행(run)마다 리포트 요약 행과 변경 로그를 추가 기록하며, 불러올 때는 마지막 실행을 사용합니다.
+    - 원본/변환 SQL 과 변경 로그는 내용 해시(SHA-256)를 키로 zlib 압축하여 한 번만 저장하므로
+      실행이 쌓여도 바뀌지 않은 파일의 내용은 다시 저장하지 않습니다.
+    - 상태(changed / manual / unchanged), SQL 유형, 적용 규칙으로 필요한 행만 조회할 수 있습니다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        # 오래된 실행을 정리한 뒤 빈 페이지를 파일에서 반환할 수 있도록 (새 DB 에만 적용됨)
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(RESULTS_DB_SCHEMA_VERSION),))
+        elif int(version[0]) != RESULTS_DB_SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"결과 DB 스키마 버전이 다릅니다: {self.path} (DB {version[0]}, 현재 {RESULTS_DB_SCHEMA_VERSION})")
+
+    # ---- 기록 ----
+
+    def begin_run(self) -> int:
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO runs (created_at) VALUES (?)",
+                                       (datetime.datetime.now().isoformat(timespec='seconds'),))
+        return cursor.lastrowid
+
+    def _next_seq(self, table, run_id):
+        row = self.conn.execute(f"SELECT COALESCE(MAX(seq), -1) + 1 FROM {table} WHERE run_id = ?", (run_id,)).fetchone()
+        return row[0]
+
+    def _put_blob(self, text) -> str:
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        self.conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?)", (digest, zlib.compress(data)))
+        return digest
+
+    def add_results(self, run_id, rows):
+        """리포트 요약 행(dict)을 실행 run_id 에 추가합니다."""
+        seq = self._next_seq("results", run_id)
+        with self.conn:
+            for seq, row in enumerate(rows, start=seq):
+                extra = {key: value for key, value in row.items() if key not in RESULT_COLUMNS}
+                self.conn.execute(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, seq, *(row.get(column, '') for column in _RESULT_TEXT_COLUMNS),
+                     self._put_blob(row.get('applied_rules', '')),
+                     json.dumps(extra, ensure_ascii=False) if extra else None))
+
+    def add_logs(self, run_id, logs):
+        """(파일명, 원본 SQL, 변환 SQL, 변경 로그) 를 실행 run_id 에 추가합니다."""
+        seq = self._next_seq("logs", run_id)
+        with self.conn:
+            for seq, (file_name, original_sql, transformed_sql, change_log) in enumerate(logs, start=seq):
+                self.conn.execute(
+                    "INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, seq, file_name, self._put_blob(original_sql), self._put_blob(transformed_sql),
+                     self._put_blob(json.dumps(change_log, ensure_ascii=False))))
+                self._index_rules(run_id, file_name, change_log)
+
+    def _index_rules(self, run_id, file_name, change_log):
+        # 규칙별 조회용: 변경 로그 행 [line, rule_key, description, ...] 에서 규칙별 적용 횟수 집계
+        # (이전 형식의 HTML 문자열 로그는 적용 규칙 문자열로 조회)
+        if isinstance(change_log, str):
+            return
+        hits = {}
+        for row in change_log:
+            key = (row[1], row[2])
+            hits[key] = hits.get(key, 0) + 1
+        self.conn.executemany(
+            "INSERT INTO log_rules VALUES (?, ?, ?, ?, ?)",
+            [(run_id, file_name, key, description, count) for (key, description), count in hits.items()])
+
+    def prune(self, keep_runs):
+        """최근 keep_runs 개 실행만 남기고, 어느 실행에서도 참조하지 않는 SQL/변경 로그를 삭제합니다."""
+        with self.conn:
+            stale = [row[0] for row in self.conn.execute(
+                "SELECT run_id FROM runs ORDER BY run_id DESC LIMIT -1 OFFSET ?", (max(1, keep_runs),))]
+            if not stale:
+                return 0
+            for table in ("results", "logs", "log_rules", "runs"):
+                self.conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", [(run_id,) for run_id in stale])
+            self.conn.execute(
+                "DELETE FROM blobs WHERE hash NOT IN (SELECT original_hash FROM logs "
+                "UNION SELECT transformed_hash FROM logs UNION SELECT change_log_hash FROM logs "
+                "UNION SELECT applied_rules_hash FROM results)")
+        self.conn.execute("PRAGMA incremental_vacuum")
+        return len(stale)
+
+    # ---- 조회 ----
+
+    def latest_run(self):
+        row = self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+        return row[0]
+
+    def runs(self):
+        """[(run_id, 생성 시각, 결과 행 수)] (오래된 순)"""
+        return self.conn.execute(
+            "SELECT r.run_id, r.created_at, COUNT(s.seq) FROM runs r "
+            "LEFT JOIN results s ON s.run_id = r.run_id GROUP BY r.run_id ORDER BY r.run_id").fetchall()
+
+    def _where(self, run_id, status=None, category=None):
+        clauses = ["r.run_id = ?"]
+        params = [run_id]
+        if status:
+            if status not in STATUS_FILTERS:
+                raise ValueError(f"지원하지 않는 상태 필터: {status} ({', '.join(STATUS_FILTERS)})")
+            clauses.append(STATUS_FILTERS[status])
+        if category:
+            clauses.append("r.category = ?")
+            params.append(category.upper())
+        return " AND ".join(clauses), params
+
+    def iter_results(self, run_id=None, status=None, category=None, rule=None, limit=None, offset=0):
+        """
+        리포트 요약 행(dict)을 기록 순서대로 반환합니다.
+
+        :param run_id: 실행 번호 (기본값: 마지막 실행)
+        :param status: 'changed' / 'manual' / 'unchanged'
+        :param category: SQL 유형 (DDL / DML)
+        :param rule: 규칙 설명 또는 rule_key
+        :param limit: 최대 행 수
+        :param offset: 건너뛸 행 수
+        """
+        run_id = run_id if run_id is not None else self.latest_run()
+        if run_id is None:
+            return
+        where, params = self._where(run_id, status, category)
+        columns = ", ".join("r." + column for column in _RESULT_TEXT_COLUMNS)
+        if rule is None:
+            query = (f"SELECT {columns}, r.applied_rules_hash, r.extra FROM results r "
+                     f"WHERE {where} ORDER BY r.seq LIMIT ? OFFSET ?")
+            for values in self.conn.execute(query, (*params, -1 if limit is None else limit, offset)):
+                yield self._row_from_values(values)
+            return
+        # 규칙 조회: 변경 로그의 rule_key / 규칙 설명 색인으로 찾고,
+        # 변경 로그가 없는 파일(요약 전용 / 이전 형식)은 적용 규칙 문자열("라인-설명-패턴")에서 검색
+        query = (f"SELECT {columns}, r.applied_rules_hash, r.extra, "
+                 f"r.file_name IN (SELECT file_name FROM log_rules WHERE run_id = r.run_id "
+                 f"AND (rule_key = ? OR description = ?)), "
+                 f"r.file_name IN (SELECT file_name FROM log_rules WHERE run_id = r.run_id) "
+                 f"FROM results r WHERE {where} ORDER BY r.seq")
+        def matches(values):
+            in_index, indexed = values[-2:]
+            if in_index:
+                return True
+            return not indexed and f"-{rule}-" in self._get_blob(values[-4])
+
+        rows = (self._row_from_values(values[:-2])
+                for values in self.conn.execute(query, (rule, rule, *params)) if matches(values))
+        yield from itertools.islice(rows, offset, None if limit is None else offset + limit)
+
+    def _row_from_values(self, values):
+        row = dict(zip(_RESULT_TEXT_COLUMNS, values))
+        row['applied_rules'] = self._get_blob(values[-2])
+        if values[-1]:
+            row.update(json.loads(values[-1]))
+        return row
+
+    def count_results(self, run_id=None, status=None, category=None, rule=None) -> int:
+        run_id = run_id if run_id is not None else self.latest_run()
+        if run_id is None:
+            return 0
+        if rule is not None:
+            return sum(1 for _ in self.iter_results(run_id, status, category, rule))
+        where, params = self._where(run_id, status, category)
+        return self.conn.execute(f"SELECT COUNT(*) FROM results r WHERE {where}", params).fetchone()[0]
+
+    def _get_blob(self, digest) -> str:
+        row = self.conn.execute("SELECT data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else ""
+
+    def _log_from_row(self, row):
+        file_name, original_hash, transformed_hash, change_log_hash = row
+        return (file_name, self._get_blob(original_hash), self._get_blob(transformed_hash),
+                json.loads(self._get_blob(change_log_hash) or '[]'))
+
+    def iter_logs(self, run_id=None, file_names=None):
+        """
+        (파일명, 원본 SQL, 변환 SQL, 변경 로그) 를 기록 순서대로 반환합니다.
+        file_names 를 지정하면 해당 파일의 로그만 읽습니다. (부분 불러오기)
+        """
+        run_id = run_id if run_id is not None else self.latest_run()
+        if run_id is None:
+            return
+        wanted = set(file_names) if file_names is not None else None
+        query = ("SELECT file_name, original_hash, transformed_hash, change_log_hash "
+                 "FROM logs WHERE run_id = ? ORDER BY seq")
+        for row in self.conn.execute(query, (run_id,)):
+            if wanted is None or row[0] in wanted:
+                yield self._log_from_row(row)
+
+    def get_log(self, file_name, run_id=None):
+        """파일명의 (파일명, 원본 SQL, 변환 SQL, 변경 로그) 를 반환합니다. 없으면 None."""
+        run_id = run_id if run_id is not None else self.latest_run()
+        row = self.conn.execute(
+            "SELECT file_name, original_hash, transformed_hash, change_log_hash FROM logs "
+            "WHERE run_id = ? AND file_name = ? ORDER BY seq DESC LIMIT 1", (run_id, file_name)).fetchone()
+        return self._log_from_row(row) if row else None
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == '__main__':
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="변환 결과 DB 조회")
+    parser.add_argument("db", help="결과 DB 파일 (예: reports/results.db)")
+    parser.add_argument("--run", type=int, default=None, help="실행 번호 (기본값: 마지막 실행)")
+    parser.add_argument("--status", choices=list(STATUS_FILTERS), default=None)
+    parser.add_argument("--category", default=None, help="SQL 유형 (DDL / DML)")
+    parser.add_argument("--rule", default=None, help="규칙 설명 또는 rule_key")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--runs", action="store_true", help="저장된 실행 목록 출력")
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"파일이 존재하지 않습니다: {args.db}")
+        sys.exit(1)
+    db = ResultsDatabase(args.db)
+    if args.runs:
+        for run_id, created_at, count in db.runs():
+            print(f"{run_id}\t{created_at}\t{count}")
+    else:
+        for row in db.iter_results(args.run, args.status, args.category, args.rule, args.limit):
+            print(json.dumps(row, ensure_ascii=False))
+    db.close()
@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+
+
+class ResultsStore:
+    """
+    파일별 변환 결과(리포트 요약 행, 원본/변환 SQL 및 변경 로그)를 JSON Lines 파일에 추가 기록합니다.
+
+    결과를 메모리에 모아 두지 않고 생성되는 즉시 디스크에 기록하며,
+    CSV/HTML/JSON 리포트는 이 파일을 다시 순회하면서 만듭니다.
+    요약 행은 path, 변경 로그는 path 옆의 <이름>_logs<확장자> 파일에 따로 기록하여
+    요약 행을 순회할 때 큰 로그 레코드를 읽지 않습니다.
+    변경 로그는 파일명 → 오프셋만 메모리에 두고 필요할 때 해당 위치에서 읽습니다.
+
+    파일은 첫 기록 시점에 열며(이전 실행 내용은 그때 비움), 사용 후 close() 로 닫습니다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(f"{self.path.stem}_logs{self.path.suffix}")
+        self._files = {}
+        # 이번 실행에서 기록을 시작한 파일 (기록 전에는 이전 실행의 파일을 읽지 않음)
+        self._started = set()
+        self._log_offsets = {}
+        self.result_count = 0
+        self.log_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open(self, path):
+        file = self._files.get(path)
+        if file is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 이번 실행의 첫 기록이면 이전 내용을 비우고, 닫은 뒤 다시 열면 이어서 기록
+            file = open(path, 'ab' if path in self._started else 'wb')
+            self._started.add(path)
+            self._files[path] = file
+        return file
+
+    def _append(self, path, value):
+        file = self._open(path)
+        offset = file.tell()
+        file.write(json.dumps(value, ensure_ascii=False).encode('utf-8') + b'\n')
+        return offset
+
+    def add_result(self, row):
+        self._append(self.path, row)
+        self.result_count += 1
+
+    def add_log(self, file_name, original_sql, transformed_sql, change_log):
+        # 같은 파일명이 다시 기록되면 마지막 기록을 사용 (기존 리포트와 동일)
+        self._log_offsets[file_name] = self._append(
+            self.log_path, [file_name, original_sql, transformed_sql, change_log])
+        self.log_count += 1
+
+    def _iter_lines(self, path):
+        if path not in self._started:
+            return
+        file = self._files.get(path)
+        if file is not None:
+            file.flush()
+        with open(path, 'rb') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def iter_results(self):
+        return self._iter_lines(self.path)
+
+    def iter_logs(self):
+        for log in self._iter_lines(self.log_path):
+            yield tuple(log)
+
+    def get_log(self, file_name):
+        """파일명의 (파일명, 원본 SQL, 변환 SQL, 변경 로그) 를 반환합니다. 없으면 None."""
+        offset = self._log_offsets.get(file_name)
+        if offset is None:
+            return None
+        file = self._files.get(self.log_path)
+        if file is not None:
+            file.flush()
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            return tuple(json.loads(f.readline()))
+
+    def clear(self):
+        # 다음 기록 시 파일을 새로 열어 비움
+        self.close()
+        self._started.clear()
+        self._log_offsets.clear()
+        self.result_count = 0
+        self.log_count = 0
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
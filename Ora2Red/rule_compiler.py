@@ -0,0 +1,208 @@
+import re
+import json
+import hashlib
+import datetime
+from pathlib import Path
+from typing import List, Optional
+from rule_prefilter import extract_anchors
+from rule_guard import analyze_pattern
+
+# 컴파일된 규칙 집합 파일 형식 버전 (필드 구성이 바뀌면 올림 → 이전 파일은 다시 컴파일)
+RULE_SET_FORMAT_VERSION = 1
+
+# SQL 유형 → applicable_to 비트
+SQL_TYPE_BITS = {"DDL": 1, "DML": 2}
+
+CRITICALITY_LEVELS = ("low", "medium", "high")
+
+# 필드명 → (허용 타입, 필수 여부)
+RULE_SCHEMA = {
+    "description": (str, True),
+    "pattern": (str, True),
+    "replacement": (str, True),
+    "manual_review_required": (bool, False),
+    "manual_reason": (str, False),
+    "priority": (int, False),
+    "applicable_to": (list, False),
+    "criticality": (str, False),
+    "notes": (str, False),
+}
+
+
+class RuleValidationError(ValueError):
+    """transformations.json 규칙이 스키마에 맞지 않습니다. (errors: 규칙별 오류 메시지 목록)"""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("변환 규칙 검증 실패:\n" + "\n".join(f"  - {error}" for error in errors))
+
+
+def rule_key(rule: dict) -> str:
+    """규칙 식별자 (description + pattern 기준)"""
+    raw = f"{rule['description']}\x00{rule['pattern']}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def rule_fingerprint(rule: dict) -> str:
+    """변환 결과에 영향을 주는 필드 전체의 해시 (규칙 수정 여부 판단용)"""
+    fields = [
+        rule["description"],
+        rule["pattern"],
+        rule["replacement"],
+        rule.get("manual_review_required", False),
+        rule.get("manual_reason", ""),
+        rule.get("priority", 1000),
+        rule.get("applicable_to", ["DDL", "DML"]),
+    ]
+    raw = json.dumps(fields, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def rules_hash(fingerprints: List[str]) -> str:
+    """적용 순서까지 반영한 규칙 집합 해시 (변환 캐시 키로 사용)"""
+    return hashlib.sha256("\n".join(fingerprints).encode('utf-8')).hexdigest()
+
+
+def applicable_mask(applicable_to: List[str]) -> int:
+    mask = 0
+    for sql_type in applicable_to:
+        mask |= SQL_TYPE_BITS.get(sql_type.upper(), 0)
+    return mask
+
+
+def _validate_rule(index: int, rule, errors: List[str]):
+    if not isinstance(rule, dict):
+        errors.append(f"규칙 #{index}: 객체(dict)가 아닙니다.")
+        return
+    label = f"규칙 #{index} ({rule.get('description', '설명 없음')})"
+    for field, (expected, required) in RULE_SCHEMA.items():
+        if field not in rule:
+            if required:
+                errors.append(f"{label}: 필수 필드 '{field}' 가 없습니다.")
+            continue
+        value = rule[field]
+        # bool 은 int 의 하위 타입이므로 priority 에 true/false 가 들어간 경우를 따로 거름
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            errors.append(f"{label}: '{field}' 는 {expected.__name__} 이어야 합니다. (현재: {type(value).__name__})")
+    if isinstance(rule.get("pattern"), str):
+        try:
+            re.compile(rule["pattern"], re.IGNORECASE)
+        except re.error as e:
+            errors.append(f"{label}: 정규식 컴파일 실패: {e}")
+    applicable_to = rule.get("applicable_to")
+    if isinstance(applicable_to, list):
+        unknown = [t for t in applicable_to if not isinstance(t, str) or t.upper() not in SQL_TYPE_BITS]
+        if unknown or not applicable_to:
+            errors.append(f"{label}: 'applicable_to' 는 {list(SQL_TYPE_BITS)} 중 하나 이상이어야 합니다. (현재: {applicable_to})")
+    criticality = rule.get("criticality")
+    if isinstance(criticality, str) and criticality not in CRITICALITY_LEVELS:
+        errors.append(f"{label}: 'criticality' 는 {CRITICALITY_LEVELS} 중 하나여야 합니다. (현재: {criticality})")
+
+
+def validate_rules(transformations) -> None:
+    """
+    규칙 목록의 스키마를 검사합니다. 오류가 있으면 모든 오류를 모아 RuleValidationError 를 발생시킵니다.
+
+    :param transformations: transformations.json 에서 읽은 규칙 목록
+    """
+    if not isinstance(transformations, list):
+        raise RuleValidationError(["최상위 요소는 규칙 목록(list)이어야 합니다."])
+    errors = []
+    seen = {}
+    for index, rule in enumerate(transformations, start=1):
+        _validate_rule(index, rule, errors)
+        if isinstance(rule, dict) and isinstance(rule.get("description"), str) and isinstance(rule.get("pattern"), str):
+            key = rule_key(rule)
+            if key in seen:
+                errors.append(f"규칙 #{index} ({rule['description']}): 규칙 #{seen[key]} 과 description/pattern 이 같습니다.")
+            seen.setdefault(key, index)
+    if errors:
+        raise RuleValidationError(errors)
+
+
+def compile_rule_set(transformations: List[dict], source_hash: Optional[str] = None) -> dict:
+    """
+    규칙 목록을 검증·정규화하여 컴파일된 규칙 집합(JSON 직렬화 가능)으로 만듭니다.
+
+    규칙은 priority 순으로 정렬되며, 규칙마다 리터럴 앵커, applicable_to 비트마스크,
+    역추적 위험 경고, 식별자/지문을 미리 계산해 둡니다.
+
+    :param transformations: 원본 규칙 목록
+    :param source_hash: 원본 transformations.json 의 SHA-256 (최신 여부 확인용)
+    :return: 규칙 집합 dict
+    """
+    validate_rules(transformations)
+    rules = []
+    for rule in sorted(transformations, key=lambda x: x.get("priority", 1000)):
+        applicable_to = rule.get("applicable_to", ["DDL", "DML"])
+        anchors = extract_anchors(rule["pattern"])
+        rules.append({
+            "pattern": rule["pattern"],
+            "replacement": rule["replacement"],
+            "description": rule["description"],
+            "manual_review_required": rule.get("manual_review_required", False),
+            "manual_reason": rule.get("manual_reason", ""),
+            "priority": rule.get("priority", 1000),
+            "applicable_to": applicable_to,
+            "applicable_mask": applicable_mask(applicable_to),
+            "criticality": rule.get("criticality", "low"),
+            "notes": rule.get("notes", ""),
+            "anchors": list(anchors) if anchors is not None else None,
+            "backtracking_risks": analyze_pattern(rule["pattern"]),
+            "rule_key": rule_key(rule),
+            "fingerprint": rule_fingerprint(rule)
+        })
+    return {
+        "format_version": RULE_SET_FORMAT_VERSION,
+        "rules_hash": rules_hash([rule["fingerprint"] for rule in rules]),
+        "source_hash": source_hash,
+        "compiled_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        "rules": rules
+    }
+
+
+def source_file_hash(file_path) -> str:
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_rules_file(source_path) -> dict:
+    """transformations.json 을 읽어 컴파일된 규칙 집합을 만듭니다."""
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    try:
+        transformations = json.loads(raw.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise RuleValidationError([f"{source_path}: JSON 파싱 실패: {e}"]) from e
+    return compile_rule_set(transformations, source_hash=hashlib.sha256(raw).hexdigest())
+
+
+def write_rule_set(rule_set: dict, output_path) -> Path:
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(rule_set, f, ensure_ascii=False)
+    tmp_path.replace(output_path)
+    return output_path
+
+
+def load_rule_set(compiled_path, source_path=None) -> Optional[dict]:
+    """
+    컴파일된 규칙 집합을 읽습니다.
+    파일이 없거나, 형식 버전이 다르거나, source_path 의 내용이 컴파일 이후 바뀌었으면 None 을 반환합니다.
+    """
+    try:
+        with open(compiled_path, 'r', encoding='utf-8') as f:
+            rule_set = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(rule_set, dict) or rule_set.get("format_version") != RULE_SET_FORMAT_VERSION:
+        return None
+    if source_path is not None:
+        try:
+            if rule_set.get("source_hash") != source_file_hash(source_path):
+                return None
+        except OSError:
+            pass
+    return rule_set
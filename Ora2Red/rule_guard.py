@@ -0,0 +1,126 @@
+import signal
+import threading
+from typing import List
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python 3.10 이하
+    import sre_parse
+
+_REPEAT_OPS = tuple(
+    getattr(sre_parse, name)
+    for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_parse, name)
+)
+
+
+class RegexTimeout(Exception):
+    """규칙 정규식 실행이 제한 시간을 넘었습니다."""
+
+
+def _is_repeat(op, av):
+    # {0,1}, {1} 같은 유한 반복은 역추적 폭발과 무관
+    return op in _REPEAT_OPS and av[1] > 1
+
+
+def _children(op, av):
+    if op is sre_parse.SUBPATTERN:
+        return [av[-1]]
+    if op in _REPEAT_OPS:
+        return [av[2]]
+    if op is sre_parse.BRANCH:
+        return list(av[1])
+    if op is sre_parse.ASSERT or op is sre_parse.ASSERT_NOT:
+        return [av[1]]
+    return []
+
+
+def _contains_repeat(items) -> bool:
+    for op, av in items:
+        if _is_repeat(op, av):
+            return True
+        if any(_contains_repeat(child) for child in _children(op, av)):
+            return True
+    return False
+
+
+def _is_wildcard_repeat(op, av) -> bool:
+    if not _is_repeat(op, av) or av[1] is not sre_parse.MAXREPEAT:
+        return False
+    # '.' 한 글자 반복 (.*, .+, .*?) 만 대상으로 함. [^,]+ 처럼 구분자로 끝나는 반복은 제외
+    body = list(av[2])
+    return len(body) == 1 and body[0][0] is sre_parse.ANY
+
+
+def _flatten(items):
+    # 그룹을 펼친 순차 항목 (인접한 와일드카드 반복 판단용)
+    for op, av in items:
+        if op is sre_parse.SUBPATTERN:
+            yield from _flatten(av[-1])
+        else:
+            yield op, av
+
+
+def _analyze(items, findings):
+    wildcard_repeats = sum(1 for op, av in _flatten(items) if _is_wildcard_repeat(op, av))
+    if wildcard_repeats >= 2:
+        findings.add(f"같은 구간에 제한 없는 와일드카드 반복(.*, .*? 등)이 {wildcard_repeats}개 있어 "
+                     f"긴 라인에서 다항 시간 역추적이 발생할 수 있습니다.")
+    for op, av in items:
+        if _is_repeat(op, av) and _contains_repeat(av[2]):
+            findings.add("반복 안에 반복이 중첩되어((a+)+ 형태) 지수 시간 역추적이 발생할 수 있습니다.")
+        for child in _children(op, av):
+            _analyze(child, findings)
+
+
+def analyze_pattern(pattern: str) -> List[str]:
+    """
+    규칙 패턴을 정적으로 검사해 역추적 폭발 위험 경고 목록을 반환합니다.
+
+    - 중첩 수량자: (a+)+, (\\w+\\s*)* 처럼 반복 안에 다시 반복이 있는 경우
+    - 와일드카드 반복 다수: DECODE\\((.*?),(.*?),(.*?)\\) 처럼 .* / .*? 가 한 구간에 여러 개인 경우
+
+    :param pattern: 정규식 패턴 문자열
+    :return: 경고 메시지 목록 (문제 없으면 빈 목록)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+    findings = set()
+    _analyze(list(parsed), findings)
+    return sorted(findings)
+
+
+class RegexTimeGuard:
+    """
+    SIGALRM 타이머로 정규식 실행 시간을 제한합니다.
+
+    정규식 엔진은 실행 중에도 시그널을 확인하므로 타이머가 만료되면 subn 이 중단되고
+    RegexTimeout 이 발생합니다. 시그널은 메인 스레드에서만 받을 수 있으므로
+    setitimer 가 없는 플랫폼(Windows)이나 다른 스레드에서는 제한 없이 실행합니다.
+    """
+
+    def __init__(self, timeout_seconds):
+        self.timeout_seconds = timeout_seconds
+        self.supported = bool(timeout_seconds) and hasattr(signal, 'setitimer')
+        self._installed = False
+        self._active = False
+
+    def _on_alarm(self, signum, frame):
+        if self._active:
+            raise RegexTimeout()
+
+    def subn(self, pattern, replacement, text):
+        if not self.supported or threading.current_thread() is not threading.main_thread():
+            return pattern.subn(replacement, text)
+        if not self._installed:
+            signal.signal(signal.SIGALRM, self._on_alarm)
+            self._installed = True
+        self._active = True
+        signal.setitimer(signal.ITIMER_REAL, self.timeout_seconds)
+        try:
+            return pattern.subn(replacement, text)
+        finally:
+            self._active = False
+            signal.setitimer(signal.ITIMER_REAL, 0)
@@ -0,0 +1,142 @@
+import os
+import json
+import logging
+from pathlib import Path
+from rule_prefilter import fold_text, matches_anchors
+from change_record import change_log_text
+
+
+class RuleIndex:
+    """
+    규칙(rule_key: description + pattern) → 파일/라인 역색인입니다.
+
+    - fired: 규칙이 실제로 적용된 라인
+    - candidate: 리터럴 사전 필터를 통과해 정규식을 실행한 라인 (적용 가능성이 있었던 라인)
+
+    규칙이 수정/추가/삭제되었을 때 다시 변환해야 하는 파일을 고르는 데 사용합니다.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = Path(index_path)
+        self.files = {}
+        self.rules = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.rules = data.get("rules", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"규칙 색인을 읽을 수 없어 새로 만듭니다: {e}")
+
+    def save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"files": self.files, "rules": self.rules}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def update(self, file_path, result, transformer):
+        """변환 결과의 rule_trace 로 해당 파일의 색인 항목을 갱신합니다."""
+        path = str(Path(file_path).resolve())
+        for entry in self.rules.values():
+            entry["fired"].pop(path, None)
+            entry["candidate"].pop(path, None)
+
+        trace = result.get("rule_trace")
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.files.pop(path, None)
+            return
+        self.files[path] = {
+            "content_hash": result.get("content_hash"),
+            "encoding": result.get("encoding"),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rules_hash": transformer.rules_hash,
+            "traced": trace is not None
+        }
+        if not trace:
+            return
+        for rule in transformer.compiled_rules:
+            lines = trace.get(rule["rule_key"])
+            if not lines:
+                continue
+            entry = self.rules.setdefault(rule["rule_key"], {
+                "description": rule["description"],
+                "pattern": rule["pattern"].pattern,
+                "fired": {},
+                "candidate": {}
+            })
+            if lines["fired"]:
+                entry["fired"][path] = lines["fired"]
+            entry["candidate"][path] = lines["candidate"]
+
+    def plan_changed_rules(self, file_paths, cache, read_text):
+        """
+        규칙 변경 후 다시 변환해야 하는 파일 집합을 계산합니다.
+
+        - 삭제/수정 전 규칙: 해당 규칙이 실제로 적용(fired)되었던 파일
+        - 추가/수정 후 규칙: 원본 또는 변경 로그에 규칙의 리터럴 앵커가 있는 파일
+        - 색인에 없거나 내용이 바뀐 파일, 캐시 항목이 없는 파일
+
+        :param file_paths: 대상 파일 경로 목록
+        :param cache: ConversionCache
+        :param read_text: (file_path, encoding) → 원본 텍스트 를 반환하는 함수
+        :return: 다시 변환할 파일 경로 집합
+        """
+        candidates = set()
+        by_rules_hash = {}
+        cached_results = {}
+        for file_path in file_paths:
+            path = str(Path(file_path).resolve())
+            info = self.files.get(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                candidates.add(file_path)
+                continue
+            if (info is None or not info.get("traced")
+                    or info["size"] != stat.st_size or info["mtime_ns"] != stat.st_mtime_ns):
+                candidates.add(file_path)
+                continue
+            cached = cache.peek(info["content_hash"])
+            if cached is None:
+                candidates.add(file_path)
+                continue
+            cached_results[file_path] = cached
+            by_rules_hash.setdefault(info["rules_hash"], []).append((file_path, path, info))
+
+        for old_rules_hash, entries in by_rules_hash.items():
+            if old_rules_hash == cache.rules_hash:
+                continue
+            changed = cache.changed_rules(old_rules_hash)
+            if changed is None:
+                candidates.update(file_path for file_path, _, _ in entries)
+                continue
+            removed_keys, added_anchors = changed
+            fired_paths = set()
+            for key in removed_keys:
+                fired_paths.update(self.rules.get(key, {}).get("fired", {}))
+            if any(anchors is None for anchors in added_anchors):
+                candidates.update(file_path for file_path, _, _ in entries)
+                continue
+            for file_path, path, info in entries:
+                if path in fired_paths:
+                    candidates.add(file_path)
+                    continue
+                if not added_anchors:
+                    continue
+                # 원본 + 변경 로그(규칙 적용 직후 라인 포함)에서 새 규칙 앵커 검색
+                probe_text = fold_text(
+                    read_text(file_path, info["encoding"]) + "\n"
+                    + change_log_text(cached_results[file_path]["change_log"])
+                )
+                if any(matches_anchors(anchors, probe_text) for anchors in added_anchors):
+                    candidates.add(file_path)
+        return candidates
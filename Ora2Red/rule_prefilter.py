@@ -0,0 +1,213 @@
+import re
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python 3.10 이하
+    import sre_parse
+
+# IGNORECASE 매칭 시 ASCII 문자와 같게 취급되지만 upper() 결과가 ASCII가 아닌 문자
+# (ſ, ı 는 upper() 시 S, I 로 바뀌므로 별도 처리가 필요 없음)
+_FOLD_TABLE = str.maketrans({'\u0130': 'I', '\u212a': 'K'})
+
+_REPEAT_OPS = tuple(
+    getattr(sre_parse, name)
+    for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_parse, name)
+)
+
+
+def fold_text(text: str) -> str:
+    """앵커 비교용으로 텍스트를 대문자로 정규화합니다."""
+    # translate 는 ASCII 가 아닌 긴 텍스트에서 느리므로 바꿀 문자가 있을 때만 실행
+    if '\u0130' in text or '\u212a' in text:
+        text = text.translate(_FOLD_TABLE)
+    return text.upper()
+
+
+def _best(candidates: List[Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+    # 후보 중 가장 짧은 앵커가 가장 긴 것을 선택 (선택도가 높음)
+    if not candidates:
+        return None
+    return max(candidates, key=lambda alts: min(len(a) for a in alts))
+
+
+def _sequence_anchors(items) -> Optional[Tuple[str, ...]]:
+    """
+    정규식 파싱 결과(시퀀스)에서 모든 매치에 반드시 포함되는 리터럴 후보를 찾습니다.
+    반환값은 대안 문자열 튜플이며, 매치가 있다면 그중 하나는 반드시 포함됩니다.
+    """
+    candidates = []
+    run = []
+
+    def flush():
+        if run:
+            literal = "".join(run)
+            if literal.isascii():
+                candidates.append((literal.upper(),))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is sre_parse.AT or op is sre_parse.ASSERT or op is sre_parse.ASSERT_NOT:
+            # 폭이 0인 단언은 리터럴 연속성을 깨지 않음
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            sub = _sequence_anchors(av[-1])
+            if sub:
+                candidates.append(sub)
+        elif op in _REPEAT_OPS:
+            min_count, _, body = av
+            if min_count >= 1:
+                sub = _sequence_anchors(body)
+                if sub:
+                    candidates.append(sub)
+        elif op is sre_parse.BRANCH:
+            branch_anchors = [_sequence_anchors(branch) for branch in av[1]]
+            if all(branch_anchors):
+                candidates.append(tuple(dict.fromkeys(a for alts in branch_anchors for a in alts)))
+    flush()
+    return _best(candidates)
+
+
+def extract_anchors(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    규칙 패턴에서 리터럴 앵커(대문자)를 추출합니다.
+    앵커를 확정할 수 없으면 None 을 반환하며, 이 경우 규칙은 항상 실행해야 합니다.
+
+    :param pattern: 정규식 패턴 문자열
+    :return: 앵커 튜플 또는 None
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+    return _sequence_anchors(list(parsed))
+
+
+def build_anchor_gate(anchor_sets: List[Optional[Tuple[str, ...]]]):
+    """
+    모든 규칙의 앵커를 하나의 정규식 대안으로 결합합니다.
+    라인에 어떤 앵커도 없으면 앵커가 있는 규칙 전체를 한 번의 스캔으로 건너뛸 수 있습니다.
+    """
+    anchors = sorted({a for alts in anchor_sets if alts for a in alts}, key=len, reverse=True)
+    if not anchors:
+        return None
+    return re.compile("|".join(re.escape(a) for a in anchors))
+
+
+def matches_anchors(anchors: Optional[Tuple[str, ...]], folded_text: str) -> bool:
+    if anchors is None:
+        return True
+    for anchor in anchors:
+        if anchor in folded_text:
+            return True
+    return False
+
+
+# 라인 경계(문자열 시작/끝)를 직접 보는 위치 지정자. \b, \B 는 줄바꿈과 문자열 경계를 같게 취급하므로 제외
+_BOUNDARY_AT_CODES = tuple(
+    getattr(sre_parse, name)
+    for name in ('AT_BOUNDARY', 'AT_NON_BOUNDARY', 'AT_UNI_BOUNDARY', 'AT_UNI_NON_BOUNDARY',
+                 'AT_LOC_BOUNDARY', 'AT_LOC_NON_BOUNDARY')
+    if hasattr(sre_parse, name)
+)
+# 줄바꿈과 매치되지 않는 문자 범주
+_NEWLINE_FREE_CATEGORIES = tuple(
+    getattr(sre_parse, name)
+    for name in ('CATEGORY_DIGIT', 'CATEGORY_WORD', 'CATEGORY_NOT_SPACE', 'CATEGORY_NOT_LINEBREAK',
+                 'CATEGORY_UNI_DIGIT', 'CATEGORY_UNI_WORD', 'CATEGORY_UNI_NOT_SPACE', 'CATEGORY_UNI_NOT_LINEBREAK')
+    if hasattr(sre_parse, name)
+)
+
+
+def _set_may_match_newline(items) -> bool:
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            return True
+        if op is sre_parse.LITERAL:
+            if av == 10:
+                return True
+        elif op is sre_parse.RANGE:
+            if av[0] <= 10 <= av[1]:
+                return True
+        elif op is sre_parse.CATEGORY:
+            if av not in _NEWLINE_FREE_CATEGORIES:
+                return True
+        else:
+            return True
+    return False
+
+
+def _may_match_newline(items) -> bool:
+    # 보수적으로 판단: 확실히 줄바꿈과 매치되지 않는 경우에만 False
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av == 10:
+                return True
+        elif op is sre_parse.NOT_LITERAL:
+            if av != 10:
+                return True
+        elif op is sre_parse.IN:
+            if _set_may_match_newline(av):
+                return True
+        elif op is sre_parse.ANY:
+            return True
+        elif op is sre_parse.SUBPATTERN:
+            if _may_match_newline(av[-1]):
+                return True
+        elif op in _REPEAT_OPS:
+            if _may_match_newline(av[2]):
+                return True
+        elif op is sre_parse.BRANCH:
+            if any(_may_match_newline(branch) for branch in av[1]):
+                return True
+        elif op is sre_parse.ASSERT or op is sre_parse.ASSERT_NOT:
+            if _may_match_newline(av[1]):
+                return True
+        elif op is not sre_parse.AT:
+            return True
+    return False
+
+
+def _boundary_sensitive(items) -> bool:
+    for op, av in items:
+        if op is sre_parse.AT:
+            if av not in _BOUNDARY_AT_CODES:
+                return True
+        elif op is sre_parse.ASSERT or op is sre_parse.ASSERT_NOT:
+            # 라인 끝 너머에서 전후방 탐색이 보는 문자가 '없음' 대신 줄바꿈이 되므로 줄바꿈과 매치될 수 있으면 결과가 다름
+            if _may_match_newline(av[1]) or _boundary_sensitive(av[1]):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            if _boundary_sensitive(av[-1]):
+                return True
+        elif op in _REPEAT_OPS:
+            if _boundary_sensitive(av[2]):
+                return True
+        elif op is sre_parse.BRANCH:
+            if any(_boundary_sensitive(branch) for branch in av[1]):
+                return True
+        elif op is sre_parse.GROUPREF_EXISTS:
+            if any(branch is not None and _boundary_sensitive(branch) for branch in av[1:]):
+                return True
+    return False
+
+
+def line_boundary_sensitive(pattern: str) -> bool:
+    """
+    줄바꿈으로 이어 붙인 여러 라인에서 찾은 매치가 라인별 실행 결과와 달라질 수 있는 패턴인지 검사합니다.
+    (^, $, \\A, \\Z 같은 위치 지정자 또는 줄바꿈과 매치될 수 있는 전후방 탐색)
+    라인을 넘어가는 매치 자체는 실행 시 확인하므로 여기서는 보지 않습니다.
+
+    :param pattern: 정규식 패턴 문자열
+    :return: True 이면 라인별로 실행해야 함 (분석할 수 없는 패턴도 True)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return True
+    return _boundary_sensitive(list(parsed))
@@ -0,0 +1,133 @@
+import os
+import csv
+import json
+import html
+import datetime
+
+# 프로파일 리포트 섹션 안내 (수집 범위)
+PROFILE_NOTE = ("프로파일 수집 중에는 문장 중복 제거(DEDUP_STATEMENTS)를 사용하지 않으므로 "
+                "실행/매치 횟수는 변환한 모든 문장(라인) 기준입니다. "
+                "캐시 또는 내용이 같은 파일의 결과를 재사용한 파일은 포함하지 않습니다.")
+
+# 프로파일 리포트 컬럼 (CSV/JSON/HTML 공통, 순서 유지)
+PROFILE_COLUMNS = {
+    "rank": "순위",
+    "description": "규칙",
+    "pattern": "패턴",
+    "seconds": "누적 시간(초)",
+    "share": "비율(%)",
+    "attempts": "실행 횟수",
+    "hits": "매치 횟수",
+    "replacements": "치환 횟수",
+    "timeouts": "시간 초과",
+    "avg_us": "평균(µs)"
+}
+
+
+class RuleProfiler:
+    """
+    규칙별 정규식 실행 비용을 누적합니다.
+
+    - attempts: 정규식(subn)을 실행한 횟수 (사전 필터로 건너뛴 경우 제외)
+    - hits: 한 번 이상 매치된 실행 횟수
+    - replacements: 치환된 매치 수 합계
+    - timeouts: RULE_TIMEOUT_MS 초과로 중단된 횟수
+    - seconds: subn 누적 실행 시간
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, rule, elapsed, num_changes, timed_out=False):
+        entry = self.stats.get(rule["rule_key"])
+        if entry is None:
+            entry = self.stats[rule["rule_key"]] = {
+                "description": rule["description"],
+                "pattern": rule["pattern"].pattern,
+                "seconds": 0.0,
+                "attempts": 0,
+                "hits": 0,
+                "replacements": 0,
+                "timeouts": 0
+            }
+        entry["seconds"] += elapsed
+        entry["attempts"] += 1
+        if timed_out:
+            entry["timeouts"] += 1
+        if num_changes:
+            entry["hits"] += 1
+            entry["replacements"] += num_changes
+
+    def merge(self, stats):
+        """다른 프로세스에서 수집한 stats(dict)를 합칩니다."""
+        for key, other in stats.items():
+            entry = self.stats.get(key)
+            if entry is None:
+                self.stats[key] = dict(other)
+                continue
+            for field in ("seconds", "attempts", "hits", "replacements", "timeouts"):
+                entry[field] += other[field]
+
+    def take(self):
+        """지금까지의 stats 를 반환하고 초기화합니다. (워커 → 부모 프로세스 전달용)"""
+        stats, self.stats = self.stats, {}
+        return stats
+
+    def ranked(self):
+        """누적 시간이 큰 순서로 정렬한 프로파일 행 목록"""
+        total = sum(entry["seconds"] for entry in self.stats.values())
+        rows = []
+        ordered = sorted(self.stats.values(), key=lambda e: (-e["seconds"], e["description"]))
+        for rank, entry in enumerate(ordered, start=1):
+            rows.append({
+                "rank": rank,
+                "description": entry["description"],
+                "pattern": entry["pattern"],
+                "seconds": round(entry["seconds"], 6),
+                "share": round(entry["seconds"] * 100 / total, 2) if total else 0.0,
+                "attempts": entry["attempts"],
+                "hits": entry["hits"],
+                "replacements": entry["replacements"],
+                "timeouts": entry["timeouts"],
+                "avg_us": round(entry["seconds"] * 1e6 / entry["attempts"], 2) if entry["attempts"] else 0.0
+            })
+        return rows
+
+    def write_reports(self, output_dir, base_name='rule_profile'):
+        """
+        프로파일을 CSV(utf-8-sig, 한글 컬럼)와 JSON 으로 저장합니다.
+
+        :return: (csv 경로, json 경로)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M")
+        rows = self.ranked()
+        csv_path = os.path.join(output_dir, f"{base_name}_{timestamp}.csv")
+        json_path = os.path.join(output_dir, f"{base_name}_{timestamp}.json")
+        with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(PROFILE_COLUMNS.values())
+            for row in rows:
+                writer.writerow([row[column] for column in PROFILE_COLUMNS])
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"규칙 프로파일 생성: {csv_path}, {json_path}")
+        return csv_path, json_path
+
+
+def render_profile_table(rows):
+    """프로파일 행 목록을 HTML 표로 만듭니다. (HTML 리포트의 규칙 프로파일 섹션)"""
+    parts = [f"<p>{html.escape(PROFILE_NOTE)}</p>", "<table class='diff'><tr>"]
+    parts.extend(f"<th>{label}</th>" for label in PROFILE_COLUMNS.values())
+    parts.append("</tr>")
+    for row in rows:
+        parts.append("<tr>")
+        for column in PROFILE_COLUMNS:
+            value = row[column]
+            if column == "pattern":
+                parts.append(f"<td><code>{html.escape(value)}</code></td>")
+            else:
+                parts.append(f"<td>{html.escape(str(value))}</td>")
+        parts.append("</tr>")
+    parts.append("</table>")
+    return "".join(parts)
@@ -1,59 +1,503 @@
+import re
+import json
+import time
 import sqlparse
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 # 분류용 키워드 집합
 DDL_KEYWORDS = {'CREATE', 'ALTER', 'DROP', 'TRUNCATE', 'COMMENT'}
 DML_KEYWORDS = {'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'MERGE'}
 CONTROL_KEYWORDS = {'COMMIT', 'ROLLBACK', 'SAVEPOINT'}
 PLSQL_KEYWORDS = {'DECLARE', 'BEGIN', 'EXCEPTION', 'END', 'CURSOR', 'LOOP'}
+# PL/SQL 블록 뒤에서 새 최상위 문장의 시작으로 보는 키워드 ('/' 종결자가 없는 스크립트 대응)
+STATEMENT_START_KEYWORDS = DDL_KEYWORDS | DML_KEYWORDS | CONTROL_KEYWORDS | {
+    'DECLARE', 'WITH', 'GRANT', 'REVOKE', 'RENAME', 'SET'}
 
-def classify_statements(sql_text: str) -> List[Tuple[str, str]]:
+# 렉서용 정규식
+# - 주석: Oracle 과 같이 /* */ 는 중첩되지 않음
+# - 문자열: '' 이스케이프, q'[...]' 대체 인용 (닫는 구분자는 직접 탐색)
+# - '/' 만 있는 라인: SQL*Plus 문장 종결자
+_SKIP_RE = re.compile(r"(?:\s+|--[^\n]*|/\*.*?(?:\*/|\Z))*", re.S)
+_WORD_RE = re.compile(r"[A-Za-z_][\w$#]*")
+_SLASH_LINE_RE = re.compile(r"/[ \t]*(?:\r?\n|\Z)")
+_TRAILER_RE = re.compile(r"[ \t]*(--[^\n]*)?")
+_SCAN_PATTERN = r"""
+    (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<qquote>(?<![\w$#])[nN]?[qQ]'(?P<qopen>\S))
+  | (?P<string>'(?:[^']|'')*(?:'|\Z)|"[^"]*(?:"|\Z))
+  | (?P<slash>^[ \t]*/[ \t]*(?:\r?\n|\Z))
+  | (?P<semicolon>;)
+"""
+_SQL_SCAN_RE = re.compile(_SCAN_PATTERN, re.S | re.M | re.X)
+_PLSQL_SCAN_RE = re.compile(
+    _SCAN_PATTERN + r"  | (?P<keyword>(?<![\w$#])(?:BEGIN|CASE|END)(?![\w$#]))",
+    re.S | re.M | re.X | re.I)
+_END_SUFFIX_RE = re.compile(r"\s+(IF|LOOP|CASE)(?![\w$#])", re.I)
+_PLSQL_CREATE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    r"(?:PROCEDURE|FUNCTION|PACKAGE|TRIGGER|TYPE|LIBRARY|JAVA)(?![\w$#])", re.I)
+_Q_CLOSE = {'[': ']', '{': '}', '(': ')', '<': '>'}
+# 토큰 인식 변환용: 규칙을 적용하지 않을 구간 (문자열 리터럴 / 인용 식별자 / 주석)
+_PROTECTED_SCAN_RE = re.compile(r"""
+    (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<qquote>(?<![\w$#])[nN]?[qQ]'(?P<qopen>\S))
+  | (?P<string>'(?:[^']|'')*(?:'|\Z))
+  | (?P<identifier>"[^"]*(?:"|\Z))
+""", re.S | re.X)
+# 대량 적재 스크립트의 한 라인짜리 INSERT ... VALUES (...); 행
+# - 헤더: 대상 테이블(schema.table)과 컬럼 목록까지 한 라인 (앞쪽 공백/빈 라인/주석은 허용, 문장 단위의 배치 주석 등)
+# - 값: 문자열 / 숫자 / NULL 리터럴 또는 괄호가 짝이 맞는 식 (주석이 있거나 라인을 넘으면 행으로 보지 않음)
+_IDENTIFIER = r'(?:"[^"\n]+"|[A-Za-z_][\w$#]*)'
+INSERT_LEAD_PATTERN = r"(?:\s|--[^\n]*|/\*(?:[^*]|\*(?!/))*\*/)*"
+_INSERT_LEAD_RE = re.compile(INSERT_LEAD_PATTERN + r"\Z")
+_INSERT_HEADER_RE = re.compile(
+    INSERT_LEAD_PATTERN + r"(?P<header>INSERT[ \t]+INTO[ \t]+(?P<table>{0}(?:[ \t]*\.[ \t]*{0})?)[ \t]*"
+    r"(?:\((?P<columns>[^()'\n]*)\)[ \t]*)?VALUES)[ \t]*\(".format(_IDENTIFIER), re.I)
+INSERT_LITERAL_PATTERN = r"'[^'\n]*(?:''[^'\n]*)*'|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|NULL"
+_INSERT_VALUE_RE = re.compile(
+    r"[ \t]*(?:(?P<string>'[^'\n]*(?:''[^'\n]*)*')|(?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<null>NULL))[ \t]*(?=[,)])", re.I)
+_INSERT_EXPR_TOKEN_RE = re.compile(r"""[^'"(),\n/-]+|'[^'\n]*(?:''[^'\n]*)*'|"[^"\n]*"|--|/\*|[(),/-]""")
+_INSERT_END_RE = re.compile(r"[ \t]*;[ \t\r]*\n?\Z")
+
+def classify_statement(statement: str) -> str:
+    """
+    주석이 제거된 단일 SQL 문장의 유형을 판별합니다.
+
+    :param statement: SQL 문장
+    :return: DDL, DML, PLSQL, CONTROL, UNKNOWN 중 하나
+    """
+    stripped = statement.strip()
+    parsed = sqlparse.parse(stripped)
+    if not parsed:
+        return 'UNKNOWN'
+
+    stmt_upper = stripped.upper()
+
+    # PLSQL 키워드 포함 여부 판단 (BEGIN 블록, DECLARE 등)
+    if any(keyword in stmt_upper for keyword in PLSQL_KEYWORDS):
+        return 'PLSQL'
+
+    # CONTROL 문 판단
+    if any(stmt_upper.startswith(k) for k in CONTROL_KEYWORDS):
+        return 'CONTROL'
+
+    # 첫 키워드 기준으로 DDL/DML 판별
+    first_token = parsed[0].token_first(skip_cm=True)
+    token_value = first_token.value.upper() if first_token else ''
+
+    keyword = token_value.split()[0] if token_value else ''
+    if keyword in DDL_KEYWORDS:
+        return 'DDL'
+    if keyword in DML_KEYWORDS:
+        return 'DML'
+    return 'UNKNOWN'
+
+
+def _classify_code(code: str, keyword: str) -> str:
+    """
+    렉서가 만든 주석 제외 코드와 첫 키워드로 유형을 판별합니다. (classify_statement 와 같은 기준)
+    """
+    stmt_upper = code.strip().upper()
+    if not stmt_upper:
+        return 'UNKNOWN'
+    if any(k in stmt_upper for k in PLSQL_KEYWORDS):
+        return 'PLSQL'
+    if any(stmt_upper.startswith(k) for k in CONTROL_KEYWORDS):
+        return 'CONTROL'
+    if keyword in DDL_KEYWORDS:
+        return 'DDL'
+    if keyword in DML_KEYWORDS:
+        return 'DML'
+    return 'UNKNOWN'
+
+
+def _next_code(sql_text: str, pos: int) -> Tuple[int, str]:
+    """
+    pos 이후 공백/주석을 건너뛴 첫 코드 위치와 토큰을 반환합니다.
+    토큰은 단어(대문자), '/' (종결자 라인), 그 외에는 '' 입니다.
+    """
+    pos = _SKIP_RE.match(sql_text, pos).end()
+    if pos >= len(sql_text):
+        return pos, ''
+    if (sql_text[pos] == '/' and _SLASH_LINE_RE.match(sql_text, pos)
+            and not sql_text[sql_text.rfind('\n', 0, pos) + 1:pos].strip()):
+        return pos, '/'
+    word = _WORD_RE.match(sql_text, pos)
+    if word:
+        return pos, word.group().upper()
+    return pos, ''
+
+
+def _lex_statements(sql_text: str, pos: int = 0) -> Iterator[Tuple[str, str, int, str]]:
+    """
+    SQL 텍스트를 한 번 훑어 (원문 문장, 첫 키워드, 시작 라인, 주석 제외 코드) 를 순서대로 생성합니다.
+    pos 를 주면 그 위치(문장 경계)부터 훑으며, 시작 라인은 pos 가 있는 라인을 1 로 셉니다.
+
+    - 일반 문장은 ';' 또는 '/' 라인에서 끝납니다.
+    - DECLARE/BEGIN 블록과 CREATE PROCEDURE/FUNCTION/PACKAGE/TRIGGER/TYPE 은 '/' 라인에서 끝나며,
+      '/' 가 없으면 BEGIN/CASE...END 깊이가 0 인 ';' 뒤에 새 최상위 문장이 시작될 때 끝납니다.
+    - 문자열, 인용 식별자, q'[...]', 주석 안의 ';' / '/' 는 무시합니다.
+    """
+    length = len(sql_text)
+    line_number = 1
+    while pos < length:
+        start = pos
+        code_pos, keyword = _next_code(sql_text, pos)
+        if code_pos >= length:
+            # 마지막 문장 뒤의 공백/주석
+            yield sql_text[start:], '', line_number, ''
+            return
+        if keyword == '/':
+            # 앞 문장이 ';' 로 끝난 뒤의 '/' 라인 (SQL*Plus 재실행) 은 단독 조각으로 둡니다.
+            end = _SLASH_LINE_RE.match(sql_text, code_pos).end()
+            raw = sql_text[start:end]
+            yield raw, '', line_number, ''
+            line_number += raw.count('\n')
+            pos = end
+            continue
+
+        plsql = keyword in ('DECLARE', 'BEGIN') or (
+            keyword == 'CREATE' and _PLSQL_CREATE_RE.match(sql_text, code_pos) is not None)
+        scan = _PLSQL_SCAN_RE if plsql else _SQL_SCAN_RE
+        depth = 0
+        skipped = []  # 코드에서 제외할 (주석, '/' 라인) 구간
+
+        def _terminate(semicolon_end):
+            # ';' 뒤 같은 라인의 공백과 -- 주석까지 현재 문장에 포함 (줄바꿈은 다음 문장)
+            trailer = _TRAILER_RE.match(sql_text, semicolon_end)
+            if trailer.group(1):
+                skipped.append(trailer.span(1))
+            return trailer.end()
+
+        end = length
+        p = code_pos
+        while True:
+            m = scan.search(sql_text, p)
+            if m is None:
+                break
+            kind = m.lastgroup
+            if kind == 'comment':
+                skipped.append(m.span())
+            elif kind == 'qquote':
+                close = _Q_CLOSE.get(m.group('qopen'), m.group('qopen')) + "'"
+                idx = sql_text.find(close, m.end())
+                if idx == -1:
+                    break
+                p = idx + len(close)
+                continue
+            elif kind == 'slash':
+                skipped.append(m.span())
+                end = m.end()
+                break
+            elif kind == 'semicolon':
+                if not plsql:
+                    end = _terminate(m.end())
+                    break
+                if depth <= 0:
+                    next_pos, next_token = _next_code(sql_text, m.end())
+                    if next_token == '/':
+                        slash_end = _SLASH_LINE_RE.match(sql_text, next_pos).end()
+                        skipped.append((next_pos, slash_end))
+                        end = slash_end
+                        break
+                    if next_token in STATEMENT_START_KEYWORDS or next_pos >= length:
+                        end = _terminate(m.end())
+                        break
+            elif kind == 'keyword':
+                word = m.group('keyword').upper()
+                if word == 'END':
+                    suffix = _END_SUFFIX_RE.match(sql_text, m.end())
+                    if suffix:
+                        # END IF / END LOOP 은 깊이와 무관, END CASE 는 CASE 를 닫음
+                        if suffix.group(1).upper() == 'CASE':
+                            depth -= 1
+                        p = suffix.end()
+                        continue
+                    depth -= 1
+                else:
+                    depth += 1
+            p = m.end()
+
+        raw = sql_text[start:end]
+        if skipped:
+            parts = []
+            cursor = code_pos
+            for skip_start, skip_end in skipped:
+                parts.append(sql_text[cursor:skip_start])
+                cursor = skip_end
+            parts.append(sql_text[cursor:end])
+            code = " ".join(parts)
+        else:
+            code = sql_text[code_pos:end]
+        yield raw, keyword, line_number, code
+        line_number += raw.count('\n')
+        pos = end
+
+
+def stream_statements(chunks: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+    """
+    라인 경계에서 나뉜 텍스트 조각을 차례로 받아 split_statements(렉서)와 같은 (원문 문장, 유형, 시작 라인) 을 생성합니다.
+    파일 전체를 메모리에 올리지 않고 문장 단위로 처리할 때 사용합니다.
+
+    조각 끝에서 잘린 문장과, 그 앞 문장(종결 여부를 다음 코드로 판단하는 PL/SQL 블록)은
+    다음 조각을 받은 뒤 다시 분리합니다. 다시 분리할 때는 '/' 종결자 판단이 같도록 문장이 시작된 라인부터 보관합니다.
+    """
+    pending = ''
+    offset = 0
+    line_number = 1
+    for chunk in chunks:
+        pending += chunk
+        statements = list(_lex_statements(pending, offset))
+        if len(statements) <= 2:
+            continue
+        for raw, keyword, start_line, code in statements[:-2]:
+            yield raw, _classify_code(code, keyword), line_number + start_line - 1
+        boundary = offset + sum(len(statement[0]) for statement in statements[:-2])
+        line_number += statements[-2][2] - 1
+        line_start = pending.rfind('\n', 0, boundary) + 1
+        pending, offset = pending[line_start:], boundary - line_start
+    for raw, keyword, start_line, code in _lex_statements(pending, offset):
+        yield raw, _classify_code(code, keyword), line_number + start_line - 1
+
+
+def protected_spans(sql_text: str) -> List[Tuple[int, int, str]]:
+    """
+    규칙을 적용하지 않을 구간을 한 번 훑어 찾습니다. (문장 분리 렉서와 같은 문자열/주석 규칙)
+
+    :param sql_text: SQL 텍스트
+    :return: [(시작 위치, 끝 위치, 'string' / 'identifier' / 'comment'), ...] (위치 순, 겹치지 않음)
+             옵티마이저 힌트(/*+ ... */, --+ ...)는 힌트 제거 규칙이 처리하므로 포함하지 않습니다.
+    """
+    spans = []
+    pos = 0
+    while True:
+        m = _PROTECTED_SCAN_RE.search(sql_text, pos)
+        if m is None:
+            return spans
+        kind = m.lastgroup
+        if kind == 'qquote':
+            # q'[...]' 는 닫는 구분자를 직접 찾음 (없으면 끝까지 문자열)
+            close = _Q_CLOSE.get(m.group('qopen'), m.group('qopen')) + "'"
+            idx = sql_text.find(close, m.end())
+            end = len(sql_text) if idx == -1 else idx + len(close)
+            spans.append((m.start(), end, 'string'))
+            pos = end
+            continue
+        if not (kind == 'comment' and sql_text.startswith('+', m.start() + 2)):
+            spans.append((m.start(), m.end(), kind))
+        pos = m.end()
+
+
+def match_insert_header(text: str):
+    """
+    텍스트가 (앞쪽 공백/주석 다음) 한 라인짜리 INSERT INTO ... VALUES ( 헤더로 시작하면 re.Match 를, 아니면 None 을 반환합니다.
+    (groups: header 'INSERT INTO ... VALUES', table, columns. match.end() 는 값 목록의 여는 괄호 다음 위치)
+    """
+    return _INSERT_HEADER_RE.match(text)
+
+
+def insert_header_key(match) -> str:
+    """같은 대상 테이블/컬럼 목록인지 비교하는 헤더 키 (공백 정규화)"""
+    return " ".join(match.group('header').split())
+
+
+def parse_insert_values(text: str, pos: int) -> Optional[Tuple[List[Tuple[int, int, str]], int]]:
+    """
+    pos(값 목록의 여는 괄호 다음)부터 한 라인 안의 값 목록을 나눕니다.
+
+    :return: ([(값 시작, 값 끝, 'string' / 'number' / 'null' / 'expr'), ...], 닫는 괄호 위치)
+             값 목록이 ';' 로 끝나는 한 라인 행이 아니면 None
+    """
+    values = []
+    length = len(text)
+    while True:
+        m = _INSERT_VALUE_RE.match(text, pos)
+        if m is not None:
+            values.append(m.span(m.lastgroup) + (m.lastgroup,))
+            pos = m.end()
+        else:
+            # 식: 괄호 깊이 0 인 ',' 또는 ')' 까지
+            start = pos
+            depth = 0
+            while pos < length:
+                token = _INSERT_EXPR_TOKEN_RE.match(text, pos)
+                if token is None or token.group() in ('--', '/*'):
+                    return None
+                char = token.group()
+                if depth == 0 and char in (',', ')'):
+                    break
+                if char == '(':
+                    depth += 1
+                elif char == ')':
+                    depth -= 1
+                pos = token.end()
+            expr_start = start + len(text[start:pos]) - len(text[start:pos].lstrip(' \t'))
+            expr_end = start + len(text[start:pos].rstrip(' \t'))
+            if pos >= length or expr_start == expr_end:
+                return None
+            values.append((expr_start, expr_end, 'expr'))
+        if text[pos] == ')':
+            return (values, pos) if _INSERT_END_RE.match(text, pos + 1) else None
+        pos += 1
+
+
+def find_insert_runs(texts: List[str], min_rows: int = 1) -> List[Tuple[int, int]]:
+    """
+    변환 단위(라인 또는 문장) 목록에서 같은 헤더(대상 테이블 + 컬럼 목록)의 INSERT ... VALUES 가
+    min_rows 개 이상 이어지는 구간을 찾습니다. (대량 적재 스크립트 감지, 사이의 빈 단위/주석 단위는 구간에 포함)
+
+    :return: [(시작 인덱스, 끝 인덱스(마지막 INSERT 다음)), ...]
+    """
+    runs = []
+    run_key = None
+    run_start = run_end = rows = 0
+
+    def close():
+        if run_key is not None and rows >= min_rows:
+            runs.append((run_start, run_end))
+
+    for index, text in enumerate(texts):
+        match = _INSERT_HEADER_RE.match(text)
+        if match is None:
+            # 빈 단위와 주석뿐인 단위(배치 구분 주석 등)는 구간을 끊지 않음
+            if _INSERT_LEAD_RE.match(text):
+                continue
+            close()
+            run_key = None
+            continue
+        key = insert_header_key(match)
+        if key != run_key:
+            close()
+            run_key, run_start, rows = key, index, 0
+        rows += 1
+        run_end = index + 1
+    close()
+    return runs
+
+
+def iter_statements(sql_text: str) -> Iterator[Tuple[str, str, int]]:
+    """
+    SQL 텍스트를 원문 그대로(공백/주석 포함) 문장 단위로 나누어 순서대로 생성합니다.
+    생성된 문장을 이어 붙이면 원본 텍스트와 같습니다.
+
+    :param sql_text: 전체 SQL 스크립트 텍스트
+    :return: (원문 문장, 첫 키워드(대문자, 없으면 ''), 시작 라인 번호) 제너레이터
+    """
+    for raw, keyword, line_number, _ in _lex_statements(sql_text):
+        yield raw, keyword, line_number
+
+
+def statement_code_at(sql_text: str, pos: int) -> str:
+    """
+    pos(문장 경계)에서 시작하는 문장 하나의 주석 제외 코드를 반환합니다. (앞뒤 공백 제거)
+    파일 전체를 분리하지 않고 위치를 아는 문장만 볼 때 사용합니다.
+    """
+    for _, _, _, code in _lex_statements(sql_text, pos):
+        if code.strip():
+            return code.strip()
+    return ""
+
+
+def classify_statements(sql_text: str, use_sqlparse: bool = False) -> List[Tuple[str, str]]:
     """
     SQL 텍스트를 문장 단위로 분리하고,
     DDL, DML, PLSQL, CONTROL, UNKNOWN 중 하나로 분류합니다.
 
     :param sql_text: 전체 SQL 스크립트 텍스트
+    :param use_sqlparse: True 이면 기존 sqlparse 기반 분리/분류 사용
     :return: [(SQL 문장, 유형), ...]
     """
+    results: List[Tuple[str, str]] = []
+
+    if not use_sqlparse:
+        for _, keyword, _, code in _lex_statements(sql_text):
+            stripped = code.strip()
+            if stripped:
+                results.append((stripped, _classify_code(stripped, keyword)))
+        return results
+
     # 주석 제거 및 정리
     cleaned = sqlparse.format(sql_text, strip_comments=True).strip()
     statements = sqlparse.split(cleaned)
 
-    results: List[Tuple[str, str]] = []
-
     for stmt in statements:
         stripped = stmt.strip()
         if not stripped:
             continue
+        results.append((stripped, classify_statement(stripped)))
 
-        parsed = sqlparse.parse(stripped)
-        if not parsed:
-            results.append((stripped, 'UNKNOWN'))
-            continue
+    return results
 
-        stmt_upper = stripped.upper()
 
-        # PLSQL 키워드 포함 여부 판단 (BEGIN 블록, DECLARE 등)
-        if any(keyword in stmt_upper for keyword in PLSQL_KEYWORDS):
-            kind = 'PLSQL'
+def split_statements(sql_text: str, use_sqlparse: bool = False) -> List[Tuple[str, str, int]]:
+    """
+    SQL 텍스트를 원문 그대로(공백/주석 포함) 문장 단위로 나누고 유형과 시작 라인을 붙입니다.
+    반환된 문장을 순서대로 이어 붙이면 원본 텍스트와 같습니다.
 
-        # CONTROL 문 판단
-        elif any(stmt_upper.startswith(k) for k in CONTROL_KEYWORDS):
-            kind = 'CONTROL'
+    :param sql_text: 전체 SQL 스크립트 텍스트
+    :param use_sqlparse: True 이면 기존 sqlparse 기반 분리/분류 사용
+    :return: [(원문 문장, 유형, 시작 라인 번호), ...]
+    """
+    if not use_sqlparse:
+        return [
+            (raw, _classify_code(code, keyword), line_number)
+            for raw, keyword, line_number, code in _lex_statements(sql_text)
+        ]
 
-        else:
-            # 첫 키워드 기준으로 DDL/DML 판별
-            first_token = parsed[0].token_first(skip_cm=True)
-            token_value = first_token.value.upper() if first_token else ''
+    results: List[Tuple[str, str, int]] = []
+    line_number = 1
+    consumed = 0
+    for stmt in sqlparse.parse(sql_text):
+        raw = str(stmt)
+        if not raw:
+            continue
+        code = sqlparse.format(raw, strip_comments=True).strip()
+        kind = classify_statement(code) if code else 'UNKNOWN'
+        results.append((raw, kind, line_number))
+        line_number += raw.count('\n')
+        consumed += len(raw)
+    # sqlparse 는 마지막 문장 뒤의 공백(파일 끝 줄바꿈 등)을 버리므로 렉서처럼 별도 단위로 붙임
+    if consumed < len(sql_text):
+        results.append((sql_text[consumed:], 'UNKNOWN', line_number))
+    return results
+
+
+def benchmark_splitters(sql_text: str, repeat: int = 3) -> dict:
+    """
+    렉서와 sqlparse 의 문장 분리/분류 시간을 비교합니다. (각 repeat 회 중 최솟값, 초)
+
+    :param sql_text: 측정할 SQL 텍스트
+    :param repeat: 반복 횟수
+    :return: {"lexer": 초, "sqlparse": 초, "speedup": 배, "statements": {...}}
+    """
+    timings = {}
+    counts = {}
+    for name, use_sqlparse in (('lexer', False), ('sqlparse', True)):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            statements = split_statements(sql_text, use_sqlparse=use_sqlparse)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+        counts[name] = len(statements)
+    return {
+        "lexer": round(timings['lexer'], 6),
+        "sqlparse": round(timings['sqlparse'], 6),
+        "speedup": round(timings['sqlparse'] / timings['lexer'], 2) if timings['lexer'] else None,
+        "statements": counts
+    }
 
-            keyword = token_value.split()[0] if token_value else ''
-            if keyword in DDL_KEYWORDS:
-                kind = 'DDL'
-            elif keyword in DML_KEYWORDS:
-                kind = 'DML'
-            else:
-                kind = 'UNKNOWN'
 
-        results.append((stripped, kind))
+if __name__ == '__main__':
+    import sys
+    from file_processor import read_file_lines
 
-    return results
\ No newline at end of file
+    if len(sys.argv) < 2:
+        print("사용법: python sql_classifier.py <SQL 파일> [반복 횟수]")
+        sys.exit(1)
+    text = "".join(read_file_lines(sys.argv[1]))
+    print(json.dumps(
+        benchmark_splitters(text, int(sys.argv[2]) if len(sys.argv) > 2 else 3),
+        ensure_ascii=False, indent=2))
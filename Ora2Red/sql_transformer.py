@@ -1,92 +1,496 @@
+import os
 import re
-import json
+import time
 import logging
+from bisect import bisect_right
+from itertools import accumulate
+from operator import add
 from difflib import ndiff
 from typing import List, Tuple, Set
+from rule_prefilter import build_anchor_gate, fold_text, matches_anchors, line_boundary_sensitive
+from rule_profiler import RuleProfiler
+from rule_guard import RegexTimeGuard, RegexTimeout
+from change_record import ChangeRecord, APPLIED, MANUAL, TIMEOUT
+from literal_mask import LiteralMask
+from rule_compiler import SQL_TYPE_BITS, RuleValidationError, compile_rule_set, compile_rules_file, load_rule_set
 
 
 class SQLTransformer:
-    def __init__(self, config):
+    def __init__(self, config, transformations: List[dict] = None, rule_set: dict = None):
         self.config = config
-        self.transformations = self.load_transformations(self.config.TRANSFORMATIONS_FILE)
-        self.compiled_rules = self.compile_rules(self.transformations)
+        # 워커 프로세스는 부모가 만든 규칙 집합을 받아 JSON 재로드/검증을 생략합니다.
+        loaded_from_file = transformations is None and rule_set is None
+        if rule_set is None:
+            rule_set = compile_rule_set(transformations) if transformations is not None else self.load_rule_set()
+        self.rule_set = rule_set
+        self.transformations = rule_set["rules"]
+        self.compiled_rules = self._materialize_rules(rule_set["rules"])
+        if loaded_from_file:
+            self.warn_risky_patterns()
+        # 리터럴 앵커 기반 사전 필터: 라인에 앵커가 없는 규칙은 정규식을 실행하지 않습니다.
+        self.use_prefilter = getattr(self.config, 'USE_RULE_PREFILTER', True)
+        self.anchor_gate = build_anchor_gate([rule["anchors"] for rule in self.compiled_rules])
+        # 적용 순서까지 반영한 규칙 집합 해시 (변환 캐시 키로 사용)
+        self.rules_hash = rule_set["rules_hash"]
+        # PROFILE_RULES 이면 규칙별 실행 시간/횟수를 수집합니다.
+        self.profiler = RuleProfiler() if getattr(self.config, 'PROFILE_RULES', False) else None
+        # RULE_TIMEOUT_MS 이면 규칙 하나가 라인(문장) 하나에 쓸 수 있는 시간을 제한합니다.
+        timeout_ms = getattr(self.config, 'RULE_TIMEOUT_MS', None)
+        self.timeout_ms = timeout_ms
+        self.regex_guard = RegexTimeGuard(timeout_ms / 1000) if timeout_ms else None
+        self.timeout_count = 0
 
-    def load_transformations(self, file_path: str) -> List[dict]:
+    def load_rule_set(self) -> dict:
+        """
+        COMPILED_RULES_FILE 이 TRANSFORMATIONS_FILE 과 일치하면 컴파일된 규칙 집합을 그대로 사용하고,
+        없거나 원본이 바뀐 경우 TRANSFORMATIONS_FILE 을 검증·컴파일합니다.
+        """
+        source_path = self.config.TRANSFORMATIONS_FILE
+        compiled_path = getattr(self.config, 'COMPILED_RULES_FILE', None)
+        if compiled_path:
+            rule_set = load_rule_set(compiled_path, source_path)
+            if rule_set is not None:
+                logging.info(f"컴파일된 변환 규칙 사용: {compiled_path} ({len(rule_set['rules'])}개)")
+                return rule_set
+            if os.path.exists(compiled_path):
+                logging.warning(f"컴파일된 변환 규칙이 원본과 다르거나 형식이 맞지 않아 원본을 사용합니다: {compiled_path} "
+                                f"(--compile-rules 로 다시 생성하세요)")
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            return compile_rules_file(source_path)
+        except (FileNotFoundError, RuleValidationError) as e:
             logging.error(f"변환 규칙 로드 실패: {e}")
             raise
 
     def compile_rules(self, transformations: List[dict]) -> List[dict]:
-        sorted_transforms = sorted(transformations, key=lambda x: x.get("priority", 1000))
+        return self._materialize_rules(compile_rule_set(transformations)["rules"])
+
+    @staticmethod
+    def _materialize_rules(rules: List[dict]) -> List[dict]:
+        # 규칙 집합(JSON)의 패턴만 정규식 객체로 컴파일하고 나머지 사전 계산 값은 그대로 사용
         compiled = []
-        for rule in sorted_transforms:
-            compiled_rule = {
-                "pattern": re.compile(rule["pattern"], re.IGNORECASE),
-                "replacement": rule["replacement"],
-                "description": rule["description"],
-                "manual_review_required": rule.get("manual_review_required", False),
-                "manual_reason": rule.get("manual_reason", ""),
-                "priority": rule.get("priority", 0),
-                "applicable_to": rule.get("applicable_to", ["DDL", "DML"]),
-                "criticality": rule.get("criticality", "low"),
-                "notes": rule.get("notes", "")
-            }
+        for rule in rules:
+            compiled_rule = dict(rule)
+            compiled_rule["pattern"] = re.compile(rule["pattern"], re.IGNORECASE)
+            compiled_rule["anchors"] = tuple(rule["anchors"]) if rule["anchors"] is not None else None
+            # 토큰 인식 모드에서 문자열 리터럴을 드러낸 텍스트에 적용할 규칙 (TO_DATE 형식 문자열 등)
+            compiled_rule["sees_literals"] = "'" in rule["pattern"] or '"' in rule["pattern"]
+            # 버퍼 모드에서 라인별로 실행해야 하는 규칙 (^, $ 등 라인 경계를 보는 패턴)
+            compiled_rule["boundary_sensitive"] = line_boundary_sensitive(rule["pattern"])
             compiled.append(compiled_rule)
         return compiled
 
+    def warn_risky_patterns(self):
+        """역추적 폭발 위험이 있는 규칙 패턴을 경고합니다. (규칙 로드 시 정적 검사)"""
+        for rule in self.compiled_rules:
+            for risk in rule["backtracking_risks"]:
+                logging.warning(f"규칙 패턴 역추적 위험 [{rule['description']}] {rule['pattern'].pattern}: {risk}")
+
     def apply_transformations(
         self,
         line: str,
         line_number: int,
         applied_changes: Set[str],
-        sql_type: str = None
-    ) -> Tuple[str, List[str], bool, List[str]]:
+        sql_type: str = None,
+        rule_trace: list = None,
+        protected: list = None
+    ) -> Tuple[str, List[ChangeRecord], bool, List[str]]:
+        # rule_trace 가 주어지면 실제로 정규식을 실행한 규칙마다 (rule_key, line_number, 적용 여부)를 기록합니다.
+        # protected 가 주어지면 해당 구간(문자열/주석, 라인 기준 위치)을 가린 텍스트에 규칙을 적용합니다. (토큰 인식 모드)
+        mask = LiteralMask.build(line, protected) if protected else None
+        if mask is not None:
+            line = mask.masked
+            unmask = mask.unmask
+        else:
+            unmask = _identity
         original_line = line.rstrip('\n')
         leading_spaces = re.match(r"\s*", original_line).group()
         stripped_line = original_line.strip()
         transformed_line = stripped_line
+        if mask is not None and mask.skippable:
+            # 주석(또는 여러 라인 문자열의 일부)뿐인 라인은 규칙을 실행하지 않음
+            return unmask(leading_spaces + stripped_line), [], False, []
         change_log = []
         manual_required = False
         manual_reasons = []
 
+        use_prefilter = self.use_prefilter
+        if use_prefilter:
+            folded_line = fold_text(transformed_line)
+            has_anchor = self.anchor_gate is None or self.anchor_gate.search(folded_line) is not None
+
+        # applicable_to 비트마스크 비교용 (DDL/DML 이 아닌 유형은 0 → 어떤 규칙도 적용하지 않음)
+        type_bit = SQL_TYPE_BITS.get(sql_type.upper(), 0) if sql_type else None
+        revealed = folded_revealed = None
+
         for rule in self.compiled_rules:
-            if sql_type and sql_type.upper() not in rule.get("applicable_to", []):
+            if type_bit is not None and not rule["applicable_mask"] & type_bit:
                 continue
 
+            # 리터럴을 봐야 하는 규칙은 문자열을 드러낸 텍스트에 적용하고 앵커도 그 텍스트에서 확인
+            reveal = mask is not None and rule["sees_literals"] and mask.has_revealable
+            if reveal:
+                if revealed is None:
+                    # 드러낸 텍스트는 텍스트가 바뀔 때까지 재사용
+                    revealed = mask.reveal(transformed_line)
+                    folded_revealed = fold_text(revealed) if use_prefilter else None
+                text = revealed
+            else:
+                text = transformed_line
+            if use_prefilter and rule["anchors"] is not None:
+                if reveal:
+                    if not matches_anchors(rule["anchors"], folded_revealed):
+                        continue
+                elif not has_anchor or not matches_anchors(rule["anchors"], folded_line):
+                    continue
+
             pattern = rule["pattern"]
             replacement = rule["replacement"]
             desc = rule["description"]
             manual_review_required = rule["manual_review_required"]
             manual_reason = rule["manual_reason"]
 
-            new_line, num_changes = pattern.subn(replacement, transformed_line)
+            try:
+                new_line, num_changes = self._run_rule(rule, replacement, text)
+            except RegexTimeout:
+                change_log.append(self._timeout_log(rule, line_number, unmask(transformed_line)))
+                manual_required = True
+                manual_reasons.append(self._timeout_reason(rule))
+                if rule_trace is not None:
+                    rule_trace.append((rule["rule_key"], line_number, False))
+                continue
+            if mask is not None and num_changes:
+                new_line = mask.remask(new_line)
+            fired = num_changes > 0 and stripped_line != new_line
+            if rule_trace is not None:
+                rule_trace.append((rule["rule_key"], line_number, fired))
 
-            if num_changes > 0 and stripped_line != new_line:
-                new_line_with_indent = leading_spaces + new_line
-                manual_info = f" ⚠️ 수동 검토 필요: {manual_reason}" if manual_review_required and manual_reason else ""
+            if fired:
                 log_key = f"{line_number}-{desc}-{pattern.pattern}"
 
                 if log_key not in applied_changes:
-                    log_entry = (
-                        f"<div style='margin-bottom: 10px;'>"
-                        f"<b>[Line {line_number}] 🔄 {desc}{manual_info}</b><br>"
-                        f"<span style='background-color: #ffe5e5;'>🟢 변경 전: {original_line}</span><br>"
-                        f"<span style='background-color: #e5ffe5;'>🔵 변경 후: {new_line_with_indent}</span>"
-                        f"</div>"
-                    )
-                    change_log.append(log_entry)
+                    change_log.append(self._change_record(
+                        rule, line_number, unmask(original_line), unmask(leading_spaces + new_line)))
                     applied_changes.add(log_key)
 
                 transformed_line = new_line
+                revealed = None
+                if use_prefilter:
+                    # 앞선 규칙의 치환 결과에 새 앵커가 생길 수 있으므로 다시 계산합니다.
+                    folded_line = fold_text(transformed_line)
+                    has_anchor = self.anchor_gate is None or self.anchor_gate.search(folded_line) is not None
                 if manual_review_required:
                     manual_required = True
                     if manual_reason:
                         manual_reasons.append(manual_reason)
 
-        return leading_spaces + transformed_line, change_log, manual_required, list(set(manual_reasons))
+        return unmask(leading_spaces + transformed_line), change_log, manual_required, list(dict.fromkeys(manual_reasons))
+
+    def _run_rule(self, rule, replacement, text):
+        """
+        규칙의 정규식 치환(subn)을 실행합니다. 모든 규칙 실행은 이 메서드를 거칩니다.
+        RULE_TIMEOUT_MS 를 넘으면 RegexTimeout 이 발생하며 호출한 쪽에서 규칙을 건너뜁니다.
+        """
+        if self.profiler is None:
+            return self._subn(rule, replacement, text)
+        started = time.perf_counter()
+        try:
+            result = self._subn(rule, replacement, text)
+        except RegexTimeout:
+            self.profiler.record(rule, time.perf_counter() - started, 0, timed_out=True)
+            raise
+        self.profiler.record(rule, time.perf_counter() - started, result[1])
+        return result
+
+    def _subn(self, rule, replacement, text):
+        if self.regex_guard is None:
+            return rule["pattern"].subn(replacement, text)
+        try:
+            return self.regex_guard.subn(rule["pattern"], replacement, text)
+        except RegexTimeout:
+            self.timeout_count += 1
+            logging.warning(f"규칙 실행 시간 초과({self.timeout_ms}ms)로 건너뜀: {rule['description']} "
+                            f"(입력 길이 {len(text)})")
+            raise
+
+    def _timeout_reason(self, rule) -> str:
+        return f"정규식 실행 시간 초과({self.timeout_ms}ms)로 '{rule['description']}' 규칙을 적용하지 못했습니다."
+
+    def _timeout_log(self, rule, line_number, line) -> ChangeRecord:
+        return ChangeRecord(line_number, rule["rule_key"], rule["description"], line, line,
+                            TIMEOUT, self._timeout_reason(rule))
+
+    @staticmethod
+    def _change_record(rule, line_number, before, after) -> ChangeRecord:
+        if rule["manual_review_required"]:
+            return ChangeRecord(line_number, rule["rule_key"], rule["description"], before, after,
+                                MANUAL, rule["manual_reason"])
+        return ChangeRecord(line_number, rule["rule_key"], rule["description"], before, after, APPLIED)
+
+    def apply_statement_transformations(
+        self,
+        statement: str,
+        start_line: int,
+        applied_changes: Set[str],
+        sql_type: str = None,
+        rule_trace: list = None,
+        protected: list = None
+    ) -> Tuple[str, List[ChangeRecord], bool, List[str]]:
+        """
+        여러 라인에 걸친 문장 전체에 규칙을 적용합니다. (DECODE, TO_DATE 등이 줄바꿈으로 나뉜 경우 포함)
+        치환으로 줄 수가 줄어들지 않도록 매치에 포함된 줄바꿈 수만큼 치환 결과 뒤에 줄바꿈을 보충하여
+        원본과 변환본의 라인 번호가 일치하도록 유지합니다.
+
+        :param statement: 원본 문장 텍스트 (앞뒤 공백/주석 포함 가능)
+        :param start_line: 문장이 시작하는 파일 내 라인 번호 (1부터)
+        :param sql_type: 문장 유형 (DDL/DML). None 이면 모든 규칙 적용
+        :param protected: 규칙을 적용하지 않을 (시작, 끝, 종류) 구간 목록, 문장 기준 위치 (토큰 인식 모드)
+        :return: (변환된 문장, 변경 기록(ChangeRecord) 목록, 수동 검토 필요 여부, 수동 검토 사유 목록)
+        """
+        mask = LiteralMask.build(statement, protected) if protected else None
+        unmask = mask.unmask if mask is not None else _identity
+        transformed = mask.masked if mask is not None else statement
+        if mask is not None and mask.skippable:
+            return statement, [], False, []
+        change_log = []
+        manual_required = False
+        manual_reasons = []
+
+        use_prefilter = self.use_prefilter
+        if use_prefilter:
+            folded = fold_text(transformed)
+            has_anchor = self.anchor_gate is None or self.anchor_gate.search(folded) is not None
+
+        # applicable_to 비트마스크 비교용 (DDL/DML 이 아닌 유형은 0 → 어떤 규칙도 적용하지 않음)
+        type_bit = SQL_TYPE_BITS.get(sql_type.upper(), 0) if sql_type else None
+        revealed = folded_revealed = None
+
+        for rule in self.compiled_rules:
+            if type_bit is not None and not rule["applicable_mask"] & type_bit:
+                continue
+
+            reveal = mask is not None and rule["sees_literals"] and mask.has_revealable
+            if reveal:
+                if revealed is None:
+                    # 드러낸 텍스트는 텍스트가 바뀔 때까지 재사용
+                    revealed = mask.reveal(transformed)
+                    folded_revealed = fold_text(revealed) if use_prefilter else None
+                text = revealed
+            else:
+                text = transformed
+            if use_prefilter and rule["anchors"] is not None:
+                if reveal:
+                    if not matches_anchors(rule["anchors"], folded_revealed):
+                        continue
+                elif not has_anchor or not matches_anchors(rule["anchors"], folded):
+                    continue
+
+            pattern = rule["pattern"]
+            replacement = rule["replacement"]
+            matches = []
+
+            def expand(match):
+                text = match.expand(replacement)
+                missing_newlines = match.group().count('\n') - text.count('\n')
+                if missing_newlines > 0:
+                    text += '\n' * missing_newlines
+                matches.append((match.start(), match.end(), text))
+                return text
+
+            try:
+                new_text, num_changes = self._run_rule(rule, expand, text)
+            except RegexTimeout:
+                first_line = transformed.lstrip('\n').split('\n', 1)[0]
+                change_log.append(self._timeout_log(
+                    rule, start_line + len(transformed) - len(transformed.lstrip('\n')), unmask(first_line)))
+                manual_required = True
+                manual_reasons.append(self._timeout_reason(rule))
+                if rule_trace is not None:
+                    rule_trace.append((rule["rule_key"], start_line, False))
+                continue
+            fired = num_changes > 0 and new_text != text
+            if not fired:
+                if rule_trace is not None:
+                    rule_trace.append((rule["rule_key"], start_line, False))
+                continue
+
+            desc = rule["description"]
+            manual_review_required = rule["manual_review_required"]
+            manual_reason = rule["manual_reason"]
+            for line_number, before, after in self._changed_line_spans(text, new_text, matches, start_line):
+                if rule_trace is not None:
+                    rule_trace.append((rule["rule_key"], line_number, True))
+                log_key = f"{line_number}-{desc}-{pattern.pattern}"
+                if log_key not in applied_changes:
+                    change_log.append(self._change_record(rule, line_number, unmask(before), unmask(after)))
+                    applied_changes.add(log_key)
+
+            transformed = mask.remask(new_text) if mask is not None else new_text
+            revealed = None
+            if use_prefilter:
+                folded = fold_text(transformed)
+                has_anchor = self.anchor_gate is None or self.anchor_gate.search(folded) is not None
+            if manual_review_required:
+                manual_required = True
+                if manual_reason:
+                    manual_reasons.append(manual_reason)
+
+        # 변경 기록은 라인 순서로 (같은 라인은 규칙 적용 순서 유지)
+        change_log.sort(key=lambda record: record.line)
+        return unmask(transformed), change_log, manual_required, list(dict.fromkeys(manual_reasons))
+
+    @staticmethod
+    def _changed_line_spans(old_text, new_text, matches, start_line):
+        """
+        매치 위치(old_text 기준)를 라인 단위 구간으로 묶어 (라인 번호, 변경 전, 변경 후)를 반환합니다.
+        같은 라인에 걸친 매치는 하나의 구간으로 합칩니다.
+        """
+        spans = []
+        delta = 0
+        for start, end, replaced in matches:
+            line_start = old_text.rfind('\n', 0, start) + 1
+            line_end = old_text.find('\n', max(end - 1, start))
+            if line_end == -1:
+                line_end = len(old_text)
+            delta_before = delta
+            delta += len(replaced) - (end - start)
+            if spans and line_start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], line_end)
+                spans[-1][3] = delta
+            else:
+                spans.append([line_start, line_end, delta_before, delta])
+
+        results = []
+        line_number = start_line
+        counted_until = 0
+        for line_start, line_end, delta_before, delta_after in spans:
+            line_number += old_text.count('\n', counted_until, line_start)
+            counted_until = line_start
+            before = old_text[line_start:line_end]
+            after = new_text[line_start + delta_before:line_end + delta_after]
+            results.append((line_number, before, after))
+        return results
+
+    def apply_buffer_transformations(
+        self,
+        lines: List[str],
+        applied_changes: Set[str],
+        rule_trace: list = None
+    ) -> Tuple[List[str], List[ChangeRecord], bool, List[str]]:
+        """
+        파일 전체 라인에 apply_transformations 를 라인별로 호출한 것과 같은 결과를 규칙당 한 번의 스캔으로 만듭니다.
+        (PROCESSING_MODE 'buffer')
+
+        공백을 제거한 라인들을 줄바꿈으로 이어 붙인 버퍼에서 규칙마다 대상 라인을 한 번에 찾고,
+        그 라인에만 라인 모드와 같이 규칙을 실행합니다.
+        - 앵커가 있는 규칙: 버퍼의 fold_text 결과에서 앵커를 문자열 검색 (라인 모드 prefilter 와 같은 라인)
+        - 앵커가 없는 규칙: 버퍼에서 정규식 검색. 라인 경계를 보지 않는 패턴은 라인 안에서 매치되면
+          버퍼에서도 반드시 그 라인에 걸친 매치가 생기므로 매치가 걸친 라인만 실행하면 됩니다.
+          라인 경계를 보는 패턴(^, $ 등)은 모든 라인에 실행합니다.
+        변경 기록/수동 검토 사유는 라인 번호 → 규칙 순으로 라인 모드와 같게 정렬됩니다.
+        앵커가 없는 규칙의 rule_trace 후보(candidate) 라인은 버퍼 매치가 걸친 라인입니다. (fired 라인은 라인 모드와 같음)
+        토큰 인식 모드와 규칙 시간 제한은 지원하지 않습니다. (FileProcessor 가 라인 모드를 사용)
+
+        :param lines: 원본 라인 목록 (줄바꿈 포함 가능)
+        :return: (변환된 라인 목록(줄바꿈 제외), 변경 기록 목록, 수동 검토 필요 여부, 수동 검토 사유 목록)
+        """
+        originals = [line.rstrip('\n') for line in lines]
+        current = [line.strip() for line in originals]
+        stripped = list(current)
+        records = {}
+        reasons = {}
+        traces = {} if rule_trace is not None else None
+        manual_required = False
+
+        use_prefilter = self.use_prefilter
+        # 버퍼와 라인 시작 위치는 필요할 때 만들고, 라인이 바뀌면 다시 만듦
+        buffer = buffer_starts = None
+        folded_lines = [fold_text(line) for line in current] if use_prefilter else None
+        folded = folded_starts = None
+
+        for rule in self.compiled_rules:
+            anchors = rule["anchors"] if use_prefilter else None
+            if anchors is not None:
+                # 라인 모드의 앵커 확인과 같은 라인을 버퍼 전체 문자열 검색으로 찾음
+                if folded is None:
+                    folded = "\n".join(folded_lines)
+                    folded_starts = _line_starts(folded_lines)
+                candidates = _anchor_lines(anchors, folded, folded_starts)
+            elif rule["boundary_sensitive"]:
+                candidates = range(len(current))
+            else:
+                if buffer is None:
+                    buffer = "\n".join(current)
+                    buffer_starts = _line_starts(current)
+                candidates = self._scan_buffer(rule, buffer, buffer_starts)
+
+            pattern = rule["pattern"]
+            changed = False
+            for index in candidates:
+                text = current[index]
+                new_line, num_changes = self._run_rule(rule, rule["replacement"], text)
+                fired = num_changes > 0 and stripped[index] != new_line
+                line_number = index + 1
+                if traces is not None:
+                    traces.setdefault(rule["rule_key"], []).append((line_number, fired))
+                if not fired:
+                    continue
+
+                log_key = f"{line_number}-{rule['description']}-{pattern.pattern}"
+                if log_key not in applied_changes:
+                    original = originals[index]
+                    records.setdefault(index, []).append(self._change_record(
+                        rule, line_number, original, original[:_indent(original)] + new_line))
+                    applied_changes.add(log_key)
+                if new_line != text:
+                    current[index] = new_line
+                    changed = True
+                    if use_prefilter:
+                        # 앞선 규칙의 치환 결과에 새 앵커가 생길 수 있으므로 다시 계산합니다.
+                        folded_lines[index] = fold_text(new_line)
+                if rule["manual_review_required"]:
+                    manual_required = True
+                    if rule["manual_reason"]:
+                        reasons.setdefault(index, []).append(rule["manual_reason"])
+
+            if changed:
+                buffer = buffer_starts = None
+                folded = folded_starts = None
+
+        change_log = []
+        for index in sorted(records):
+            change_log.extend(records[index])
+        manual_reasons = []
+        for index in sorted(reasons):
+            manual_reasons.extend(dict.fromkeys(reasons[index]))
+        if traces is not None:
+            for rule_key, entries in traces.items():
+                rule_trace.extend((rule_key, line_number, fired) for line_number, fired in entries)
+        transformed = [(original[:_indent(original)] + line).rstrip('\n') for original, line in zip(originals, current)]
+        return transformed, change_log, manual_required, manual_reasons
+
+    def _scan_buffer(self, rule, buffer, starts) -> List[int]:
+        """
+        버퍼에서 규칙 매치가 걸친 라인 인덱스를 순서대로 반환합니다.
+        매치를 찾으면 그 라인은 다시 실행하므로 다음 라인 시작부터 이어서 찾습니다.
+        """
+        started = time.perf_counter() if self.profiler is not None else None
+        search = rule["pattern"].search
+        last_line = len(starts) - 2
+        candidates = []
+        position = 0
+        while last_line >= 0:
+            match = search(buffer, position)
+            if match is None:
+                break
+            first = bisect_right(starts, match.start()) - 1
+            last = bisect_right(starts, match.end()) - 1
+            candidates.extend(range(first, last + 1))
+            if last >= last_line:
+                break
+            position = starts[last + 1]
+        if started is not None:
+            self.profiler.record(rule, time.perf_counter() - started, len(candidates))
+        return candidates
 
     def format_sql(self, sql_text: str) -> str:
         return sql_text
@@ -107,4 +511,31 @@ class SQLTransformer:
     def needs_manual_conversion(self, sql_text: str) -> Tuple[bool, str]:
         upper_sql = sql_text.upper()
         reasons = [kw for kw in self.config.manual_check_keywords if kw in upper_sql]
-        return (len(reasons) > 0), ', '.join(reasons)
\ No newline at end of file
+        return (len(reasons) > 0), ', '.join(reasons)
+
+
+def _identity(text):
+    return text
+
+
+def _indent(line: str) -> int:
+    # re.match(r"\s*", line) 과 같은 앞쪽 공백 길이
+    return len(line) - len(line.lstrip())
+
+
+def _line_starts(lines: List[str]) -> List[int]:
+    # "\n".join(lines) 에서 각 라인의 시작 위치 (마지막 값은 전체 길이 + 1)
+    return list(map(add, accumulate(map(len, lines), initial=0), range(len(lines) + 1)))
+
+
+def _anchor_lines(anchors, folded: str, starts: List[int]) -> List[int]:
+    # 앵커 중 하나가 있는 라인 인덱스를 순서대로 반환 (folded: 라인별 fold_text 결과를 이어 붙인 버퍼)
+    found = set()
+    for anchor in anchors:
+        position = folded.find(anchor)
+        while position != -1:
+            index = bisect_right(starts, position) - 1
+            found.add(index)
+            position = folded.find(anchor, starts[index + 1])
+    return sorted(found)
+